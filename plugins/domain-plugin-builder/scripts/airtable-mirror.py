@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Inspect and refresh the local mirror of the Airtable base
+
+Usage:
+    python airtable-mirror.py                 # Records, watermark and last reconcile per table
+    python airtable-mirror.py --refresh       # Pull records changed since the last refresh
+    python airtable-mirror.py --reconcile     # Refresh and drop records deleted in Airtable
+    python airtable-mirror.py --clear         # Forget everything; the next refresh downloads it all
+
+The mirror (~/.cache/domain-plugin-builder/mirror.sqlite) is refreshed by
+sync-validator.py, cleanup-duplicates.py, bulk-sync-airtable.py and the sync
+queue replayer before they look records up, so running this by hand is only
+needed to inspect it or to pick up deletions before the hourly reconcile.
+"""
+
+import sys
+import time
+import argparse
+
+from airtable_sync.config import AIRTABLE_TOKEN, print_missing_token
+from airtable_sync.mirror import MIRROR_TABLES, base_mirror
+
+def print_status():
+    now = time.time()
+    print("=" * 80)
+    print(f"📋 AIRTABLE MIRROR: {base_mirror.path}")
+    print("=" * 80)
+    for table_name in MIRROR_TABLES:
+        watermark, reconciled_at = base_mirror.state(table_name)
+        if watermark is None:
+            print(f"  - {table_name}: never refreshed")
+            continue
+        reconciled = f"reconciled {(now - reconciled_at) / 60:.0f} min ago" if reconciled_at else "never reconciled"
+        print(f"  - {table_name}: {base_mirror.count(table_name)} records, changes since {watermark}, {reconciled}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and refresh the local Airtable mirror')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--refresh', action='store_true',
+                        help='Pull records created or modified since the last refresh')
+    action.add_argument('--reconcile', action='store_true',
+                        help='Refresh and also drop records deleted in Airtable')
+    action.add_argument('--clear', action='store_true',
+                        help='Empty the mirror')
+
+    args = parser.parse_args()
+
+    if args.clear:
+        base_mirror.clear()
+        print("🗑️  Mirror cleared")
+        return 0
+
+    if args.refresh or args.reconcile:
+        if not AIRTABLE_TOKEN:
+            print_missing_token()
+            return 1
+        from airtable_sync.components import make_api
+
+        api = make_api(AIRTABLE_TOKEN, pool_size=len(MIRROR_TABLES))
+        failed = base_mirror.refresh(api, reconcile=args.reconcile)
+        print()
+        print_status()
+        return 1 if failed else 0
+
+    return print_status()
+
+if __name__ == "__main__":
+    sys.exit(main())
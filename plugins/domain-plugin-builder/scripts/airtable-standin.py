@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Run a local stand-in for the Airtable API (see airtable_sync/standin.py)
+
+Usage:
+    python airtable-standin.py --port=8765
+    python airtable-standin.py --port=8765 --db=/tmp/airtable.sqlite --penalty=1
+    python airtable-standin.py --port=8765 --rate=0   # No rate limiting
+
+Then point any sync script at it:
+    DPB_AIRTABLE_URL=http://127.0.0.1:8765 AIRTABLE_TOKEN=local python bulk-sync-airtable.py ...
+"""
+
+import sys
+import argparse
+
+from airtable_sync.standin import make_server
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the Airtable REST API')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='Port to listen on, 0 for any free port (default: 8765)')
+    parser.add_argument('--db',
+                        help='SQLite file to keep records in (default: memory only)')
+    parser.add_argument('--rate', type=float, default=5.0,
+                        help='Requests per second per base before answering 429, 0 to disable (default: 5)')
+    parser.add_argument('--penalty', type=float, default=30.0,
+                        help='Seconds every request is refused after a 429 (default: 30, like Airtable)')
+    parser.add_argument('--seed', type=int,
+                        help='Seed for generated record IDs, for reproducible runs')
+
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, db=args.db, rate=args.rate,
+                         penalty=args.penalty, seed=args.seed)
+    host, port = server.server_address[:2]
+    print(f"🧪 Airtable stand-in listening on http://{host}:{port}", flush=True)
+    print(f"   Storage: {args.db or 'memory'}")
+    print(f"   Rate limit: {f'{args.rate:g} req/s per base, {args.penalty:g}s penalty' if args.rate else 'off'}", flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""
+Shared Airtable sync library for the domain-plugin-builder scripts
+
+The command-line scripts in this directory (sync-component.py, bulk-sync-airtable.py, ...)
+import from this package so a bulk run can sync many components inside one process.
+
+Configuration (base ID, token, endpoint) lives in config.py. pyairtable, requests,
+yaml and aiohttp are imported on first use, never at module load, so argument
+errors, dry runs and discovery-only paths start without them.
+"""
@@ -0,0 +1,48 @@
+"""
+requests transport adapter that routes pyairtable calls through the scheduler
+
+Imported by make_api() when the first Api is built, so scripts that never
+reach the network don't pay for loading requests and urllib3.
+"""
+
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from airtable_sync.scheduler import BASE_ID_PATTERN, MAX_429_RETRIES, get_rate_limiter, retry_after_seconds
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that paces requests per base and retries 429s after backing off"""
+
+    def __init__(self, *args, max_429_retries=MAX_429_RETRIES, **kwargs):
+        # 429s are handled here so every retry also waits for a token; urllib3
+        # only retries connection errors
+        kwargs.setdefault('max_retries', Retry(
+            total=3,
+            status_forcelist=(),
+            respect_retry_after_header=False,
+        ))
+        super().__init__(*args, **kwargs)
+        self.max_429_retries = max_429_retries
+
+    def send(self, request, **kwargs):
+        match = BASE_ID_PATTERN.search(request.path_url)
+        limiter = get_rate_limiter(match.group(1)) if match else None
+
+        for attempt in range(self.max_429_retries + 1):
+            if limiter:
+                limiter.acquire()
+
+            response = super().send(request, **kwargs)
+            if response.status_code != 429 or attempt == self.max_429_retries:
+                return response
+
+            delay = retry_after_seconds(response)
+            if limiter:
+                limiter.penalize(delay)
+            else:
+                time.sleep(delay)
+            response.close()
+
+        return response
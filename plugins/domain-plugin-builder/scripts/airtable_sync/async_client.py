@@ -0,0 +1,365 @@
+"""
+asyncio Airtable client for bulk operations
+
+A thread per in-flight request limits the synchronous scripts to a handful of
+concurrent requests. This client pipelines hundreds of lookups and upserts over
+a small pool of keep-alive connections with a bound on in-flight requests,
+while still taking every request from the shared per-base rate limiter.
+
+The table API mirrors the pyairtable calls the scripts already use (all,
+iterate, create, update, batch_upsert, batch_delete), so the validator and
+cleanup tools can switch to it without restructuring.
+
+Requires aiohttp (pip install aiohttp); it is only imported when a client is
+created, so the synchronous paths don't depend on it.
+"""
+
+import asyncio
+import threading
+from urllib.parse import quote
+
+from airtable_sync.config import AIRTABLE_URL, BASE_ID, COMPONENT_TABLES
+from airtable_sync.mirror import base_mirror
+from airtable_sync.plugin_cache import is_missing_record_error, plugin_ids
+from airtable_sync.scheduler import MAX_429_RETRIES, get_rate_limiter, retry_after_seconds
+
+# Airtable-imposed limit on records per write request
+MAX_RECORDS_PER_REQUEST = 10
+
+# Seconds between tries while another thread or process holds the rate limiter lock
+LIMITER_RETRY = 0.002
+
+class AirtableAPIError(Exception):
+    """Non-2xx response from Airtable"""
+
+    def __init__(self, method, url, status_code, text):
+        super().__init__(f"{status_code} {method} {url}: {text}")
+        self.status_code = status_code
+        self.text = text
+
+def chunked(items, size=MAX_RECORDS_PER_REQUEST):
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+class AsyncAirtable:
+    """Pooled async client for one Airtable base
+
+    Use as an async context manager:
+
+        async with AsyncAirtable(token) as client:
+            records = await client.table("Agents").all(fields=["Agent Name"])
+    """
+
+    def __init__(self, token, base_id=BASE_ID, max_connections=10, max_in_flight=20,
+                 endpoint_url=AIRTABLE_URL):
+        self.token = token
+        self.base_id = base_id
+        self.max_connections = max_connections
+        self.endpoint_url = endpoint_url.rstrip('/')
+        self.limiter = get_rate_limiter(base_id)
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._session = None
+
+    async def __aenter__(self):
+        try:
+            import aiohttp
+        except ImportError:
+            raise RuntimeError("The async client needs aiohttp: pip install aiohttp") from None
+
+        connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers={"Authorization": f"Bearer {self.token}"},
+            timeout=aiohttp.ClientTimeout(total=60),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+
+    def table(self, table_name):
+        return AsyncTable(self, table_name)
+
+    def table_url(self, table_name):
+        return f"{self.endpoint_url}/v0/{self.base_id}/{quote(table_name, safe='')}"
+
+    async def _limiter(self, fn, *args):
+        """Call a limiter method without blocking the event loop on its flock
+
+        The lock is held for microseconds at a time, so a short sleep and
+        another try is cheaper than a thread hop per request.
+        """
+        while True:
+            try:
+                return fn(*args, blocking=False)
+            except BlockingIOError:
+                await asyncio.sleep(LIMITER_RETRY)
+
+    async def _wait_for_token(self):
+        while True:
+            wait = await self._limiter(self.limiter.try_acquire)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def request(self, method, url, params=None, json=None):
+        """Send one request, paced by the rate limiter and retried after 429s"""
+        async with self._in_flight:
+            for attempt in range(MAX_429_RETRIES + 1):
+                await self._wait_for_token()
+
+                async with self._session.request(method, url, params=params, json=json) as response:
+                    if response.status == 429 and attempt < MAX_429_RETRIES:
+                        await self._limiter(self.limiter.penalize, retry_after_seconds(response))
+                        continue
+
+                    text = await response.text()
+                    if response.status >= 400:
+                        raise AirtableAPIError(method, url, response.status, text)
+                    return await response.json(content_type=None)
+
+class AsyncTable:
+    """Async counterpart of pyairtable.Table for the operations the scripts use"""
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self.url = client.table_url(name)
+
+    async def iterate(self, formula=None, fields=None, page_size=100):
+        """Yield pages of records, following Airtable's offset pagination"""
+        params = [("pageSize", str(page_size))]
+        if formula:
+            params.append(("filterByFormula", formula))
+        for field in fields or []:
+            params.append(("fields[]", field))
+
+        offset = None
+        while True:
+            page_params = params + ([("offset", offset)] if offset else [])
+            data = await self.client.request("GET", self.url, params=page_params)
+            yield data.get('records', [])
+            offset = data.get('offset')
+            if not offset:
+                return
+
+    async def all(self, **options):
+        records = []
+        async for page in self.iterate(**options):
+            records.extend(page)
+        return records
+
+    async def create(self, fields):
+        return await self.client.request("POST", self.url, json={"fields": fields})
+
+    async def update(self, record_id, fields):
+        return await self.client.request("PATCH", f"{self.url}/{record_id}", json={"fields": fields})
+
+    async def delete(self, record_id):
+        return await self.client.request("DELETE", f"{self.url}/{record_id}")
+
+    async def batch_create(self, records):
+        """Create records 10 per request, all chunks in flight at once"""
+        responses = await asyncio.gather(*(
+            self.client.request("POST", self.url, json={"records": [{"fields": fields} for fields in chunk]})
+            for chunk in chunked(records)
+        ))
+        return [record for response in responses for record in response['records']]
+
+    async def batch_update(self, records):
+        responses = await asyncio.gather(*(
+            self.client.request("PATCH", self.url, json={
+                "records": [{"id": record['id'], "fields": record['fields']} for record in chunk]
+            })
+            for chunk in chunked(records)
+        ))
+        return [record for response in responses for record in response['records']]
+
+    async def batch_upsert(self, records, key_fields):
+        """Upsert records 10 per request, merged on key_fields (or by id if given)"""
+        responses = await asyncio.gather(*(
+            self.upsert_chunk(chunk, key_fields) for chunk in chunked(records)
+        ))
+        result = {'createdRecords': [], 'updatedRecords': [], 'records': []}
+        for response in responses:
+            for key in result:
+                result[key].extend(response[key])
+        return result
+
+    async def upsert_chunk(self, records, key_fields):
+        """One upsert request of at most 10 records"""
+        return await self.client.request("PATCH", self.url, json={
+            "records": [
+                {k: v for k, v in record.items() if k in ('id', 'fields')}
+                for record in records
+            ],
+            "performUpsert": {"fieldsToMergeOn": key_fields},
+        })
+
+    async def batch_delete(self, record_ids):
+        responses = await asyncio.gather(*(
+            self.client.request("DELETE", self.url, params=[("records[]", record_id) for record_id in chunk])
+            for chunk in chunked(record_ids)
+        ))
+        return [record for response in responses for record in response['records']]
+
+async def get_plugin_record_id_async(client, plugin_name, marketplace_name, log=print, fresh=False):
+    """Async get_plugin_record_id sharing the same plugin-ID cache (and fresh=True)"""
+    if not fresh:
+        cached_id = plugin_ids.get(BASE_ID, plugin_name)
+        if cached_id:
+            return cached_id
+
+    plugins_table = client.table("Plugins")
+    records = None if fresh else base_mirror.find("Plugins", plugin_name)
+    if records is None:
+        records = await plugins_table.all(formula=f"{{Name}}='{plugin_name}'")
+        if fresh:
+            base_mirror.put("Plugins", records)
+    if records:
+        plugin_ids.put(BASE_ID, plugin_name, records[0]['id'])
+        return records[0]['id']
+
+    log(f"📝 Creating plugin '{plugin_name}' in Airtable...")
+    log(f"   Marketplace: {marketplace_name}")
+    try:
+        new_record = await plugins_table.create({"Name": plugin_name})
+    except Exception as e:
+        log(f"❌ Failed to create plugin: {e}")
+        log(f"   You may need to create the plugin '{plugin_name}' manually in Airtable")
+        return None
+    base_mirror.put("Plugins", [new_record])
+    log(f"✅ Created plugin: {plugin_name} (ID: {new_record['id']})")
+    plugin_ids.put(BASE_ID, plugin_name, new_record['id'])
+    return new_record['id']
+
+async def async_batch_sync_components(client, components, log=print, skip_unchanged=False):
+    """Async batch_sync_components: plugin lookups, table indexes and upsert
+    chunks for every table are all in flight together
+
+    Same inputs and results as batch.batch_sync_components.
+    """
+    from airtable_sync.batch import (
+        SYNC_KEY_FIELD,
+        fail_chunk,
+        index_records,
+        keyed_records_queries,
+        needs_legacy_index,
+        ordered_results,
+        prepare_batch,
+        record_upsert_response,
+        relink_chunk,
+        skip_unchanged_records,
+        unkeyed_records_query,
+        upsert_records,
+    )
+    from airtable_sync.components import forget_plugin_record
+
+    results = {}
+    marketplaces = {comp['plugin']: comp['marketplace'] for comp in components}
+
+    async def resolve(plugin_name, fresh=False):
+        return plugin_name, await get_plugin_record_id_async(
+            client, plugin_name, marketplaces[plugin_name], log=log, fresh=fresh
+        )
+
+    plugin_record_ids = dict(await asyncio.gather(*(resolve(name) for name in marketplaces)))
+    pending = prepare_batch(components, plugin_record_ids, results, log=log)
+
+    async def upsert(table, table_name, component_type, chunk):
+        try:
+            response = await table.upsert_chunk([record for _, record in chunk], [SYNC_KEY_FIELD])
+        except Exception as e:
+            if not is_missing_record_error(e):
+                fail_chunk(chunk, f"❌ Batch upsert to {table_name} failed: {e}", results)
+                return
+
+            # Stale record ID or plugin link: refresh the plugins and retry once
+            log(f"♻️  Stale record reference in {table_name} batch, retrying")
+            stale = {comp['plugin']: record['fields']['Plugin'][0] for comp, record in chunk}
+            for plugin_name, record_id in stale.items():
+                forget_plugin_record(plugin_name, record_id)
+                plugin_record_ids[plugin_name] = (await resolve(plugin_name, fresh=True))[1]
+            chunk = relink_chunk(chunk, plugin_record_ids, results)
+            if not chunk:
+                return
+            try:
+                response = await table.upsert_chunk([record for _, record in chunk], [SYNC_KEY_FIELD])
+            except Exception as e:
+                fail_chunk(chunk, f"❌ Batch upsert to {table_name} failed: {e}", results)
+                return
+
+        record_upsert_response(chunk, response, component_type, results)
+        base_mirror.put(table_name, response['records'])
+        log(f"📤 Upserted {len(chunk)} {table_name} record(s)")
+
+    async def sync_table(component_type, by_key):
+        table_name, name_field = COMPONENT_TABLES[component_type]
+        table = client.table(table_name)
+
+        if skip_unchanged:
+            try:
+                existing = base_mirror.by_sync_key(table_name, by_key)
+                if existing is None:
+                    fetched = await asyncio.gather(*(table.all(**query) for query in keyed_records_queries(by_key)))
+                    existing = [record for records in fetched for record in records]
+            except Exception as e:
+                log(f"⚠️  Could not look up existing {table_name} records, upserting all: {e}")
+            else:
+                skip_unchanged_records(by_key, existing, component_type, results)
+                if not by_key:
+                    return
+
+        legacy = {}
+        if needs_legacy_index(by_key):
+            try:
+                unkeyed = base_mirror.unkeyed(table_name)
+                if unkeyed is None:
+                    unkeyed = await table.all(**unkeyed_records_query(name_field))
+                legacy = index_records(unkeyed, name_field)
+            except Exception as e:
+                fail_chunk(by_key.values(), f"❌ Failed to index {table_name}: {e}", results)
+                return
+
+        await asyncio.gather(*(
+            upsert(table, table_name, component_type, chunk)
+            for chunk in chunked(upsert_records(by_key, legacy, name_field))
+        ))
+
+    await asyncio.gather(*(
+        sync_table(component_type, by_key) for component_type, by_key in pending.items()
+    ))
+    return ordered_results(components, results)
+
+class AsyncBatchRunner:
+    """Run async_batch_sync_components for synchronous callers, on one event
+    loop and one pooled client kept in a background thread
+
+    submit() returns a concurrent.futures.Future, so a caller that produces
+    batches over time (the bulk-sync pipeline) can keep every batch in flight
+    without an event loop of its own.
+    """
+
+    def __init__(self, token, max_connections=10):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.client = AsyncAirtable(token, max_connections=max_connections)
+        self._run(self.client.__aenter__())
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def submit(self, components, log=print, skip_unchanged=False):
+        return asyncio.run_coroutine_threadsafe(
+            async_batch_sync_components(self.client, components, log=log, skip_unchanged=skip_unchanged),
+            self.loop,
+        )
+
+    def close(self):
+        try:
+            self._run(self.client.__aexit__(None, None, None))
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
@@ -0,0 +1,311 @@
+"""
+Batched upserts for bulk syncs
+
+Instead of a lookup plus a create/update per component, components are grouped
+by table and sent with Airtable's batch upsert (10 records per request), merged
+on the "Sync Key" text field ("<plugin>/<name>"). Every table synced this way
+needs a single line text field named "Sync Key". Existing records are looked
+up in the local mirror (mirror.py) when this process refreshed it.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from airtable_sync.components import (
+    UNCHANGED_PREFIX,
+    build_record_fields,
+    changed_fields,
+    extract_frontmatter,
+    forget_plugin_record,
+    get_plugin_record_id,
+)
+from airtable_sync.config import BASE_ID, COMPONENT_TABLES, SYNC_KEY_FIELD
+from airtable_sync.mirror import base_mirror
+from airtable_sync.plugin_cache import is_missing_record_error
+
+# Sync Keys looked up per request, keeping the formula well inside URL limits
+LOOKUP_CHUNK = 50
+
+def sync_key(plugin_name, name):
+    """Stable composite key for a component: <plugin>/<name>"""
+    return f"{plugin_name}/{name}"
+
+def component_ident(comp):
+    return (comp['type'], comp['plugin'], comp['name'])
+
+def unkeyed_records_query(name_field):
+    """Query options selecting records that have no Sync Key yet"""
+    return {
+        'formula': f"{{{SYNC_KEY_FIELD}}}=''",
+        'fields': [name_field, "Plugin"],
+        'page_size': 100,
+    }
+
+def formula_string(value):
+    """Quote a value as an Airtable formula string literal"""
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+def keyed_records_queries(keys):
+    """Query options fetching the records with these Sync Keys, in chunks"""
+    keys = sorted(keys)
+    return [
+        {
+            'formula': 'OR(' + ','.join(
+                f"{{{SYNC_KEY_FIELD}}}={formula_string(key)}" for key in keys[i:i + LOOKUP_CHUNK]
+            ) + ')',
+            'page_size': 100,
+        }
+        for i in range(0, len(keys), LOOKUP_CHUNK)
+    ]
+
+def fetch_keyed_records(table, keys):
+    """Existing records with these Sync Keys, from the local mirror when fresh"""
+    records = base_mirror.by_sync_key(table.name, keys)
+    if records is None:
+        records = [record for query in keyed_records_queries(keys) for record in table.all(**query)]
+    return records
+
+def skip_unchanged_records(by_key, records, component_type, results):
+    """Drop the pending components whose record already holds their fields
+
+    records are the table's records fetched by Sync Key. Unchanged components
+    get their result and record_id here and leave by_key; changed ones get
+    their record_id so the upsert needs no legacy lookup.
+    """
+    for record in records:
+        key = record['fields'].get(SYNC_KEY_FIELD)
+        if key not in by_key:
+            continue
+        comp, fields = by_key[key]
+        comp['record_id'] = record['id']
+        if not changed_fields(fields, record['fields']):
+            results[component_ident(comp)] = (
+                f"{UNCHANGED_PREFIX} {component_type}: {comp['name']} (ID: {record['id']})"
+            )
+            del by_key[key]
+
+def index_records(records, name_field):
+    """Map (name, plugin_id) -> record ID"""
+    index = {}
+    for record in records:
+        name = record['fields'].get(name_field, '')
+        for plugin_id in record['fields'].get('Plugin', []):
+            index.setdefault((name, plugin_id), record['id'])
+    return index
+
+def index_unkeyed_records(table, name_field):
+    """Map (name, plugin_id) -> record ID for records that have no Sync Key yet
+
+    Records created before batch mode existed have no Sync Key, so an upsert
+    merged on the key alone would duplicate them. Giving those records their
+    ID in the upsert also backfills the key.
+    """
+    records = base_mirror.unkeyed(table.name)
+    if records is None:
+        records = table.all(**unkeyed_records_query(name_field))
+    return index_records(records, name_field)
+
+def prepare_batch(components, plugin_record_ids, results, log=print):
+    """Read components from disk and build their upsert fields
+
+    plugin_record_ids maps every plugin name to its resolved record ID (or
+    None). Failures are written to results. Returns component_type -> sync
+    key -> (component, fields).
+    """
+    pending = {}
+    for comp in components:
+        frontmatter = None
+        if comp['type'] in ('agent', 'command', 'skill'):
+            md_path = comp['file_path']
+            if comp['type'] == 'skill':
+                md_path = os.path.join(md_path, 'SKILL.md')
+            frontmatter = extract_frontmatter(md_path, log=log)
+            if not frontmatter:
+                results[component_ident(comp)] = f"❌ Could not extract frontmatter from {md_path}"
+                continue
+
+        plugin_record_id = plugin_record_ids.get(comp['plugin'])
+        if not plugin_record_id:
+            results[component_ident(comp)] = f"❌ Could not resolve plugin record for {comp['plugin']}"
+            continue
+
+        fields = build_record_fields(
+            comp['type'], comp['name'], comp['plugin'], plugin_record_id,
+            frontmatter, event_type=comp.get('event_type')
+        )
+        fields[SYNC_KEY_FIELD] = sync_key(comp['plugin'], comp['name'])
+        pending.setdefault(comp['type'], {})[fields[SYNC_KEY_FIELD]] = (comp, fields)
+
+    return pending
+
+def needs_legacy_index(by_key):
+    """Components with a known record ID don't need the legacy index"""
+    return any(not comp.get('record_id') for comp, _ in by_key.values())
+
+def upsert_records(by_key, legacy, name_field):
+    """Pair each pending component with its upsert record, by ID where known"""
+    records = []
+    for comp, fields in by_key.values():
+        record = {'fields': fields}
+        record_id = comp.get('record_id') or legacy.get((fields[name_field], fields['Plugin'][0]))
+        if record_id:
+            record['id'] = record_id
+        records.append((comp, record))
+    return records
+
+def relink_chunk(chunk, plugin_record_ids, results):
+    """Rebuild a chunk without record IDs and with freshly resolved plugin links
+
+    Components whose plugin no longer resolves fail on their own (written to
+    results) and are left out, so they don't take the rest of the chunk down.
+    """
+    relinked = []
+    for comp, record in chunk:
+        plugin_record_id = plugin_record_ids.get(comp['plugin'])
+        if not plugin_record_id:
+            results[component_ident(comp)] = f"❌ Could not resolve plugin record for {comp['plugin']}"
+            continue
+        relinked.append((comp, {'fields': dict(record['fields'], Plugin=[plugin_record_id])}))
+    return relinked
+
+def fail_chunk(chunk, message, results):
+    for comp, _ in chunk:
+        results[component_ident(comp)] = message
+
+def record_upsert_response(chunk, response, component_type, results):
+    """Store the outcome of one upsert request and set each record_id"""
+    created = set(response['createdRecords'])
+    for (comp, _), record in zip(chunk, response['records']):
+        comp['record_id'] = record['id']
+        action = 'Created' if record['id'] in created else 'Updated'
+        results[component_ident(comp)] = (
+            f"✅ {action} {component_type}: {comp['name']} (ID: {record['id']})"
+        )
+
+def ordered_results(components, results):
+    """(success, component_type, name, message) tuples in input order"""
+    ordered = []
+    for comp in components:
+        message = results[component_ident(comp)]
+        success = message.startswith(('✅', UNCHANGED_PREFIX))
+        ordered.append((success, comp['type'], comp['name'], message))
+    return ordered
+
+def batch_delete(api, table, record_ids):
+    """Delete records 10 per request, carrying on past a failed request
+
+    Returns (deleted record IDs, error messages).
+    """
+    deleted = []
+    errors = []
+    for chunk in api.chunked(list(record_ids)):
+        try:
+            response = table.batch_delete(chunk)
+        except Exception as e:
+            errors.append(f"❌ Failed to delete {len(chunk)} record(s) from {table.name}: {e}")
+            continue
+        deleted.extend(record['id'] for record in response if record.get('deleted'))
+    base_mirror.delete(table.name, deleted)
+    return deleted, errors
+
+def batch_sync_components(api, components, log=print, plugin_record_ids=None, legacy_index=True, max_workers=1,
+                          skip_unchanged=False):
+    """Sync components with batch upserts grouped by table
+
+    Each component is a dict with type, name, plugin, marketplace, file_path,
+    (for hooks) event_type and optionally the record_id it was last synced to.
+    On success the component's record_id is set. Returns (success,
+    component_type, name, message) tuples in the same order as components.
+
+    plugin_record_ids seeds the plugin name -> record ID map from a fetch the
+    caller already made. legacy_index=False skips the lookup of records that
+    have no Sync Key yet, for callers that know which components have no
+    record. Upsert requests are sent from up to max_workers threads.
+
+    skip_unchanged first fetches the existing records by Sync Key (50 keys per
+    request) and leaves out every component whose record already matches; its
+    message then starts with UNCHANGED_PREFIX instead of ✅.
+    """
+    results = {}
+
+    # Resolve each plugin once for the whole batch
+    plugin_record_ids = dict(plugin_record_ids or {})
+    for comp in components:
+        if comp['plugin'] not in plugin_record_ids:
+            plugin_record_ids[comp['plugin']] = get_plugin_record_id(
+                api, comp['plugin'], comp['marketplace'], log=log
+            )
+
+    pending = prepare_batch(components, plugin_record_ids, results, log=log)
+
+    chunks = []
+    for component_type, by_key in pending.items():
+        table_name, name_field = COMPONENT_TABLES[component_type]
+        table = api.table(BASE_ID, table_name)
+
+        if skip_unchanged:
+            try:
+                existing = fetch_keyed_records(table, by_key)
+            except Exception as e:
+                log(f"⚠️  Could not look up existing {table_name} records, upserting all: {e}")
+            else:
+                skip_unchanged_records(by_key, existing, component_type, results)
+                if not by_key:
+                    continue
+
+        legacy = {}
+        if legacy_index and needs_legacy_index(by_key):
+            try:
+                legacy = index_unkeyed_records(table, name_field)
+            except Exception as e:
+                fail_chunk(by_key.values(), f"❌ Failed to index {table_name}: {e}", results)
+                continue
+
+        for chunk in api.chunked(upsert_records(by_key, legacy, name_field)):
+            chunks.append((component_type, table, chunk))
+
+    def send(component_type, table, chunk):
+        try:
+            response = table.batch_upsert(
+                [record for _, record in chunk],
+                key_fields=[SYNC_KEY_FIELD],
+            )
+        except Exception as e:
+            if not is_missing_record_error(e):
+                fail_chunk(chunk, f"❌ Batch upsert to {table.name} failed: {e}", results)
+                return
+
+            # A remembered record ID or cached plugin link is stale: drop both,
+            # re-resolve the plugins and retry once merging on Sync Key alone
+            log(f"♻️  Stale record reference in {table.name} batch, retrying")
+            stale = {comp['plugin']: (comp['marketplace'], record['fields']['Plugin'][0]) for comp, record in chunk}
+            for plugin_name, (marketplace_name, record_id) in stale.items():
+                forget_plugin_record(plugin_name, record_id)
+                plugin_record_ids[plugin_name] = get_plugin_record_id(
+                    api, plugin_name, marketplace_name, log=log, fresh=True
+                )
+            chunk = relink_chunk(chunk, plugin_record_ids, results)
+            if not chunk:
+                return
+            try:
+                response = table.batch_upsert(
+                    [record for _, record in chunk],
+                    key_fields=[SYNC_KEY_FIELD],
+                )
+            except Exception as e:
+                fail_chunk(chunk, f"❌ Batch upsert to {table.name} failed: {e}", results)
+                return
+
+        record_upsert_response(chunk, response, component_type, results)
+        base_mirror.put(table.name, response['records'])
+        log(f"📤 Upserted {len(chunk)} {table.name} record(s)")
+
+    if max_workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in [executor.submit(send, *job) for job in chunks]:
+                future.result()
+    else:
+        for job in chunks:
+            send(*job)
+
+    return ordered_results(components, results)
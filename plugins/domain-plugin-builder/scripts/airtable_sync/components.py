@@ -0,0 +1,334 @@
+"""
+Component sync logic shared by sync-component.py and bulk-sync-airtable.py
+
+Each sync_* function takes an already-built Api so callers can reuse one pooled
+HTTP session across many components instead of paying for a new process,
+interpreter startup and TLS handshake per component.
+"""
+
+import os
+
+from airtable_sync.config import AIRTABLE_URL, BASE_ID
+from airtable_sync.frontmatter import extract_frontmatter
+from airtable_sync.mirror import base_mirror
+from airtable_sync.plugin_cache import is_missing_record_error, plugin_ids
+
+def make_api(token, pool_size=10):
+    """Build an Api whose session keeps up to pool_size keep-alive connections
+
+    Requests are paced by the shared per-base rate limiter and 429s are retried
+    after the Retry-After delay (see scheduler.py).
+    """
+    # pyairtable and requests take most of a script's startup; load them only
+    # once a script actually talks to Airtable
+    from pyairtable import Api
+
+    from airtable_sync.adapter import RateLimitedAdapter
+
+    # Retries are handled by RateLimitedAdapter instead of pyairtable's own
+    # urllib3 retry, which would resend 429s without waiting for a token
+    api = Api(token, retry_strategy=None, endpoint_url=AIRTABLE_URL)
+
+    # Every worker in a bulk run gets its own pooled keep-alive connection
+    adapter = RateLimitedAdapter(
+        pool_connections=1,
+        pool_maxsize=max(pool_size, 1),
+    )
+    api.session.mount("https://", adapter)
+    api.session.mount("http://", adapter)
+    return api
+
+def find_records(table, name_field, name):
+    """Records whose name field equals name, from the local mirror when fresh"""
+    records = base_mirror.find(table.name, name)
+    if records is None:
+        records = table.all(formula=f"{{{name_field}}}='{name}'")
+    return records
+
+def forget_plugin_record(plugin_name, record_id=None):
+    """Drop a plugin record Airtable reported missing from the ID cache and the mirror
+
+    record_id is the ID that was linked (default: the cached one). Without
+    evicting it, the mirror would keep answering lookups with the dead record
+    until its next refresh and every retry would link it again.
+    """
+    record_id = record_id or plugin_ids.get(BASE_ID, plugin_name)
+    plugin_ids.invalidate(BASE_ID, plugin_name)
+    if record_id:
+        base_mirror.delete("Plugins", [record_id])
+
+def get_plugin_record_id(api, plugin_name, marketplace_name, log=print, fresh=False):
+    """Get or create Plugin record and return its ID
+
+    fresh=True skips the ID cache and the mirror and asks Airtable, for
+    retries after a plugin record turned out to be gone.
+    """
+    if not fresh:
+        cached_id = plugin_ids.get(BASE_ID, plugin_name)
+        if cached_id:
+            return cached_id
+
+    plugins_table = api.table(BASE_ID, "Plugins")
+
+    # Search for existing plugin by name only
+    if fresh:
+        records = plugins_table.all(formula=f"{{Name}}='{plugin_name}'")
+        base_mirror.put("Plugins", records)
+    else:
+        records = find_records(plugins_table, "Name", plugin_name)
+
+    if records:
+        # Plugin exists - return first match
+        # Note: If multiple marketplaces have same plugin name, this returns the first
+        plugin_ids.put(BASE_ID, plugin_name, records[0]['id'])
+        return records[0]['id']
+
+    # Plugin doesn't exist - create it
+    log(f"📝 Creating plugin '{plugin_name}' in Airtable...")
+    log(f"   Marketplace: {marketplace_name}")
+
+    # Create with just Name field
+    # Note: "Is Marketplace" and "Marketplace Name" fields need to be added to Airtable Plugins table first
+    plugin_data = {
+        "Name": plugin_name,
+    }
+
+    try:
+        new_record = plugins_table.create(plugin_data)
+        base_mirror.put("Plugins", [new_record])
+        log(f"✅ Created plugin: {plugin_name} (ID: {new_record['id']})")
+        plugin_ids.put(BASE_ID, plugin_name, new_record['id'])
+        return new_record['id']
+    except Exception as e:
+        log(f"❌ Failed to create plugin: {e}")
+        log(f"   You may need to create the plugin '{plugin_name}' manually in Airtable")
+        return None
+
+# Logged (and returned by batch syncs) when a record already matched
+UNCHANGED_PREFIX = "⏭️  Unchanged"
+
+def field_value(value):
+    """Normalise a field value for comparison
+
+    Airtable leaves empty fields out of the records it returns, so an empty
+    outgoing value matches a missing one. Linked-record lists compare as sets.
+    """
+    if value is None or value == '' or value == []:
+        return None
+    if isinstance(value, list):
+        return sorted(value)
+    return value
+
+def changed_fields(fields, existing_fields):
+    """The outgoing fields whose value differs from the fetched record"""
+    return {
+        name: value for name, value in fields.items()
+        if field_value(value) != field_value(existing_fields.get(name))
+    }
+
+def write_record(table, existing, fields, component_type, name, log=print):
+    """Create the record, or update only the fields that differ from existing
+
+    Returns the record ID. An existing record that already matches is left
+    alone, so its Last Modified time stays put and no request is spent.
+    """
+    if not existing:
+        record = table.create(fields)
+        base_mirror.put(table.name, [record])
+        log(f"✅ Created {component_type}: {name} (ID: {record['id']})")
+        return record['id']
+
+    record_id = existing['id']
+    changes = changed_fields(fields, existing['fields'])
+    if not changes:
+        log(f"{UNCHANGED_PREFIX} {component_type}: {name} (ID: {record_id})")
+        return record_id
+
+    base_mirror.put(table.name, [table.update(record_id, changes)])
+    log(f"✅ Updated {component_type}: {name} (ID: {record_id}; {', '.join(changes)})")
+    return record_id
+
+def build_record_fields(component_type, name, plugin_name, plugin_record_id, frontmatter=None, event_type=None):
+    """Build the Airtable fields sent for a component"""
+    frontmatter = frontmatter or {}
+
+    if component_type == 'agent':
+        # Only required fields - we'll discover the correct field names through trial
+        return {
+            "Agent Name": frontmatter.get('name', name),
+            "Plugin": [plugin_record_id],
+        }
+    elif component_type == 'command':
+        return {
+            "Command Name": f"/{plugin_name}:{name}",
+            "Description": frontmatter.get('description', ''),
+            "Argument Hint": frontmatter.get('argument-hint', ''),
+            "Plugin": [plugin_record_id],
+            "File Path": f"plugins/{plugin_name}/commands/{name}.md",
+        }
+    elif component_type == 'skill':
+        return {
+            "Skill Name": frontmatter.get('name', name),
+            "Description": frontmatter.get('description', ''),
+            "Plugin": [plugin_record_id],
+            "Directory Path": f"plugins/{plugin_name}/skills/{name}/",
+        }
+    elif component_type == 'hook':
+        # Minimal required fields
+        return {
+            "Hook Name": name,
+            "Event Type": event_type,
+            "Plugin": [plugin_record_id],
+        }
+    raise ValueError(f"Unknown component type: {component_type}")
+
+def sync_agent(api, name, plugin_name, marketplace_name, file_path, log=print):
+    """Sync agent to Airtable"""
+    log(f"📋 Syncing agent: {name}")
+
+    # Read frontmatter
+    frontmatter = extract_frontmatter(file_path, log=log)
+    if not frontmatter:
+        log(f"❌ Could not extract frontmatter from {file_path}")
+        return False
+
+    # Get plugin record ID
+    plugin_record_id = get_plugin_record_id(api, plugin_name, marketplace_name, log=log)
+    if not plugin_record_id:
+        return False
+
+    # Prepare agent data with ONLY required fields
+    agent_data = build_record_fields('agent', name, plugin_name, plugin_record_id, frontmatter)
+
+    # Check if agent exists
+    # Get all agents with the name we write (the frontmatter name, not the file
+    # name), then filter by plugin in Python
+    # (Airtable formulas for linked records are unreliable)
+    agents_table = api.table(BASE_ID, "Agents")
+    all_with_name = find_records(agents_table, "Agent Name", agent_data["Agent Name"])
+    existing = [
+        agent for agent in all_with_name
+        if plugin_record_id in agent['fields'].get('Plugin', [])
+    ]
+
+    # Create it, or update only the fields that changed
+    return write_record(agents_table, existing[0] if existing else None, agent_data, 'agent', name, log=log)
+
+def sync_command(api, name, plugin_name, marketplace_name, file_path, log=print):
+    """Sync command to Airtable"""
+    log(f"📋 Syncing command: {name}")
+
+    # Read frontmatter
+    frontmatter = extract_frontmatter(file_path, log=log)
+    if not frontmatter:
+        log(f"❌ Could not extract frontmatter from {file_path}")
+        return False
+
+    # Get plugin record ID
+    plugin_record_id = get_plugin_record_id(api, plugin_name, marketplace_name, log=log)
+    if not plugin_record_id:
+        return False
+
+    # Prepare command data
+    command_data = build_record_fields('command', name, plugin_name, plugin_record_id, frontmatter)
+
+    # Check if command exists
+    commands_table = api.table(BASE_ID, "Commands")
+    existing = find_records(commands_table, "Command Name", command_data["Command Name"])
+
+    # Create it, or update only the fields that changed
+    return write_record(commands_table, existing[0] if existing else None, command_data, 'command', name, log=log)
+
+def sync_skill(api, name, plugin_name, marketplace_name, dir_path, log=print):
+    """Sync skill to Airtable"""
+    log(f"📋 Syncing skill: {name}")
+
+    # Read SKILL.md frontmatter
+    skill_file = os.path.join(dir_path, "SKILL.md")
+    frontmatter = extract_frontmatter(skill_file, log=log)
+    if not frontmatter:
+        log(f"❌ Could not extract frontmatter from {skill_file}")
+        return False
+
+    # Get plugin record ID
+    plugin_record_id = get_plugin_record_id(api, plugin_name, marketplace_name, log=log)
+    if not plugin_record_id:
+        return False
+
+    # Prepare skill data
+    skill_data = build_record_fields('skill', name, plugin_name, plugin_record_id, frontmatter)
+
+    # Check if skill exists
+    # Get all skills with the name we write (the frontmatter name, not the directory
+    # name), then filter by plugin in Python
+    # (Airtable formulas for linked records are unreliable)
+    skills_table = api.table(BASE_ID, "Skills")
+    all_with_name = find_records(skills_table, "Skill Name", skill_data["Skill Name"])
+    existing = [
+        skill for skill in all_with_name
+        if plugin_record_id in skill['fields'].get('Plugin', [])
+    ]
+
+    # Create it, or update only the fields that changed
+    return write_record(skills_table, existing[0] if existing else None, skill_data, 'skill', name, log=log)
+
+def sync_hook(api, name, event_type, plugin_name, marketplace_name, script_path, log=print):
+    """Sync hook to Airtable"""
+    log(f"📋 Syncing hook: {name} ({event_type})")
+
+    # Get plugin record ID
+    plugin_record_id = get_plugin_record_id(api, plugin_name, marketplace_name, log=log)
+    if not plugin_record_id:
+        return False
+
+    # Prepare hook data with minimal required fields
+    hook_data = build_record_fields('hook', name, plugin_name, plugin_record_id, event_type=event_type)
+
+    # Check if hook exists
+    # Get all hooks with this name, then filter by plugin in Python
+    # (Airtable formulas for linked records are unreliable)
+    hooks_table = api.table(BASE_ID, "Hooks")
+    all_with_name = find_records(hooks_table, "Hook Name", name)
+    existing = [
+        hook for hook in all_with_name
+        if plugin_record_id in hook['fields'].get('Plugin', [])
+    ]
+
+    # Create it, or update only the fields that changed
+    return write_record(hooks_table, existing[0] if existing else None, hook_data, 'hook', name, log=log)
+
+def sync_component(api, component_type, name, plugin_name, marketplace_name, file_path,
+                   event_type=None, log=print):
+    """Dispatch to the sync_* function for component_type
+
+    Returns the Airtable record ID on success and False on failure. If the
+    write fails because the cached plugin record no longer exists, the record
+    is dropped from the cache and the mirror and the sync is retried once
+    with a fresh lookup.
+    """
+    try:
+        return _dispatch_sync(api, component_type, name, plugin_name, marketplace_name,
+                              file_path, event_type, log)
+    except Exception as e:
+        if not is_missing_record_error(e):
+            raise
+        forget_plugin_record(plugin_name)
+        log(f"♻️  Plugin record for '{plugin_name}' is stale, retrying with a fresh lookup")
+        # Resolve from Airtable now; the retried sync then finds the fresh ID in the cache
+        get_plugin_record_id(api, plugin_name, marketplace_name, log=log, fresh=True)
+        return _dispatch_sync(api, component_type, name, plugin_name, marketplace_name,
+                              file_path, event_type, log)
+
+def _dispatch_sync(api, component_type, name, plugin_name, marketplace_name, file_path,
+                   event_type, log):
+    if component_type == 'agent':
+        return sync_agent(api, name, plugin_name, marketplace_name, file_path, log=log)
+    elif component_type == 'command':
+        return sync_command(api, name, plugin_name, marketplace_name, file_path, log=log)
+    elif component_type == 'skill':
+        return sync_skill(api, name, plugin_name, marketplace_name, file_path, log=log)
+    elif component_type == 'hook':
+        return sync_hook(api, name, event_type, plugin_name, marketplace_name, file_path, log=log)
+
+    log(f"❌ Unknown component type: {component_type}")
+    return False
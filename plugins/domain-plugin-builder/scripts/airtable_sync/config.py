@@ -0,0 +1,35 @@
+"""
+Airtable configuration shared by every script
+
+Kept free of third-party imports so scripts can read it (and fail fast on a
+missing token or bad arguments) without loading pyairtable or requests.
+"""
+
+import os
+
+# Airtable configuration
+BASE_ID = "appHbSB7WhT1TxEQb"
+AIRTABLE_TOKEN = os.getenv("AIRTABLE_TOKEN") or os.getenv("MCP_AIRTABLE_TOKEN")
+
+# Point at a local stand-in (airtable-standin.py) with DPB_AIRTABLE_URL
+AIRTABLE_URL = os.getenv("DPB_AIRTABLE_URL", "https://api.airtable.com")
+
+# Marketplace name for plugins synced from outside any marketplace
+STANDALONE_MARKER = "standalone"
+
+# Component type -> (table name, primary name field)
+COMPONENT_TABLES = {
+    'agent': ("Agents", "Agent Name"),
+    'command': ("Commands", "Command Name"),
+    'skill': ("Skills", "Skill Name"),
+    'hook': ("Hooks", "Hook Name"),
+}
+
+# Text field holding the composite upsert key "<plugin>/<name>" (see batch.py)
+SYNC_KEY_FIELD = "Sync Key"
+
+def print_missing_token():
+    """Explain how to provide the Airtable token"""
+    print("❌ ERROR: AIRTABLE_TOKEN or MCP_AIRTABLE_TOKEN environment variable not set")
+    print("   Export it: export AIRTABLE_TOKEN=your_token_here")
+    print("   Or: export MCP_AIRTABLE_TOKEN=your_token_here")
@@ -0,0 +1,157 @@
+"""
+Component discovery inside plugin directories
+
+Shared by bulk-sync-airtable.py, sync-validator.py and the watch daemon.
+Component types are singular ('agent', 'command', 'skill', 'hook'); the filter
+takes the plural directory names.
+
+Directories are listed with os.scandir so file types come from the directory
+entries instead of a stat() per file. scan_marketplaces() walks the plugins of
+every marketplace concurrently and parses the frontmatter of changed files in
+a process pool.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from airtable_sync.frontmatter import extract_frontmatter_many
+
+COMPONENT_TYPES = ['agents', 'commands', 'skills', 'hooks']
+
+# Directory listing is I/O bound, so threads overlap well beyond the core count
+SCAN_WORKERS = 16
+
+def scandir(path):
+    """Entries of a directory, or none if it doesn't exist"""
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+def iter_components(plugin_path, component_types):
+    """Yield (component type, name) for every component of the specified types
+
+    One directory is listed at a time, so a pipeline can start on the first
+    components before the last directory has been read.
+    """
+    if 'agents' in component_types:
+        for entry in scandir(os.path.join(plugin_path, 'agents')):
+            if entry.name.endswith('.md'):
+                yield ('agent', entry.name.replace('.md', ''))
+
+    if 'commands' in component_types:
+        for entry in scandir(os.path.join(plugin_path, 'commands')):
+            if entry.name.endswith('.md'):
+                yield ('command', entry.name.replace('.md', ''))
+
+    if 'skills' in component_types:
+        for entry in scandir(os.path.join(plugin_path, 'skills')):
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, 'SKILL.md')):
+                yield ('skill', entry.name)
+
+    if 'hooks' in component_types:
+        for entry in scandir(os.path.join(plugin_path, 'hooks')):
+            if entry.name.endswith('.sh'):
+                # Extract event type from filename (e.g., pre-commit.sh -> pre-commit)
+                yield ('hook', entry.name.replace('.sh', ''))
+
+def discover_components(plugin_path, component_types):
+    """Discover all components of specified types in a plugin"""
+    return list(iter_components(plugin_path, component_types))
+
+def component_file_path(component_type, component_name, plugin_path):
+    """Return the file (or skill directory) that backs a discovered component"""
+    if component_type == 'agent':
+        return os.path.join(plugin_path, 'agents', f'{component_name}.md')
+    elif component_type == 'command':
+        return os.path.join(plugin_path, 'commands', f'{component_name}.md')
+    elif component_type == 'skill':
+        return os.path.join(plugin_path, 'skills', component_name)
+    elif component_type == 'hook':
+        return os.path.join(plugin_path, 'hooks', f'{component_name}.sh')
+    return None
+
+def scan_plugin(marketplace_name, plugin_name, plugin_path):
+    """Components of one plugin, without frontmatter
+
+    Hooks come from hooks/hooks.json (with their event type and script path)
+    and, like the sync, from the hooks/*.sh scripts on disk; the other types
+    from the files on disk.
+    """
+    components = {comp_type: [] for comp_type in COMPONENT_TYPES}
+
+    for comp_type, name in discover_components(plugin_path, ['agents', 'commands', 'skills']):
+        components[f'{comp_type}s'].append({
+            'name': name,
+            'plugin': plugin_name,
+            'marketplace': marketplace_name,
+            'path': component_file_path(comp_type, name, plugin_path),
+        })
+
+    hooks_json = os.path.join(plugin_path, 'hooks', 'hooks.json')
+    if os.path.exists(hooks_json):
+        with open(hooks_json, 'r') as f:
+            hooks_data = json.load(f)
+        for event_type, hook_scripts in hooks_data.get('hooks', {}).items():
+            for hook_script in hook_scripts:
+                # Extract hook name from script path
+                components['hooks'].append({
+                    'name': os.path.basename(hook_script).replace('.sh', ''),
+                    'plugin': plugin_name,
+                    'marketplace': marketplace_name,
+                    'event_type': event_type,
+                    'script_path': hook_script,
+                })
+
+    # Scripts not registered in hooks.json are synced under their own name
+    registered = {hook['name'] for hook in components['hooks']}
+    for comp_type, name in discover_components(plugin_path, ['hooks']):
+        if name not in registered:
+            components['hooks'].append({
+                'name': name,
+                'plugin': plugin_name,
+                'marketplace': marketplace_name,
+                'event_type': name,
+                'script_path': component_file_path(comp_type, name, plugin_path),
+            })
+
+    return components
+
+def list_plugins(marketplace_name, marketplace_path):
+    """(marketplace, plugin name, plugin path) for every plugin directory"""
+    return [
+        (marketplace_name, entry.name, entry.path)
+        for entry in scandir(os.path.join(marketplace_path, 'plugins'))
+        if entry.is_dir()
+    ]
+
+def scan_marketplaces(marketplaces, max_workers=SCAN_WORKERS, log=print):
+    """Scan every plugin of every marketplace concurrently
+
+    Takes {marketplace name: root} and returns {'agents': [...], 'commands':
+    [...], 'skills': [...], 'hooks': [...]}. Agents, commands and skills carry
+    their parsed frontmatter. Order matches a sequential scan.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        plugins = [
+            plugin
+            for listed in executor.map(lambda item: list_plugins(*item), marketplaces.items())
+            for plugin in listed
+        ]
+        scanned = list(executor.map(lambda plugin: scan_plugin(*plugin), plugins))
+
+    components = {comp_type: [] for comp_type in COMPONENT_TYPES}
+    for plugin_components in scanned:
+        for comp_type in COMPONENT_TYPES:
+            components[comp_type].extend(plugin_components[comp_type])
+
+    markdown = [(comp, comp['path']) for comp in components['agents'] + components['commands']]
+    markdown += [(comp, os.path.join(comp['path'], 'SKILL.md')) for comp in components['skills']]
+
+    frontmatters = extract_frontmatter_many([path for _, path in markdown], log=log)
+    for comp, path in markdown:
+        comp['frontmatter'] = frontmatters[path]
+
+    return components
@@ -0,0 +1,291 @@
+"""
+Frontmatter parsing with a persistent cache
+
+Every scan used to open each markdown file, regex the whole content and run
+yaml.safe_load on it, even when nothing had changed since the last run. Parsed
+frontmatter is now kept in a SQLite file keyed by path, mtime and size, so
+unchanged files are answered with a single stat() and no open().
+
+Files that did change are read only up to the closing --- delimiter. The flat
+`key: value` blocks our components use are parsed directly; YAML is imported
+and used only for blocks the simple parser doesn't handle.
+
+The cache lives in ~/.cache/domain-plugin-builder/frontmatter.sqlite rather
+than in the marketplace roots, which are git checkouts. It is shared by the
+sync scripts, the validator scan and list-components.py, across processes.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from airtable_sync.plugin_cache import CACHE_DIR
+
+CACHE_PATH = os.path.join(CACHE_DIR, "frontmatter.sqlite")
+
+# Bump when parsing changes so cached results from the old parser are ignored
+PARSER_VERSION = 2
+
+# Below this many uncached files a process pool costs more than it saves
+PROCESS_POOL_MIN = 64
+
+# Plain scalars YAML would not read as strings (numbers, dates, booleans,
+# nulls, .inf) or that start a flow, alias, tag, block scalar or sequence
+NON_STRING_SCALAR = re.compile(
+    r'^(?:[-+.~0-9\[\]{}&*!|>%@`?:,#=]|(?:true|false|yes|no|on|off|null)$)', re.IGNORECASE
+)
+SIMPLE_LINE = re.compile(r'^([A-Za-z_][A-Za-z0-9_-]*):(?: +(.*?))?[ \t\r]*$')
+
+def frontmatter_block(lines):
+    """Text between the opening and closing --- lines, or None
+
+    Consumes lines only up to the closing delimiter, so passing a file object
+    reads just the head of the file.
+    """
+    first = next(lines, '')
+    if not re.match(r'^---\s*\n', first):
+        return None
+
+    block = []
+    for line in lines:
+        if line.endswith('\n') and line.rstrip() == '---':
+            return ''.join(block)[:-1]
+        block.append(line)
+    return None
+
+def parse_simple_frontmatter(text):
+    """Parse flat `key: value` frontmatter without YAML
+
+    Returns None for anything that needs a real YAML parser (nesting, lists,
+    block scalars, non-string values, escapes), so the caller can fall back.
+    Unquoted `argument-hint: [...]` is read as a string, like the YAML path.
+    """
+    result = {}
+    for line in text.split('\n'):
+        if not line.strip() or line.startswith('#'):
+            continue
+        match = SIMPLE_LINE.match(line)
+        if not match:
+            return None
+        key, value = match.group(1), match.group(2) or ''
+        if not value or NON_STRING_SCALAR.match(key):
+            return None
+
+        if key != 'argument-hint' and 'argument-hint:' in value and '[' in value:
+            # The YAML path would rewrite this line too; keep the behaviours identical
+            return None
+
+        if value[0] in '"\'':
+            quote = value[0]
+            if len(value) < 2 or value[-1] != quote or '\\' in value:
+                return None
+            inner = value[1:-1]
+            if quote == "'":
+                if "'" in inner.replace("''", ''):
+                    return None
+                inner = inner.replace("''", "'")
+            elif '"' in inner:
+                return None
+            result[key] = inner
+        elif key == 'argument-hint' and value.startswith('['):
+            if '"' in value or '\\' in value or value.endswith("'"):
+                return None
+            result[key] = value
+        elif NON_STRING_SCALAR.match(value) or re.search(r':(?:[ \t]|$)|[ \t]#|\t', value):
+            return None
+        else:
+            result[key] = value
+
+    return result or None
+
+def parse_frontmatter_block(frontmatter_text):
+    """Parse frontmatter text, using YAML only when the fast path can't"""
+    simple = parse_simple_frontmatter(frontmatter_text)
+    if simple is not None:
+        return simple
+
+    import yaml
+
+    # Fix argument-hint lines with square brackets
+    lines = frontmatter_text.split('\n')
+    fixed_lines = []
+    for line in lines:
+        if 'argument-hint:' in line and '[' in line:
+            if not (line.strip().endswith('"') or line.strip().endswith("'")):
+                parts = line.split(':', 1)
+                if len(parts) == 2:
+                    key = parts[0]
+                    value = parts[1].strip()
+                    line = f'{key}: "{value}"'
+        fixed_lines.append(line)
+
+    frontmatter_text = '\n'.join(fixed_lines)
+    return yaml.safe_load(frontmatter_text)
+
+def parse_frontmatter(content):
+    """Parse the YAML frontmatter at the start of markdown content, or None"""
+    block = frontmatter_block(iter(content.splitlines(keepends=True)))
+    return None if block is None else parse_frontmatter_block(block)
+
+def read_frontmatter(file_path):
+    """Read and parse a file's frontmatter without the cache
+
+    Reading stops at the closing --- so long agent and command bodies are
+    never loaded.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        block = frontmatter_block(f)
+    return None if block is None else parse_frontmatter_block(block)
+
+def read_frontmatter_safe(file_path):
+    """read_frontmatter for pool workers: (frontmatter, error message)"""
+    try:
+        frontmatter = read_frontmatter(file_path)
+        return json.loads(json.dumps(frontmatter, default=str)), None
+    except Exception as e:
+        return None, str(e)
+
+class FrontmatterCache:
+    """SQLite cache of parsed frontmatter, safe to share across threads and processes"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self.disabled = False
+
+    def _db(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS frontmatter (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    version INTEGER NOT NULL,
+                    data TEXT
+                )
+            """)
+            self._local.db = db
+        return db
+
+    def get(self, file_path, stat):
+        """Cached frontmatter as (hit, value) for a file with the given stat"""
+        row = self._db().execute(
+            "SELECT mtime_ns, size, version, data FROM frontmatter WHERE path=?", (file_path,)
+        ).fetchone()
+        if row and row[:3] == (stat.st_mtime_ns, stat.st_size, PARSER_VERSION):
+            return True, json.loads(row[3])
+        return False, None
+
+    def put(self, file_path, stat, frontmatter):
+        self.put_many([(file_path, stat, frontmatter)])
+
+    def put_many(self, entries):
+        """Store (path, stat, frontmatter) entries in one transaction"""
+        db = self._db()
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO frontmatter (path, mtime_ns, size, version, data) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (file_path, stat.st_mtime_ns, stat.st_size, PARSER_VERSION, json.dumps(frontmatter, default=str))
+                    for file_path, stat, frontmatter in entries
+                ],
+            )
+
+    def load(self, file_path):
+        """Parsed frontmatter of a file, from the cache when it is unchanged"""
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+
+        if not self.disabled:
+            try:
+                hit, frontmatter = self.get(file_path, stat)
+                if hit:
+                    return frontmatter
+            except sqlite3.Error:
+                # The cache is an optimisation; never fail a scan because of it
+                self.disabled = True
+
+        frontmatter = read_frontmatter(file_path)
+        # Round-trip through JSON so hits and misses return the same types
+        frontmatter = json.loads(json.dumps(frontmatter, default=str))
+
+        if not self.disabled:
+            try:
+                self.put(file_path, stat, frontmatter)
+            except sqlite3.Error:
+                self.disabled = True
+        return frontmatter
+
+    def load_many(self, file_paths, log=print):
+        """Parsed frontmatter of many files as {path: frontmatter}
+
+        Unchanged files are answered from the cache. When enough files changed,
+        they are parsed in a process pool so cold scans use every core.
+        Unreadable files are logged and map to None.
+        """
+        results = {}
+        misses = []
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+            except OSError as e:
+                log(f"❌ Error reading {file_path}: {e}")
+                results[file_path] = None
+                continue
+            hit = False
+            if not self.disabled:
+                try:
+                    hit, frontmatter = self.get(os.path.abspath(file_path), stat)
+                except sqlite3.Error:
+                    self.disabled = True
+            if hit:
+                results[file_path] = frontmatter
+            else:
+                misses.append((file_path, stat))
+
+        paths = [file_path for file_path, _ in misses]
+        workers = min(os.cpu_count() or 1, len(paths) // PROCESS_POOL_MIN)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(read_frontmatter_safe, paths, chunksize=max(len(paths) // (workers * 4), 1)))
+        else:
+            parsed = [read_frontmatter_safe(path) for path in paths]
+
+        entries = []
+        for (file_path, stat), (frontmatter, error) in zip(misses, parsed):
+            if error is not None:
+                log(f"❌ Error reading {file_path}: {error}")
+                results[file_path] = None
+                continue
+            results[file_path] = frontmatter
+            entries.append((os.path.abspath(file_path), stat, frontmatter))
+
+        if entries and not self.disabled:
+            try:
+                self.put_many(entries)
+            except sqlite3.Error:
+                self.disabled = True
+        return results
+
+# Shared by every scan in this process
+frontmatter_cache = FrontmatterCache()
+
+def extract_frontmatter(file_path, log=print):
+    """Extract YAML frontmatter from markdown file"""
+    try:
+        return frontmatter_cache.load(file_path)
+    except Exception as e:
+        log(f"❌ Error reading {file_path}: {e}")
+        return None
+
+def extract_frontmatter_many(file_paths, log=print):
+    """Extract YAML frontmatter from many markdown files as {path: frontmatter}"""
+    return frontmatter_cache.load_many(file_paths, log=log)
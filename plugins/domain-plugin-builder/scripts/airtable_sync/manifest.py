@@ -0,0 +1,185 @@
+"""
+Per-marketplace sync-state manifest for incremental syncs
+
+The manifest remembers, for every component synced from a marketplace, a hash
+of the fields that were sent and the Airtable record ID they landed in. Later
+runs compare fresh hashes against it and only send creates/updates for
+components that changed, plus deletes for components that disappeared, so a
+sync of an unchanged marketplace makes no network writes at all.
+
+Manifests live in ~/.cache/domain-plugin-builder/sync-state/<marketplace>.json.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from airtable_sync.components import build_record_fields, extract_frontmatter
+from airtable_sync.config import BASE_ID, COMPONENT_TABLES
+from airtable_sync.mirror import base_mirror
+from airtable_sync.plugin_cache import CACHE_DIR, is_missing_record_error
+
+STATE_DIR = os.path.join(CACHE_DIR, "sync-state")
+
+def manifest_key(component_type, plugin_name, name):
+    """Manifest key for a component: <type>:<plugin>/<name>"""
+    return f"{component_type}:{plugin_name}/{name}"
+
+def component_hash(component_type, name, plugin_name, frontmatter=None, event_type=None):
+    """Hash the fields a sync would send for a component"""
+    fields = build_record_fields(component_type, name, plugin_name, None, frontmatter, event_type)
+
+    # The plugin is already part of the key and its record ID can change
+    # without the component changing
+    fields.pop("Plugin", None)
+
+    payload = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def read_component_hash(component_type, name, plugin_name, file_path, event_type=None, log=print):
+    """Read a component from disk and hash it, or return None if it can't be parsed"""
+    frontmatter = None
+    if component_type in ('agent', 'command', 'skill'):
+        md_path = os.path.join(file_path, 'SKILL.md') if component_type == 'skill' else file_path
+        frontmatter = extract_frontmatter(md_path, log=log)
+        if not frontmatter:
+            return None
+    return component_hash(component_type, name, plugin_name, frontmatter, event_type)
+
+class SyncManifest:
+    """Sync state of one marketplace against one Airtable base"""
+
+    def __init__(self, marketplace_name, base_id=BASE_ID, state_dir=STATE_DIR):
+        self.marketplace_name = marketplace_name
+        self.base_id = base_id
+        self.path = os.path.join(state_dir, f"{marketplace_name}.json")
+        self.entries = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        # State recorded against another base is meaningless here
+        if data.get('base_id') != self.base_id:
+            return {}
+        return data.get('components', {})
+
+    @contextmanager
+    def _locked(self):
+        """Serialise read-modify-write cycles across concurrent sync processes"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def plan(self, current, component_types=None, plugins=None):
+        """Split components into changed, unchanged and removed
+
+        current maps manifest keys to fresh hashes. Manifest entries missing from
+        current count as removed only if they fall inside component_types and
+        plugins (None means all), so a partial sync never deletes components it
+        did not look at.
+        """
+        changed = []
+        unchanged = []
+        for key, content_hash in current.items():
+            if self.is_unchanged(key, content_hash):
+                unchanged.append(key)
+            else:
+                changed.append(key)
+
+        removed = []
+        for key, entry in self.entries.items():
+            if key in current:
+                continue
+            if component_types is not None and entry.get('type') not in component_types:
+                continue
+            if plugins is not None and entry.get('plugin') not in plugins:
+                continue
+            removed.append(key)
+
+        return changed, unchanged, removed
+
+    def is_unchanged(self, key, content_hash):
+        """True if key was synced with this hash and its record is known"""
+        entry = self.entries.get(key)
+        return bool(entry and entry.get('hash') == content_hash and entry.get('record_id'))
+
+    def record_id(self, key):
+        """Airtable record ID last synced for key, if known"""
+        return self.entries.get(key, {}).get('record_id')
+
+    def update(self, synced=None, removed=()):
+        """Record synced components and drop removed ones
+
+        synced maps manifest keys to dicts with type, plugin, name, hash and
+        record_id. Changes are merged into the file under a lock so parallel
+        sync-component.py runs don't lose each other's updates.
+        """
+        with self._locked():
+            self.entries = self._read()
+            now = time.time()
+            for key, entry in (synced or {}).items():
+                self.entries[key] = dict(entry, synced_at=now)
+            for key in removed:
+                self.entries.pop(key, None)
+
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'base_id': self.base_id,
+                    'marketplace': self.marketplace_name,
+                    'components': self.entries,
+                }, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+def delete_removed_components(api, manifest, removed_keys, log=print):
+    """Delete the Airtable records of components that disappeared from disk
+
+    Deletes are grouped by table and sent 10 per request. Returns the keys
+    whose records are gone (deleted now, or already missing in Airtable).
+    """
+    by_type = {}
+    gone = []
+    for key in removed_keys:
+        entry = manifest.entries.get(key, {})
+        if not entry.get('record_id'):
+            # Nothing to delete remotely; just forget it
+            gone.append(key)
+            continue
+        by_type.setdefault(entry['type'], []).append((key, entry['record_id']))
+
+    for component_type, records in by_type.items():
+        table = api.table(BASE_ID, COMPONENT_TABLES[component_type][0])
+        for chunk in api.chunked(records):
+            try:
+                table.batch_delete([record_id for _, record_id in chunk])
+                base_mirror.delete(table.name, [record_id for _, record_id in chunk])
+                gone.extend(key for key, _ in chunk)
+                continue
+            except Exception as e:
+                if not is_missing_record_error(e):
+                    log(f"❌ Failed to delete {len(chunk)} {component_type} record(s): {e}")
+                    continue
+
+            # One record in the chunk was already deleted; retry one by one
+            for key, record_id in chunk:
+                try:
+                    table.delete(record_id)
+                except Exception as e:
+                    if not is_missing_record_error(e):
+                        log(f"❌ Failed to delete {component_type} {record_id}: {e}")
+                        continue
+                base_mirror.delete(table.name, [record_id])
+                gone.append(key)
+
+    return gone
@@ -0,0 +1,32 @@
+"""
+Marketplace name -> root path map shared by the sync scripts
+
+DPB_MARKETPLACE_PATHS replaces the defaults with name=path entries separated
+by os.pathsep, e.g. DPB_MARKETPLACE_PATHS=bench=/tmp/bench-marketplace, so the
+scripts can run against other machines or synthetic marketplaces.
+"""
+
+import os
+
+DEFAULT_MARKETPLACE_PATHS = {
+    "dev-lifecycle-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/dev-lifecycle-marketplace",
+    "ai-dev-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/ai-dev-marketplace",
+    "mcp-servers-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/mcp-servers-marketplace",
+    "domain-plugin-builder": "/home/gotime2022/.claude/plugins/marketplaces/domain-plugin-builder",
+}
+
+def load_marketplace_paths(value=None):
+    """Parse a DPB_MARKETPLACE_PATHS value, or return the defaults if unset"""
+    value = os.getenv("DPB_MARKETPLACE_PATHS") if value is None else value
+    if not value:
+        return dict(DEFAULT_MARKETPLACE_PATHS)
+
+    paths = {}
+    for entry in value.split(os.pathsep):
+        name, sep, path = entry.partition('=')
+        if sep and name.strip() and path.strip():
+            paths[name.strip()] = os.path.expanduser(path.strip())
+    return paths
+
+# Marketplace root paths
+MARKETPLACE_PATHS = load_marketplace_paths()
@@ -0,0 +1,326 @@
+"""
+Local SQLite mirror of the Airtable base
+
+sync-validator.py downloaded all five tables on every run and every sync
+looked its records up in Airtable one request at a time. The Plugins, Agents,
+Commands, Skills and Hooks tables are now mirrored in
+~/.cache/domain-plugin-builder/mirror.sqlite and refreshed incrementally:
+
+- The first refresh of a table downloads it in full
+- Later refreshes pull only the records created or modified since the
+  table's watermark (a LAST_MODIFIED_TIME() formula), re-reading a short
+  overlap to cover clock skew and writes that were still in flight
+- Records deleted in Airtable don't show up in a modified-since query, so
+  every RECONCILE_INTERVAL the table's record IDs are listed (primary field
+  only): records missing from Airtable are dropped, and IDs the mirror
+  never saw make it download the table again
+- Writes made by the sync scripts are written through, so a run sees its own
+  creates, updates and deletes without another refresh
+
+Lookups are only answered from tables this process refreshed in the last
+FRESH_FOR seconds; anything else falls back to Airtable. Like the other
+caches, the mirror is an optimisation and never fails a sync.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from airtable_sync.config import BASE_ID, COMPONENT_TABLES, SYNC_KEY_FIELD
+from airtable_sync.plugin_cache import CACHE_DIR
+
+MIRROR_PATH = os.path.join(CACHE_DIR, "mirror.sqlite")
+
+# Table name -> primary name field
+MIRROR_TABLES = {
+    "Plugins": "Name",
+    **{table_name: name_field for table_name, name_field in COMPONENT_TABLES.values()},
+}
+
+# Fields mirrored per table: the ones the syncs write (and compare before
+# writing) and the diffs read. Long-text columns nobody reads stay behind.
+MIRROR_FIELDS = {
+    "Plugins": ["Name"],
+    "Agents": ["Agent Name", "Plugin", SYNC_KEY_FIELD],
+    "Commands": ["Command Name", "Description", "Argument Hint", "Plugin", "File Path", SYNC_KEY_FIELD],
+    "Skills": ["Skill Name", "Description", "Plugin", "Directory Path", SYNC_KEY_FIELD],
+    "Hooks": ["Hook Name", "Event Type", "Plugin", SYNC_KEY_FIELD],
+}
+
+# Seconds re-read before the watermark on every refresh
+WATERMARK_OVERLAP = 300
+
+# Seconds between ID-set reconciles that catch records deleted in Airtable
+RECONCILE_INTERVAL = float(os.getenv("DPB_MIRROR_RECONCILE", 60 * 60))
+
+# Seconds a refresh in this process keeps a table trusted for lookups
+FRESH_FOR = 10 * 60
+
+def iso_time(timestamp):
+    """Unix time as an Airtable ISO time: 2024-01-01T00:00:00.000Z"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+def modified_since_formula(watermark):
+    """Records created or modified after watermark (an ISO time)"""
+    after = f"DATETIME_PARSE('{watermark}')"
+    return f"OR(IS_AFTER(LAST_MODIFIED_TIME(), {after}),IS_AFTER(CREATED_TIME(), {after}))"
+
+class BaseMirror:
+    """Records of the mirrored tables, shared by every script run"""
+
+    def __init__(self, path=MIRROR_PATH, base_id=BASE_ID):
+        self.path = path
+        self.base_id = base_id
+        self._lock = threading.RLock()
+        self._conn = None
+        self._refreshed = {}
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript("""
+                CREATE TABLE IF NOT EXISTS records (
+                    base_id TEXT NOT NULL,
+                    table_name TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    created_time TEXT,
+                    name TEXT,
+                    sync_key TEXT,
+                    fields TEXT NOT NULL,
+                    PRIMARY KEY (base_id, table_name, id)
+                );
+                CREATE INDEX IF NOT EXISTS records_name ON records (base_id, table_name, name);
+                CREATE INDEX IF NOT EXISTS records_sync_key ON records (base_id, table_name, sync_key);
+                CREATE TABLE IF NOT EXISTS tables (
+                    base_id TEXT NOT NULL,
+                    table_name TEXT NOT NULL,
+                    watermark TEXT,
+                    reconciled_at REAL,
+                    PRIMARY KEY (base_id, table_name)
+                );
+            """)
+            self._conn = db
+        return self._conn
+
+    def _row(self, table_name, record):
+        # Written-through records carry every column; keep the fetched shape
+        fields = {k: v for k, v in record.get('fields', {}).items() if k in MIRROR_FIELDS[table_name]}
+        return (
+            self.base_id, table_name, record['id'], record.get('createdTime'),
+            fields.get(MIRROR_TABLES[table_name]), fields.get(SYNC_KEY_FIELD), json.dumps(fields),
+        )
+
+    def _records(self, query, params):
+        with self._lock:
+            rows = self._db().execute(query, params).fetchall()
+        return [{'id': row[0], 'createdTime': row[1], 'fields': json.loads(row[2])} for row in rows]
+
+    def state(self, table_name):
+        """(watermark, reconciled_at) of a table, (None, None) if never refreshed"""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT watermark, reconciled_at FROM tables WHERE base_id=? AND table_name=?",
+                (self.base_id, table_name),
+            ).fetchone()
+        return tuple(row) if row else (None, None)
+
+    def count(self, table_name):
+        with self._lock:
+            return self._db().execute(
+                "SELECT COUNT(*) FROM records WHERE base_id=? AND table_name=?", (self.base_id, table_name)
+            ).fetchone()[0]
+
+    def _ids(self, table_name):
+        with self._lock:
+            return {row[0] for row in self._db().execute(
+                "SELECT id FROM records WHERE base_id=? AND table_name=?", (self.base_id, table_name)
+            )}
+
+    def _fetch(self, api, table_name, reconcile):
+        """Download what a refresh of table_name needs (runs in a worker thread)
+
+        Returns (records, IDs deleted in Airtable or None, full download,
+        started at).
+        """
+        table = api.table(self.base_id, table_name)
+        fields = MIRROR_FIELDS[table_name]
+        started = time.time()
+        watermark, reconciled_at = self.state(table_name)
+
+        if watermark is None:
+            return table.all(fields=fields, page_size=100), None, True, started
+
+        records = table.all(formula=modified_since_formula(watermark), fields=fields, page_size=100)
+        if not reconcile and started - (reconciled_at or 0) < RECONCILE_INTERVAL:
+            return records, None, False, started
+
+        remote_ids = {record['id'] for record in table.all(fields=[MIRROR_TABLES[table_name]], page_size=100)}
+        local_ids = self._ids(table_name) | {record['id'] for record in records}
+        if remote_ids - local_ids:
+            # Records the watermark missed; start over from a full download
+            return table.all(fields=fields, page_size=100), None, True, started
+        return records, local_ids - remote_ids, False, started
+
+    def _apply(self, table_name, records, gone, full, started):
+        """Store one table's refresh; returns how many records actually changed
+
+        The watermark overlap re-reads recent records, so records identical to
+        the mirrored copy don't count.
+        """
+        with self._lock:
+            db = self._db()
+            stored = {}
+            for i in range(0, len(records), 500):
+                chunk = [record['id'] for record in records[i:i + 500]]
+                stored.update(db.execute(
+                    "SELECT id, fields FROM records WHERE base_id=? AND table_name=? "
+                    f"AND id IN ({','.join('?' * len(chunk))})",
+                    (self.base_id, table_name, *chunk),
+                ).fetchall())
+            changed = sum(1 for record in records if stored.get(record['id']) != json.dumps(record['fields']))
+            with db:
+                if full:
+                    db.execute("DELETE FROM records WHERE base_id=? AND table_name=?", (self.base_id, table_name))
+                db.executemany(
+                    "INSERT OR REPLACE INTO records (base_id, table_name, id, created_time, name, sync_key, fields) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [self._row(table_name, record) for record in records],
+                )
+                db.executemany(
+                    "DELETE FROM records WHERE base_id=? AND table_name=? AND id=?",
+                    [(self.base_id, table_name, record_id) for record_id in gone or ()],
+                )
+                reconciled = full or gone is not None
+                db.execute("""
+                    INSERT INTO tables (base_id, table_name, watermark, reconciled_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(base_id, table_name) DO UPDATE SET
+                        watermark=excluded.watermark,
+                        reconciled_at=COALESCE(excluded.reconciled_at, reconciled_at)
+                """, (self.base_id, table_name, iso_time(started - WATERMARK_OVERLAP), started if reconciled else None))
+            self._refreshed[table_name] = time.monotonic()
+        return changed
+
+    def refresh(self, api, tables=None, reconcile=False, log=print):
+        """Bring tables (default: all mirrored tables) up to date, concurrently
+
+        reconcile=True lists every table's record IDs now instead of waiting
+        for RECONCILE_INTERVAL. Returns the tables that could not be refreshed.
+        """
+        tables = list(tables or MIRROR_TABLES)
+        failed = []
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            futures = {table_name: executor.submit(self._fetch, api, table_name, reconcile) for table_name in tables}
+            for table_name, future in futures.items():
+                try:
+                    records, gone, full, started = future.result()
+                    changed = self._apply(table_name, records, gone, full, started)
+                except Exception as e:
+                    log(f"⚠️  Could not refresh {table_name} mirror: {e}")
+                    self._refreshed.pop(table_name, None)
+                    failed.append(table_name)
+                    continue
+                if full:
+                    log(f"📥 {table_name}: downloaded {len(records)} record(s)")
+                elif changed or gone:
+                    log(f"📥 {table_name}: {changed} changed, {len(gone or ())} deleted in Airtable")
+        return failed
+
+    def is_fresh(self, table_name):
+        """True if this process refreshed table_name recently enough to trust it"""
+        refreshed = self._refreshed.get(table_name)
+        return refreshed is not None and time.monotonic() - refreshed < FRESH_FOR
+
+    def records(self, table_name):
+        """Every mirrored record of a table, or None if it is not fresh"""
+        if not self.is_fresh(table_name):
+            return None
+        return self._records(
+            "SELECT id, created_time, fields FROM records WHERE base_id=? AND table_name=? ORDER BY rowid",
+            (self.base_id, table_name),
+        )
+
+    def find(self, table_name, name):
+        """Records whose primary field equals name, or None if not fresh"""
+        if not self.is_fresh(table_name):
+            return None
+        return self._records(
+            "SELECT id, created_time, fields FROM records WHERE base_id=? AND table_name=? AND name=? ORDER BY rowid",
+            (self.base_id, table_name, name),
+        )
+
+    def by_sync_key(self, table_name, keys):
+        """Records with one of these Sync Keys, or None if not fresh"""
+        if not self.is_fresh(table_name):
+            return None
+        keys = list(keys)
+        found = []
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            found.extend(self._records(
+                "SELECT id, created_time, fields FROM records WHERE base_id=? AND table_name=? "
+                f"AND sync_key IN ({','.join('?' * len(chunk))})",
+                (self.base_id, table_name, *chunk),
+            ))
+        return found
+
+    def unkeyed(self, table_name):
+        """Records without a Sync Key, or None if not fresh"""
+        if not self.is_fresh(table_name):
+            return None
+        return self._records(
+            "SELECT id, created_time, fields FROM records WHERE base_id=? AND table_name=? "
+            "AND (sync_key IS NULL OR sync_key='')",
+            (self.base_id, table_name),
+        )
+
+    def put(self, table_name, records):
+        """Write through records Airtable returned from a create, update or upsert"""
+        if table_name not in MIRROR_TABLES or not os.path.exists(self.path):
+            return
+        try:
+            with self._lock:
+                db = self._db()
+                with db:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO records (base_id, table_name, id, created_time, name, sync_key, fields) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [self._row(table_name, record) for record in records],
+                    )
+        except sqlite3.Error:
+            # The next refresh picks the records up anyway
+            pass
+
+    def delete(self, table_name, record_ids):
+        """Write through deleted records"""
+        if table_name not in MIRROR_TABLES or not os.path.exists(self.path):
+            return
+        try:
+            with self._lock:
+                db = self._db()
+                with db:
+                    db.executemany(
+                        "DELETE FROM records WHERE base_id=? AND table_name=? AND id=?",
+                        [(self.base_id, table_name, record_id) for record_id in record_ids],
+                    )
+        except sqlite3.Error:
+            # Without the write-through the next reconcile drops them
+            pass
+
+    def clear(self):
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute("DELETE FROM records WHERE base_id=?", (self.base_id,))
+                db.execute("DELETE FROM tables WHERE base_id=?", (self.base_id,))
+            self._refreshed.clear()
+
+# Shared by every sync in this process
+base_mirror = BaseMirror()
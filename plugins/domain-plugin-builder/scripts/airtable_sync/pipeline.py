@@ -0,0 +1,140 @@
+"""
+Staged pipeline over bounded queues
+
+bulk-sync-airtable.py used to discover every component, then validate them
+one after another, then sync them, so the network sat idle during validation
+and the other way round. Its stages now run at the same time, each with its
+own worker threads, connected by bounded queues: items flow on as soon as a
+stage is done with them, and a slow stage holds the ones before it back
+instead of letting work pile up in memory.
+
+Each stage counts its items, the time its workers were busy and the time
+from its first item starting to its last one finishing, which gives its
+throughput.
+"""
+
+import queue
+import threading
+import time
+
+# Items waiting between two stages
+QUEUE_SIZE = 32
+
+_DONE = object()
+
+class Stage:
+    """One stage: `workers` threads calling fn(item, emit) for each input
+
+    emit(item) hands an item to the next stage. finish(emit), if given, runs
+    once after the last input has been handled, for stages that hold items
+    back (batching).
+    """
+
+    def __init__(self, name, fn, workers=1, finish=None):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.finish = finish
+        self.items = 0
+        self.busy = 0.0
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def _record(self, start, end, items=1):
+        with self._lock:
+            self.items += items
+            self.busy += end - start
+            self.started = start if self.started is None else min(self.started, start)
+            self.finished = end if self.finished is None else max(self.finished, end)
+
+    @property
+    def elapsed(self):
+        """Seconds from the first item starting to the last one finishing"""
+        if self.started is None:
+            return 0.0
+        return self.finished - self.started
+
+    @property
+    def throughput(self):
+        """Items per second while the stage had work"""
+        return self.items / self.elapsed if self.elapsed > 0 else 0.0
+
+def run_pipeline(source, stages, queue_size=QUEUE_SIZE):
+    """Push every item of source through stages and wait for all of them
+
+    source is iterated in its own thread, so it can be a generator that
+    discovers items lazily. Stage functions handle their own errors; an
+    exception escaping one is re-raised here once the pipeline has drained.
+    """
+    inputs = [queue.Queue(maxsize=queue_size) for _ in stages]
+    errors = []
+
+    def feed():
+        try:
+            for item in source:
+                inputs[0].put(item)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            for _ in range(stages[0].workers):
+                inputs[0].put(_DONE)
+
+    def run_stage(index):
+        stage = stages[index]
+        downstream = inputs[index + 1] if index + 1 < len(stages) else None
+        emit = downstream.put if downstream else (lambda item: None)
+        remaining = [stage.workers]
+        lock = threading.Lock()
+
+        def work():
+            while True:
+                item = inputs[index].get()
+                if item is _DONE:
+                    break
+                start = time.monotonic()
+                try:
+                    stage.fn(item, emit)
+                except Exception as e:
+                    errors.append(e)
+                stage._record(start, time.monotonic())
+
+            # The last worker out flushes the stage and closes the next queue
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if not last:
+                return
+            start = time.monotonic()
+            try:
+                if stage.finish:
+                    stage.finish(emit)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                if stage.finish:
+                    stage._record(start, time.monotonic(), items=0)
+                if downstream:
+                    for _ in range(stages[index + 1].workers):
+                        downstream.put(_DONE)
+
+        return [threading.Thread(target=work, daemon=True) for _ in range(stage.workers)]
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    for index in range(len(stages)):
+        threads.extend(run_stage(index))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    return stages
+
+def print_throughput(stages, log=print):
+    """Per-stage item counts, busy time and throughput"""
+    log(f"   {'Stage':<12}{'Items':>7}{'Workers':>9}{'Busy (s)':>10}{'Active (s)':>12}{'Items/s':>9}")
+    for stage in stages:
+        log(f"   {stage.name:<12}{stage.items:>7}{stage.workers:>9}{stage.busy:>10.2f}"
+            f"{stage.elapsed:>12.2f}{stage.throughput:>9.1f}")
@@ -0,0 +1,94 @@
+"""
+Plugin name -> Airtable record ID cache
+
+get_plugin_record_id used to query the Plugins table on every sync call, so a
+bulk sync of one plugin repeated the same lookup hundreds of times. Lookups are
+now answered from memory, then from a JSON file shared by every script run,
+and only then from Airtable. Entries expire after a TTL and are dropped as soon
+as Airtable reports the cached record missing.
+"""
+
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = os.path.expanduser(os.getenv("DPB_CACHE_DIR", "~/.cache/domain-plugin-builder"))
+CACHE_PATH = os.path.join(CACHE_DIR, "plugin-record-ids.json")
+
+# Plugin records are rarely deleted; re-check them once a day
+DEFAULT_TTL = 24 * 60 * 60
+
+class PluginIdCache:
+    """In-memory + on-disk cache of plugin record IDs keyed by base and plugin name"""
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        """Load the disk cache on first use"""
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        """Write the cache atomically so concurrent runs never read a partial file"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The cache is an optimisation; never fail a sync because of it
+            pass
+
+    def get(self, base_id, plugin_name):
+        """Return the cached record ID, or None if missing or expired"""
+        with self._lock:
+            entry = self._load().get(f"{base_id}/{plugin_name}")
+            if not entry:
+                return None
+            if time.time() - entry.get('cached_at', 0) > self.ttl:
+                return None
+            return entry.get('id')
+
+    def put(self, base_id, plugin_name, record_id):
+        """Remember the record ID for a plugin"""
+        with self._lock:
+            self._load()[f"{base_id}/{plugin_name}"] = {
+                'id': record_id,
+                'cached_at': time.time(),
+            }
+            self._save()
+
+    def invalidate(self, base_id, plugin_name):
+        """Forget a plugin whose record no longer exists"""
+        with self._lock:
+            if self._load().pop(f"{base_id}/{plugin_name}", None) is not None:
+                self._save()
+
+# Shared by every sync in this process
+plugin_ids = PluginIdCache()
+
+def is_missing_record_error(error):
+    """True if Airtable rejected a request because a (linked) record does not exist
+
+    Accepts requests' HTTPError (status on error.response) as well as errors
+    raised by the async client, which carry status_code and text themselves.
+    """
+    response = getattr(error, 'response', None)
+    if response is None:
+        response = error
+    status_code = getattr(response, 'status_code', None)
+    if status_code == 404:
+        return True
+    # Writing a link to a deleted record fails with 422 ROW_DOES_NOT_EXIST
+    return status_code == 422 and 'ROW_DOES_NOT_EXIST' in (getattr(response, 'text', '') or '')
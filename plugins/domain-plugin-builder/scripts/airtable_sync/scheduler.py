@@ -0,0 +1,136 @@
+"""
+Rate-limit-aware request scheduling for every Airtable caller
+
+Airtable allows 5 requests per second per base and answers bursts above that
+with 429 followed by a 30 second penalty window. All sync scripts hit the same
+base, often in parallel, so requests are paced by one token bucket per base.
+The bucket lives in a small state file guarded by an flock, which makes it
+shared by every worker thread in a process and by concurrent processes.
+
+make_api() mounts RateLimitedAdapter (adapter.py) on every session, so callers
+get pacing and 429 handling without changing how they use pyairtable. This
+module itself has no third-party imports; the async client uses it too.
+"""
+
+import fcntl
+import json
+import os
+import re
+import threading
+import time
+
+from airtable_sync.plugin_cache import CACHE_DIR
+
+STATE_DIR = os.path.join(CACHE_DIR, "ratelimit")
+
+# Just under Airtable's documented limit of 5 per base: a request held up on
+# its way out (thread scheduling, connection setup) would otherwise land in
+# the same one-second window as the next five and draw a 30 second penalty
+DEFAULT_RATE = float(os.getenv("DPB_AIRTABLE_RPS", "4.5"))
+
+# Airtable asks clients to wait 30 seconds after a 429
+DEFAULT_PENALTY = 30.0
+
+MAX_429_RETRIES = 5
+
+BASE_ID_PATTERN = re.compile(r'/v0/(app[A-Za-z0-9]+)')
+
+class RateLimiter:
+    """Token bucket for one base, shared across threads and processes"""
+
+    def __init__(self, base_id, rate=DEFAULT_RATE, burst=None, state_dir=STATE_DIR):
+        self.base_id = base_id
+        self.rate = rate
+        # A burst of one spaces requests evenly, so no one-second window
+        # ever sees more than `rate` requests
+        self.burst = burst if burst is not None else 1.0
+        self.path = os.path.join(state_dir, f"{base_id}.json")
+        self._lock = threading.Lock()
+
+    def _update(self, fn, blocking=True):
+        """Run fn(state, now) on the bucket state under the process-wide lock
+
+        With blocking=False, raises BlockingIOError instead of waiting when
+        another thread or process holds the lock.
+        """
+        if not self._lock.acquire(blocking=blocking):
+            raise BlockingIOError(f"Rate limiter for {self.base_id} is busy")
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, 'r+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                try:
+                    try:
+                        state = json.loads(f.read() or '{}')
+                    except ValueError:
+                        state = {}
+
+                    now = time.time()
+                    tokens = state.get('tokens', self.burst)
+                    updated = state.get('updated', now)
+                    state['tokens'] = min(self.burst, tokens + max(now - updated, 0) * self.rate)
+                    state['updated'] = now
+                    state.setdefault('blocked_until', 0)
+
+                    result = fn(state, now)
+
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    return result
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        finally:
+            self._lock.release()
+
+    def try_acquire(self, blocking=True):
+        """Take a token if one is available
+
+        Returns 0 when a request may be sent now, otherwise the number of
+        seconds to wait before trying again. Async callers sleep on this, and
+        pass blocking=False so a held lock never stalls their event loop.
+        """
+        def take(state, now):
+            if now < state['blocked_until']:
+                return state['blocked_until'] - now
+            if state['tokens'] >= 1:
+                state['tokens'] -= 1
+                return 0
+            return (1 - state['tokens']) / self.rate
+
+        return self._update(take, blocking)
+
+    def acquire(self):
+        """Block until a request may be sent to this base"""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def penalize(self, delay, blocking=True):
+        """Stop every caller of this base for delay seconds after a 429"""
+        def block(state, now):
+            state['blocked_until'] = max(state['blocked_until'], now + delay)
+            state['tokens'] = 0
+
+        self._update(block, blocking)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(base_id):
+    """Return the process-wide limiter for a base"""
+    with _limiters_lock:
+        if base_id not in _limiters:
+            _limiters[base_id] = RateLimiter(base_id)
+        return _limiters[base_id]
+
+def retry_after_seconds(response):
+    """Seconds to wait after a 429, from Retry-After or Airtable's 30s penalty"""
+    value = response.headers.get('Retry-After')
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return DEFAULT_PENALTY
@@ -0,0 +1,521 @@
+"""
+Local stand-in for the Airtable REST API
+
+Implements the subset of the API the sync scripts use, backed by memory (or a
+SQLite file with --db), so syncs can be run, measured and regression-tested
+without a live base:
+
+- GET /v0/<base>/<table> and POST .../listRecords with filterByFormula,
+  fields[], pageSize, maxRecords and offset pagination
+- GET/PATCH/PUT/DELETE /v0/<base>/<table>/<record id>
+- POST (create), PATCH/PUT (update and performUpsert) and DELETE (records[])
+  batch endpoints, 10 records per request
+- Linked-record arrays: writing a record ID that does not exist fails with
+  422 ROW_DOES_NOT_EXIST, like Airtable
+- A per-base rate limit (5 requests/second by default) answered with 429 and
+  a penalty window during which every request is refused
+- Errors in Airtable's JSON format: 422 for malformed bodies, queries and
+  formulas, 500 for anything unexpected, so a client never waits on a
+  request that died without a response
+
+Formulas support {Field}='value' equality and
+IS_AFTER(LAST_MODIFIED_TIME() or CREATED_TIME(), DATETIME_PARSE('<ISO time>')),
+plain or inside AND()/OR(), with {Field}='' matching empty fields. Tables are
+created on first use and accept any field name.
+
+Point the scripts at it with DPB_AIRTABLE_URL=http://127.0.0.1:<port>; any
+token is accepted. GET /_stats returns request and 429 counts, POST /_reset
+clears them (and with ?data=1 the records too).
+"""
+
+import json
+import random
+import re
+import sqlite3
+import string
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+MAX_RECORDS_PER_REQUEST = 10
+MAX_PAGE_SIZE = 100
+
+RECORD_ID_PATTERN = re.compile(r'^rec[A-Za-z0-9]{14}$')
+EQUALITY_PATTERN = re.compile(r"""^\{([^}]+)\}\s*=\s*(?:'((?:[^'\\]|\\.)*)'|"((?:[^"\\]|\\.)*)")$""")
+TIME_PATTERN = re.compile(
+    r"""^IS_AFTER\(\s*(LAST_MODIFIED_TIME|CREATED_TIME)\(\)\s*,\s*DATETIME_PARSE\(\s*'([^']*)'\s*\)\s*\)$""",
+    re.IGNORECASE,
+)
+
+# Record keys the API returns; anything else is bookkeeping
+PUBLIC_KEYS = ('id', 'createdTime', 'fields')
+
+class APIError(Exception):
+    """Error response in Airtable's format"""
+
+    def __init__(self, status, error_type, message):
+        super().__init__(message)
+        self.status = status
+        self.error_type = error_type
+        self.message = message
+
+    def body(self):
+        return {'error': {'type': self.error_type, 'message': self.message}}
+
+def split_arguments(text):
+    """Split a formula argument list on top-level commas"""
+    args, depth, quote, current = [], 0, None, ''
+    for ch in text:
+        if quote:
+            quote = None if ch == quote else quote
+        elif ch in '\'"':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            args.append(current.strip())
+            current = ''
+            continue
+        current += ch
+    args.append(current.strip())
+    return args
+
+def now_iso():
+    """Current UTC time as Airtable formats it: 2024-01-01T00:00:00.000Z"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+def parse_time(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def public(record):
+    """A record as the API returns it, without the stand-in's bookkeeping"""
+    return {key: record[key] for key in PUBLIC_KEYS}
+
+def compile_formula(formula):
+    """Turn a filterByFormula string into a predicate over a record"""
+    formula = formula.strip()
+    match = re.match(r'^(AND|OR)\((.*)\)$', formula, re.IGNORECASE | re.DOTALL)
+    if match:
+        parts = [compile_formula(arg) for arg in split_arguments(match.group(2))]
+        combine = all if match.group(1).upper() == 'AND' else any
+        return lambda record: combine(part(record) for part in parts)
+
+    match = TIME_PATTERN.match(formula)
+    if match:
+        key = 'modifiedTime' if match.group(1).upper() == 'LAST_MODIFIED_TIME' else 'createdTime'
+        try:
+            after = parse_time(match.group(2))
+        except ValueError:
+            raise APIError(422, 'INVALID_FILTER_BY_FORMULA', f"Invalid date in formula: {formula}")
+        return lambda record: parse_time(record.get(key) or record['createdTime']) > after
+
+    match = EQUALITY_PATTERN.match(formula)
+    if not match:
+        raise APIError(422, 'INVALID_FILTER_BY_FORMULA', f"The formula for filtering records is invalid: {formula}")
+
+    field = match.group(1)
+    value = match.group(2) if match.group(2) is not None else match.group(3)
+    value = re.sub(r'\\(.)', r'\1', value)
+
+    def predicate(record):
+        actual = record['fields'].get(field)
+        if actual in (None, '', []):
+            return value == ''
+        if isinstance(actual, list):
+            actual = ', '.join(str(v) for v in actual)
+        return str(actual) == value
+
+    return predicate
+
+def strip_bookkeeping(payload):
+    """Drop the stand-in's own record keys from a response"""
+    if 'records' in payload:
+        return dict(payload, records=[public(r) if 'fields' in r else r for r in payload['records']])
+    if 'fields' in payload:
+        return public(payload)
+    return payload
+
+class MemoryStore:
+    """Records of every base and table, kept in insertion order"""
+
+    def __init__(self):
+        self.tables = {}
+
+    def table(self, base_id, table_name):
+        return self.tables.setdefault((base_id, table_name), {})
+
+    def records(self, base_id, table_name):
+        return list(self.table(base_id, table_name).values())
+
+    def get(self, base_id, table_name, record_id):
+        return self.table(base_id, table_name).get(record_id)
+
+    def put(self, base_id, table_name, record):
+        self.table(base_id, table_name)[record['id']] = record
+
+    def delete(self, base_id, table_name, record_id):
+        return self.table(base_id, table_name).pop(record_id, None) is not None
+
+    def exists(self, base_id, record_id):
+        return any(
+            record_id in records
+            for (table_base, _), records in self.tables.items()
+            if table_base == base_id
+        )
+
+    def clear(self):
+        self.tables.clear()
+
+class SQLiteStore:
+    """Same interface as MemoryStore, persisted to a SQLite file"""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                base_id TEXT, table_name TEXT, id TEXT, seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_time TEXT, fields TEXT, modified_time TEXT, UNIQUE (base_id, id)
+            )
+        """)
+        columns = [row[1] for row in self.db.execute("PRAGMA table_info(records)")]
+        if 'modified_time' not in columns:
+            self.db.execute("ALTER TABLE records ADD COLUMN modified_time TEXT")
+        self.db.commit()
+
+    def _record(self, row):
+        return {'id': row[0], 'createdTime': row[1], 'fields': json.loads(row[2]), 'modifiedTime': row[3] or row[1]}
+
+    def records(self, base_id, table_name):
+        rows = self.db.execute(
+            "SELECT id, created_time, fields, modified_time FROM records WHERE base_id=? AND table_name=? ORDER BY seq",
+            (base_id, table_name),
+        )
+        return [self._record(row) for row in rows]
+
+    def get(self, base_id, table_name, record_id):
+        row = self.db.execute(
+            "SELECT id, created_time, fields, modified_time FROM records WHERE base_id=? AND table_name=? AND id=?",
+            (base_id, table_name, record_id),
+        ).fetchone()
+        return self._record(row) if row else None
+
+    def put(self, base_id, table_name, record):
+        with self.db:
+            updated = self.db.execute(
+                "UPDATE records SET fields=?, modified_time=? WHERE base_id=? AND id=?",
+                (json.dumps(record['fields']), record['modifiedTime'], base_id, record['id']),
+            ).rowcount
+            if not updated:
+                self.db.execute(
+                    "INSERT INTO records (base_id, table_name, id, created_time, fields, modified_time) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (base_id, table_name, record['id'], record['createdTime'], json.dumps(record['fields']),
+                     record['modifiedTime']),
+                )
+
+    def delete(self, base_id, table_name, record_id):
+        with self.db:
+            return self.db.execute(
+                "DELETE FROM records WHERE base_id=? AND table_name=? AND id=?",
+                (base_id, table_name, record_id),
+            ).rowcount > 0
+
+    def exists(self, base_id, record_id):
+        return self.db.execute(
+            "SELECT 1 FROM records WHERE base_id=? AND id=?", (base_id, record_id)
+        ).fetchone() is not None
+
+    def clear(self):
+        with self.db:
+            self.db.execute("DELETE FROM records")
+
+class StandIn:
+    """Request handling, rate limiting and statistics for one server"""
+
+    def __init__(self, store=None, rate=5.0, penalty=30.0, seed=None):
+        self.store = store or MemoryStore()
+        self.rate = rate
+        self.penalty = penalty
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+        self.windows = {}
+        self.blocked_until = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {'requests': 0, 'rate_limited': 0, 'by_method': {}, 'records_written': 0}
+
+    def new_record_id(self):
+        return 'rec' + ''.join(self.random.choices(string.ascii_letters + string.digits, k=14))
+
+    def check_rate_limit(self, base_id):
+        """Refuse requests above `rate` per second, then for the penalty window"""
+        if not self.rate:
+            return None
+
+        now = time.monotonic()
+        if now < self.blocked_until.get(base_id, 0):
+            return self.blocked_until[base_id] - now
+
+        window = self.windows.setdefault(base_id, deque())
+        while window and now - window[0] >= 1.0:
+            window.popleft()
+        if len(window) >= self.rate:
+            self.blocked_until[base_id] = now + self.penalty
+            return self.penalty
+        window.append(now)
+        return None
+
+    def check_links(self, base_id, fields):
+        """Reject writes that link to records which don't exist"""
+        for value in fields.values():
+            if not isinstance(value, list):
+                continue
+            for item in value:
+                if isinstance(item, str) and RECORD_ID_PATTERN.match(item) and not self.store.exists(base_id, item):
+                    raise APIError(422, 'ROW_DOES_NOT_EXIST', f"Record ID {item} does not exist")
+
+    def create(self, base_id, table_name, fields):
+        self.check_links(base_id, fields)
+        created = now_iso()
+        record = {
+            'id': self.new_record_id(),
+            'createdTime': created,
+            'fields': {k: v for k, v in fields.items() if v not in (None, '', [])},
+            'modifiedTime': created,
+        }
+        self.store.put(base_id, table_name, record)
+        self.stats['records_written'] += 1
+        return record
+
+    def update(self, base_id, table_name, record_id, fields, replace=False):
+        record = self.store.get(base_id, table_name, record_id)
+        if record is None:
+            raise APIError(404, 'NOT_FOUND', f"Could not find record {record_id}")
+        self.check_links(base_id, fields)
+        merged = {} if replace else dict(record['fields'])
+        merged.update(fields)
+        record['fields'] = {k: v for k, v in merged.items() if v not in (None, '', [])}
+        record['modifiedTime'] = now_iso()
+        self.store.put(base_id, table_name, record)
+        self.stats['records_written'] += 1
+        return record
+
+    def list_records(self, base_id, table_name, options):
+        records = self.store.records(base_id, table_name)
+        if options.get('filterByFormula'):
+            predicate = compile_formula(options['filterByFormula'])
+            records = [r for r in records if predicate(r)]
+        if options.get('maxRecords'):
+            records = records[:int(options['maxRecords'])]
+
+        page_size = min(int(options.get('pageSize') or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+        start = int(options.get('offset') or 0)
+        page = records[start:start + page_size]
+
+        fields = options.get('fields')
+        if fields:
+            page = [dict(r, fields={k: v for k, v in r['fields'].items() if k in fields}) for r in page]
+
+        result = {'records': page}
+        if start + page_size < len(records):
+            result['offset'] = str(start + page_size)
+        return result
+
+    def upsert(self, base_id, table_name, records, merge_fields, replace):
+        existing = self.store.records(base_id, table_name)
+        result = {'records': [], 'createdRecords': [], 'updatedRecords': []}
+        for item in records:
+            fields = item.get('fields', {})
+            record_id = item.get('id')
+            if not record_id:
+                missing = [f for f in merge_fields if fields.get(f) in (None, '')]
+                if missing:
+                    raise APIError(422, 'INVALID_RECORDS', f"Record is missing merge field(s): {missing}")
+                matches = [
+                    r for r in existing
+                    if all(r['fields'].get(f) == fields.get(f) for f in merge_fields)
+                ]
+                if len(matches) > 1:
+                    raise APIError(422, 'INVALID_RECORDS', "More than one record matches the merge fields")
+                record_id = matches[0]['id'] if matches else None
+
+            if record_id:
+                record = self.update(base_id, table_name, record_id, fields, replace)
+                result['updatedRecords'].append(record['id'])
+            else:
+                record = self.create(base_id, table_name, fields)
+                existing.append(record)
+                result['createdRecords'].append(record['id'])
+            result['records'].append(record)
+        return result
+
+    def handle(self, method, path, query, body):
+        """Dispatch one API request; returns (status, payload, headers)"""
+        parts = [unquote(p) for p in path.strip('/').split('/')]
+        if len(parts) < 3 or parts[0] != 'v0':
+            raise APIError(404, 'NOT_FOUND', f"Could not find what you are looking for: {path}")
+
+        base_id, table_name, rest = parts[1], parts[2], parts[3:]
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['by_method'][method] = self.stats['by_method'].get(method, 0) + 1
+
+            wait = self.check_rate_limit(base_id)
+            if wait is not None:
+                self.stats['rate_limited'] += 1
+                return 429, {'errors': [{
+                    'error': 'RATE_LIMIT_REACHED',
+                    'message': 'Rate limit exceeded. Please try again later',
+                }]}, {'Retry-After': f"{wait:.3f}"}
+
+            return 200, strip_bookkeeping(self.dispatch(method, base_id, table_name, rest, query, body)), {}
+
+    def dispatch(self, method, base_id, table_name, rest, query, body):
+        if rest == ['listRecords'] and method == 'POST':
+            return self.list_records(base_id, table_name, body)
+
+        if rest:
+            record_id = rest[0]
+            if method == 'GET':
+                record = self.store.get(base_id, table_name, record_id)
+                if record is None:
+                    raise APIError(404, 'NOT_FOUND', f"Could not find record {record_id}")
+                return record
+            if method in ('PATCH', 'PUT'):
+                return self.update(base_id, table_name, record_id, body.get('fields', {}), method == 'PUT')
+            if method == 'DELETE':
+                if not self.store.delete(base_id, table_name, record_id):
+                    raise APIError(404, 'NOT_FOUND', f"Could not find record {record_id}")
+                return {'id': record_id, 'deleted': True}
+            raise APIError(405, 'METHOD_NOT_ALLOWED', f"{method} not supported")
+
+        if method == 'GET':
+            options = {key: values[-1] for key, values in query.items()}
+            options['fields'] = query.get('fields[]')
+            return self.list_records(base_id, table_name, options)
+
+        if method == 'POST':
+            if 'records' not in body:
+                return self.create(base_id, table_name, body.get('fields', {}))
+            self.check_batch(body['records'])
+            return {'records': [self.create(base_id, table_name, r.get('fields', {})) for r in body['records']]}
+
+        if method in ('PATCH', 'PUT'):
+            records = body.get('records', [])
+            self.check_batch(records)
+            upsert = body.get('performUpsert')
+            if upsert:
+                return self.upsert(base_id, table_name, records, upsert.get('fieldsToMergeOn', []), method == 'PUT')
+            for record in records:
+                if not self.store.get(base_id, table_name, record.get('id')):
+                    raise APIError(404, 'NOT_FOUND', f"Could not find record {record.get('id')}")
+            return {'records': [
+                self.update(base_id, table_name, r['id'], r.get('fields', {}), method == 'PUT') for r in records
+            ]}
+
+        if method == 'DELETE':
+            record_ids = query.get('records[]', [])
+            self.check_batch(record_ids)
+            for record_id in record_ids:
+                if not self.store.get(base_id, table_name, record_id):
+                    raise APIError(404, 'NOT_FOUND', f"Could not find record {record_id}")
+            for record_id in record_ids:
+                self.store.delete(base_id, table_name, record_id)
+            return {'records': [{'id': record_id, 'deleted': True} for record_id in record_ids]}
+
+        raise APIError(405, 'METHOD_NOT_ALLOWED', f"{method} not supported")
+
+    def check_batch(self, records):
+        if len(records) > MAX_RECORDS_PER_REQUEST:
+            raise APIError(422, 'INVALID_RECORDS', f"At most {MAX_RECORDS_PER_REQUEST} records per request")
+
+def make_handler(standin):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, like the real API
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def respond(self, status, payload, headers=None):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def handle_request(self, method):
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self.respond(422, {'error': {'type': 'INVALID_REQUEST_UNKNOWN', 'message': 'Invalid JSON'}})
+                return
+
+            if url.path == '/_stats':
+                with standin.lock:
+                    self.respond(200, standin.stats)
+                return
+            if url.path == '/_reset':
+                with standin.lock:
+                    standin.reset_stats()
+                    standin.windows.clear()
+                    standin.blocked_until.clear()
+                    if query.get('data') == ['1']:
+                        standin.store.clear()
+                self.respond(200, {'reset': True})
+                return
+
+            if not self.headers.get('Authorization', '').startswith('Bearer '):
+                self.respond(401, {'error': {'type': 'AUTHENTICATION_REQUIRED', 'message': 'Authentication required'}})
+                return
+
+            try:
+                status, payload, headers = standin.handle(method, url.path, query, body)
+            except APIError as e:
+                status, payload, headers = e.status, e.body(), {}
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                # A body of the wrong shape (a list, a record without an ID, ...)
+                error = APIError(422, 'INVALID_REQUEST_UNKNOWN', f"Invalid request: {type(e).__name__}: {e}")
+                status, payload, headers = error.status, error.body(), {}
+            except Exception as e:
+                # Answer anyway; a dropped connection makes clients retry until they time out
+                error = APIError(500, 'SERVER_ERROR', f"{type(e).__name__}: {e}")
+                status, payload, headers = error.status, error.body(), {}
+            self.respond(status, payload, headers)
+
+        def do_GET(self):
+            self.handle_request('GET')
+
+        def do_POST(self):
+            self.handle_request('POST')
+
+        def do_PATCH(self):
+            self.handle_request('PATCH')
+
+        def do_PUT(self):
+            self.handle_request('PUT')
+
+        def do_DELETE(self):
+            self.handle_request('DELETE')
+
+    return Handler
+
+def make_server(host='127.0.0.1', port=0, db=None, rate=5.0, penalty=30.0, seed=None):
+    """Build a stand-in server; port 0 picks a free port (see server.server_port)"""
+    standin = StandIn(SQLiteStore(db) if db else None, rate=rate, penalty=penalty, seed=seed)
+    server = ThreadingHTTPServer((host, port), make_handler(standin))
+    server.daemon_threads = True
+    server.standin = standin
+    return server
@@ -0,0 +1,268 @@
+"""
+Durable queue of pending component syncs
+
+sync-component.py used to block on Airtable at the end of every builder
+command, and when Airtable was slow, rate limited or unreachable it printed
+"Sync failed" and the component stayed unsynced. Sync intents now go into a
+SQLite (WAL) queue keyed by marketplace, type, plugin and name, so repeated
+edits to one component collapse into a single entry. replay_queue() drains it
+with batch upserts; entries that fail are retried with exponential backoff and
+a batch that fails as a whole (Airtable down) stops the drain until the next
+run.
+
+The queue lives in ~/.cache/domain-plugin-builder/sync-queue.sqlite.
+"""
+
+import fcntl
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from airtable_sync.batch import batch_sync_components
+from airtable_sync.components import UNCHANGED_PREFIX
+from airtable_sync.config import COMPONENT_TABLES, STANDALONE_MARKER
+from airtable_sync.manifest import SyncManifest, manifest_key, read_component_hash
+from airtable_sync.mirror import base_mirror
+from airtable_sync.plugin_cache import CACHE_DIR
+
+QUEUE_PATH = os.path.join(CACHE_DIR, "sync-queue.sqlite")
+LOCK_PATH = os.path.join(CACHE_DIR, "sync-queue.lock")
+LOG_PATH = os.path.join(CACHE_DIR, "sync-queue.log")
+
+# Components sent per replay round (upserts go out 10 per request)
+REPLAY_BATCH = 100
+
+# Failed entries wait 30s, 60s, 120s, ... up to an hour before the next try
+RETRY_BASE = 30.0
+RETRY_MAX = 3600.0
+
+QUEUE_FIELDS = ('type', 'name', 'plugin', 'marketplace', 'file_path', 'event_type')
+
+def queue_key(marketplace_name, component_type, plugin_name, name):
+    """Queue key for a component: <marketplace>:<type>:<plugin>/<name>"""
+    return f"{marketplace_name}:{component_type}:{plugin_name}/{name}"
+
+class SyncQueue:
+    """Pending syncs, shared by every process that queues or replays them"""
+
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS pending (
+                    key TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    plugin TEXT NOT NULL,
+                    marketplace TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    event_type TEXT,
+                    queued_at REAL NOT NULL,
+                    version INTEGER NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL DEFAULT 0,
+                    last_error TEXT
+                )
+            """)
+            self._conn = db
+        return self._conn
+
+    def enqueue(self, component):
+        """Queue a component (dict with QUEUE_FIELDS) for syncing
+
+        A newer intent for the same component replaces the pending one and is
+        due immediately; queued_at keeps the time of the oldest unsynced edit.
+        """
+        key = queue_key(component['marketplace'], component['type'], component['plugin'], component['name'])
+        db = self._db()
+        with db:
+            db.execute("""
+                INSERT INTO pending (key, type, name, plugin, marketplace, file_path, event_type, queued_at, version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    file_path=excluded.file_path,
+                    event_type=excluded.event_type,
+                    version=excluded.version,
+                    attempts=0,
+                    next_attempt=0,
+                    last_error=NULL
+            """, (key, *(component.get(field) for field in QUEUE_FIELDS), time.time(), time.time_ns()))
+        return key
+
+    def due(self, limit=REPLAY_BATCH, now=None):
+        """Entries ready to be tried, oldest first"""
+        now = time.time() if now is None else now
+        rows = self._db().execute(
+            "SELECT * FROM pending WHERE next_attempt <= ? ORDER BY queued_at LIMIT ?", (now, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def entries(self):
+        return [dict(row) for row in self._db().execute("SELECT * FROM pending ORDER BY queued_at")]
+
+    def __len__(self):
+        return self._db().execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+
+    def __contains__(self, key):
+        return self._db().execute("SELECT 1 FROM pending WHERE key=?", (key,)).fetchone() is not None
+
+    def get(self, key):
+        """The pending entry for key, or None once it has been synced"""
+        row = self._db().execute("SELECT * FROM pending WHERE key=?", (key,)).fetchone()
+        return dict(row) if row else None
+
+    def complete(self, entries):
+        """Drop synced entries, unless the component was queued again meanwhile"""
+        db = self._db()
+        with db:
+            db.executemany(
+                "DELETE FROM pending WHERE key=? AND version=?",
+                [(entry['key'], entry['version']) for entry in entries],
+            )
+
+    def fail(self, entries, error, now=None):
+        """Record a failed attempt and schedule the retry"""
+        now = time.time() if now is None else now
+        db = self._db()
+        with db:
+            db.executemany(
+                "UPDATE pending SET attempts=attempts+1, next_attempt=?, last_error=? WHERE key=? AND version=?",
+                [
+                    (now + min(RETRY_BASE * 2 ** entry['attempts'], RETRY_MAX), error, entry['key'], entry['version'])
+                    for entry in entries
+                ],
+            )
+
+    def retry_all(self):
+        """Make every entry due now, skipping its backoff"""
+        db = self._db()
+        with db:
+            db.execute("UPDATE pending SET next_attempt=0")
+
+    def clear(self):
+        db = self._db()
+        with db:
+            db.execute("DELETE FROM pending")
+
+@contextmanager
+def drain_lock(blocking=False, path=LOCK_PATH):
+    """Hold the single-replayer lock; yields False if another replayer has it"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def entry_source(entry):
+    """File whose existence means the component still exists"""
+    if entry['type'] == 'skill':
+        return os.path.join(entry['file_path'], 'SKILL.md')
+    return entry['file_path']
+
+def replay_queue(api, queue, log=print):
+    """Sync every due entry with batch upserts
+
+    Stops early when a whole round fails, which means Airtable is unreachable
+    or refusing requests; the entries stay queued for the next replay. Returns
+    counts of synced, failed and dropped (deleted from disk) components.
+    """
+    counts = {'synced': 0, 'failed': 0, 'dropped': 0}
+    refreshed = set()
+
+    while True:
+        entries = queue.due()
+        if not entries:
+            return counts
+
+        manifests = {}
+        batch = []
+        hashes = {}
+        dropped = []
+        for entry in entries:
+            if not os.path.exists(entry_source(entry)):
+                log(f"⚠️  {entry['type']}: {entry['plugin']}/{entry['name']} no longer exists, dropping")
+                dropped.append(entry)
+                continue
+
+            key = manifest_key(entry['type'], entry['plugin'], entry['name'])
+            record_id = None
+            if entry['marketplace'] != STANDALONE_MARKER:
+                if entry['marketplace'] not in manifests:
+                    manifests[entry['marketplace']] = SyncManifest(entry['marketplace'])
+                manifest = manifests[entry['marketplace']]
+                hashes[entry['key']] = read_component_hash(entry['type'], entry['name'], entry['plugin'],
+                                                           entry['file_path'], entry['event_type'], log=log)
+                record_id = manifest.record_id(key)
+
+            batch.append(dict({field: entry[field] for field in QUEUE_FIELDS}, record_id=record_id))
+
+        queue.complete(dropped)
+        counts['dropped'] += len(dropped)
+        if not batch:
+            continue
+
+        # Existing records are looked up in the local mirror; pull what changed
+        tables = {COMPONENT_TABLES[comp['type']][0] for comp in batch} - refreshed
+        if tables:
+            base_mirror.refresh(api, sorted(tables), log=log)
+            refreshed |= tables
+
+        queued = [entry for entry in entries if entry not in dropped]
+        try:
+            # Body-only edits leave the record's fields as they are; skip those writes
+            results = batch_sync_components(api, batch, log=log, skip_unchanged=True)
+        except Exception as e:
+            queue.fail(queued, str(e))
+            counts['failed'] += len(queued)
+            log(f"❌ Airtable unavailable, {len(queued)} sync(s) stay queued: {e}")
+            return counts
+
+        done = []
+        synced = {}
+        for entry, comp, (success, component_type, name, message) in zip(queued, batch, results):
+            if not success:
+                queue.fail([entry], message)
+                counts['failed'] += 1
+                log(f"❌ {component_type}: {entry['plugin']}/{name} - {message}")
+                continue
+            done.append(entry)
+            if message.startswith(UNCHANGED_PREFIX):
+                log(f"⏭️  {component_type}: {entry['plugin']}/{name} (no field changes)")
+            else:
+                log(f"✅ {component_type}: {entry['plugin']}/{name}")
+            if entry['marketplace'] != STANDALONE_MARKER and hashes.get(entry['key']):
+                synced.setdefault(entry['marketplace'], {})[manifest_key(component_type, entry['plugin'], name)] = {
+                    'type': component_type,
+                    'plugin': entry['plugin'],
+                    'name': name,
+                    'hash': hashes[entry['key']],
+                    'record_id': comp['record_id'],
+                }
+
+        queue.complete(done)
+        counts['synced'] += len(done)
+
+        for marketplace_name, entries_synced in synced.items():
+            try:
+                manifests[marketplace_name].update(entries_synced)
+            except OSError as e:
+                log(f"⚠️  Could not update sync manifest: {e}")
+
+        if not done:
+            # Nothing in this round went through; leave the rest for later
+            return counts
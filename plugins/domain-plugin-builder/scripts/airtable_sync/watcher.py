@@ -0,0 +1,391 @@
+"""
+File watching, debouncing and batched syncing for watch-sync.py
+
+Builder commands sync the component they create, but manual edits only reach
+Airtable on the next bulk sync or validator --auto-sync. The watch daemon
+follows agents/, commands/, skills/*/SKILL.md and hooks/ of every plugin in
+the watched marketplaces, coalesces bursts of edits into one pending set per
+component and, once the burst settles, pushes only the affected components
+through the batch upsert path. Manifest hashes filter out saves that did not
+change any synced field.
+
+Linux uses inotify (through libc, no extra dependency); other platforms fall
+back to polling mtimes with os.scandir.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import select
+import struct
+import time
+
+from airtable_sync.batch import batch_sync_components
+from airtable_sync.discovery import component_file_path, discover_components
+from airtable_sync.manifest import SyncManifest, delete_removed_components, manifest_key, read_component_hash
+from airtable_sync.plugin_cache import CACHE_DIR
+
+STATUS_PATH = os.path.join(CACHE_DIR, "watch-status.json")
+
+ALL_TYPES = ['agents', 'commands', 'skills', 'hooks']
+
+# Component directory inside a plugin -> (component type, file suffix)
+COMPONENT_DIRS = {
+    'agents': ('agent', '.md'),
+    'commands': ('command', '.md'),
+    'hooks': ('hook', '.sh'),
+}
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+EVENT_HEADER = struct.Struct('iIII')
+
+# Marker event: the kernel dropped events, rescan everything
+OVERFLOW = object()
+
+def classify_path(root, path):
+    """Map a changed path under a marketplace root to what needs re-syncing
+
+    Returns ('component', type, plugin, name), ('plugin', plugin) when a
+    whole plugin or component directory changed, or None for other files.
+    """
+    parts = os.path.relpath(path, root).split(os.sep)
+    if len(parts) < 2 or parts[0] != 'plugins' or parts[1].startswith('.'):
+        return None
+
+    plugin = parts[1]
+    if len(parts) == 2 or (len(parts) == 3 and parts[2] in ('agents', 'commands', 'hooks', 'skills')):
+        return ('plugin', plugin)
+    if len(parts) < 4:
+        # README.md, .claude-plugin and other files at the plugin root
+        return None
+
+    directory, name = parts[2], parts[3]
+    if directory in COMPONENT_DIRS and len(parts) == 4:
+        component_type, suffix = COMPONENT_DIRS[directory]
+        if name.endswith(suffix) and not name.startswith('.'):
+            return ('component', component_type, plugin, name[:-len(suffix)])
+    elif directory == 'skills' and not name.startswith('.'):
+        if len(parts) == 4 or (len(parts) == 5 and parts[4] == 'SKILL.md'):
+            return ('component', 'skill', plugin, name)
+    return None
+
+def watched_dirs(root, path=None):
+    """Directories to watch at and below path (default: the whole marketplace)
+
+    Only plugins/, each plugin, its component directories and each skill
+    directory are watched, so scripts/ and templates/ churn is ignored.
+    """
+    path = path or os.path.join(root, 'plugins')
+    parts = os.path.relpath(path, root).split(os.sep)
+    if parts[0] != 'plugins' or len(parts) > 4:
+        return
+    if len(parts) == 3 and parts[2] not in ('agents', 'commands', 'hooks', 'skills'):
+        return
+    if len(parts) == 4 and parts[2] != 'skills':
+        return
+    if not os.path.isdir(path):
+        return
+
+    yield path
+    if len(parts) < 4:
+        try:
+            with os.scandir(path) as entries:
+                children = [entry.path for entry in entries if entry.is_dir() and not entry.name.startswith('.')]
+        except OSError:
+            return
+        for child in children:
+            yield from watched_dirs(root, child)
+
+class InotifyWatcher:
+    """inotify watches on the component directories of some marketplaces"""
+
+    name = 'inotify'
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+    def __init__(self, roots):
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1: {os.strerror(error)}")
+        self.paths = {}
+        for root in roots:
+            self.add_tree(root)
+
+    def add_tree(self, root, path=None):
+        for directory in watched_dirs(root, path):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+            if wd >= 0:
+                self.paths[wd] = directory
+                continue
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, "inotify watch limit reached; raise fs.inotify.max_user_watches or use --poll")
+            # The directory vanished between listing and watching
+
+    def poll(self, timeout):
+        """Wait up to timeout seconds; returns changed paths (or OVERFLOW)"""
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+
+        changed = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.append(OVERFLOW)
+                continue
+            directory = self.paths.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.paths[wd]
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            changed.append(path)
+        return changed
+
+    def watch_new_dir(self, root, path):
+        self.add_tree(root, path)
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Fallback that rescans component files every interval seconds"""
+
+    name = 'polling'
+
+    def __init__(self, roots, interval=2.0):
+        self.roots = roots
+        self.interval = interval
+        self.snapshot = self.scan()
+        self.next_scan = time.monotonic() + interval
+
+    def scan(self):
+        snapshot = {}
+        for root in self.roots:
+            for directory in watched_dirs(root):
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                stat = entry.stat()
+                                snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                            else:
+                                snapshot[entry.path] = None
+                except OSError:
+                    continue
+        return snapshot
+
+    def poll(self, timeout):
+        wait = self.next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(timeout, 0))
+            return []
+        time.sleep(max(wait, 0))
+        self.next_scan = time.monotonic() + self.interval
+
+        snapshot = self.scan()
+        changed = [path for path, state in snapshot.items() if self.snapshot.get(path, False) != state]
+        changed.extend(path for path in self.snapshot if path not in snapshot)
+        self.snapshot = snapshot
+        return changed
+
+    def watch_new_dir(self, root, path):
+        pass
+
+    def close(self):
+        pass
+
+def make_watcher(roots, poll=False, interval=2.0):
+    """inotify where available, polling otherwise (or when asked)"""
+    if not poll:
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots, interval)
+
+class DebounceQueue:
+    """Pending changes, released once edits have been quiet for `debounce`
+    seconds or the oldest change has waited `max_delay` seconds"""
+
+    def __init__(self, debounce=2.0, max_delay=30.0):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.first_seen = {}
+        self.last_event = 0.0
+
+    def add(self, key, now=None):
+        now = time.time() if now is None else now
+        self.first_seen.setdefault(key, now)
+        self.last_event = now
+
+    def __len__(self):
+        return len(self.first_seen)
+
+    def lag(self, now=None):
+        """Seconds the oldest pending change has been waiting"""
+        if not self.first_seen:
+            return 0.0
+        now = time.time() if now is None else now
+        return now - min(self.first_seen.values())
+
+    def time_until_ready(self, now=None):
+        """Seconds until the queue should be flushed (None if empty)"""
+        if not self.first_seen:
+            return None
+        now = time.time() if now is None else now
+        quiet = self.last_event + self.debounce - now
+        overdue = min(self.first_seen.values()) + self.max_delay - now
+        return max(min(quiet, overdue), 0.0)
+
+    def drain(self):
+        keys = list(self.first_seen)
+        self.first_seen.clear()
+        return keys
+
+def expand_changes(marketplace_root, manifest, changes):
+    """Resolve plugin-level changes into components
+
+    Components come from disk (new or edited) and from the manifest (deleted).
+    Returns a set of (type, plugin, name).
+    """
+    components = set()
+    for change in changes:
+        if change[0] == 'component':
+            components.add(change[1:])
+            continue
+
+        plugin = change[1]
+        plugin_path = os.path.join(marketplace_root, 'plugins', plugin)
+        components.update(
+            (component_type, plugin, name)
+            for component_type, name in discover_components(plugin_path, ALL_TYPES)
+        )
+        components.update(
+            (entry['type'], plugin, entry['name'])
+            for entry in manifest.entries.values()
+            if entry.get('plugin') == plugin and entry.get('type') and entry.get('name')
+        )
+    return components
+
+def sync_changes(api, marketplace_name, marketplace_root, changes, log=print):
+    """Push one coalesced set of changes in a marketplace to Airtable
+
+    Returns (counts of synced, failed, deleted and unchanged components,
+    changes to retry). Airtable answers a 429 or an outage by failing the
+    affected chunks rather than raising, so components that failed to sync or
+    delete come back as ('component', type, plugin, name) changes for the
+    caller to queue again. Unreadable frontmatter is not retried; the next
+    edit of the file brings it back.
+    """
+    manifest = SyncManifest(marketplace_name)
+    counts = {'synced': 0, 'failed': 0, 'deleted': 0, 'unchanged': 0}
+
+    batch = []
+    hashes = {}
+    removed = []
+    for component_type, plugin, name in sorted(expand_changes(marketplace_root, manifest, changes)):
+        key = manifest_key(component_type, plugin, name)
+        plugin_path = os.path.join(marketplace_root, 'plugins', plugin)
+        file_path = component_file_path(component_type, name, plugin_path)
+        source = os.path.join(file_path, 'SKILL.md') if component_type == 'skill' else file_path
+
+        if not os.path.exists(source):
+            if key in manifest.entries:
+                removed.append(key)
+            continue
+
+        event_type = name if component_type == 'hook' else None
+        content_hash = read_component_hash(component_type, name, plugin, file_path, event_type, log=log)
+        if content_hash is None:
+            log(f"⚠️  {component_type}: {plugin}/{name} - could not read frontmatter, not syncing")
+            counts['failed'] += 1
+            continue
+
+        entry = manifest.entries.get(key)
+        if entry and entry.get('hash') == content_hash and entry.get('record_id'):
+            counts['unchanged'] += 1
+            continue
+
+        hashes[key] = content_hash
+        batch.append({
+            'type': component_type,
+            'name': name,
+            'plugin': plugin,
+            'marketplace': marketplace_name,
+            'file_path': file_path,
+            'event_type': event_type,
+            'record_id': manifest.record_id(key),
+        })
+
+    retry = []
+    synced = {}
+    if batch:
+        for comp, (success, component_type, name, message) in zip(batch, batch_sync_components(api, batch, log=log)):
+            if not success:
+                counts['failed'] += 1
+                retry.append(('component', component_type, comp['plugin'], name))
+                log(f"❌ {component_type}: {comp['plugin']}/{name} - {message}")
+                continue
+            key = manifest_key(component_type, comp['plugin'], name)
+            synced[key] = {
+                'type': component_type,
+                'plugin': comp['plugin'],
+                'name': name,
+                'hash': hashes[key],
+                'record_id': comp['record_id'],
+            }
+            log(f"✅ {component_type}: {comp['plugin']}/{name}")
+        counts['synced'] = len(synced)
+
+    gone = []
+    if removed:
+        gone = delete_removed_components(api, manifest, removed, log=log)
+        for key in gone:
+            log(f"🗑️  {key}")
+        counts['deleted'] = len(gone)
+        for key in set(removed) - set(gone):
+            counts['failed'] += 1
+            # Manifest keys are <type>:<plugin>/<name>
+            component_type, _, rest = key.partition(':')
+            plugin, _, name = rest.partition('/')
+            retry.append(('component', component_type, plugin, name))
+
+    if synced or gone:
+        manifest.update(synced, removed=gone)
+    return counts, retry
+
+def write_status(status, path=STATUS_PATH):
+    """Write the daemon status file atomically"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Airtable sync scripts against a local stand-in
+
+Usage:
+    python benchmark-sync.py                                  # small preset, compare with baseline
+    python benchmark-sync.py --preset=medium --bulk-args="--batch"
+    python benchmark-sync.py --preset=small --save-baseline  # record a new baseline
+    python benchmark-sync.py --plugins=50 --components=20 --rate=0
+
+Generates a synthetic marketplace with the layout create-plugin-structure.py
+produces, starts airtable_sync.standin on a free port and runs, one after the
+other:
+
+    bulk-sync (initial)   bulk-sync-airtable.py for every plugin, empty base
+    bulk-sync (no-op)     the same again, nothing changed on disk
+    sync-validator        sync-validator.py over the marketplace
+    cleanup-duplicates    one cleanup-duplicates.py run over every table and plugin, with
+                          duplicate agents seeded in a few plugins
+
+For each it reports wall time, HTTP requests, requests per component (per
+seeded duplicate for cleanup), peak RSS of the script processes, 429s and
+script runs that exited non-zero (sync-validator exits 1 when it finds
+discrepancies).
+
+Results are compared with the baseline committed for the preset in
+scripts/benchmarks/<preset>.json; more requests or 429s than the baseline, or
+wall time / RSS far above it, fail the run with exit code 1, and so does a
+missing baseline. --save-baseline stores the current results instead.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+import importlib.util
+from pathlib import Path
+from contextlib import redirect_stdout
+
+from airtable_sync.config import BASE_ID
+from airtable_sync.standin import make_server
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+CREATE_PLUGIN_SCRIPT = SCRIPTS_DIR.parent / "skills/build-assistant/scripts/create-plugin-structure.py"
+
+MARKETPLACE_NAME = "benchmark-marketplace"
+# Baselines are committed so a fresh checkout compares against them
+BASELINE_DIR = SCRIPTS_DIR / "benchmarks"
+
+# Preset -> (plugins, components per plugin)
+PRESETS = {
+    'small': (10, 5),
+    'medium': (100, 20),
+    'large': (1000, 50),
+}
+
+# Allowed growth over the baseline before a metric counts as a regression
+TOLERANCES = {
+    'requests': 0.05,
+    'rate_limited': 0.0,
+    'wall_time': 0.50,
+    'peak_rss_mb': 0.25,
+}
+
+# Plugins seeded with duplicate agents for the cleanup scenario
+CLEANUP_PLUGINS = 5
+
+AGENT_TEMPLATE = """---
+name: {name}
+description: Use this agent to {purpose} for the {plugin} plugin
+model: inherit
+color: blue
+---
+
+You are the {name} agent.
+
+## Step 0: Load Required Context
+
+Read("plugins/{plugin}/README.md")
+
+## Success Criteria
+
+- {purpose} completed
+"""
+
+COMMAND_TEMPLATE = """---
+description: Run {name} for the {plugin} plugin
+argument-hint: [target] [--dry-run]
+allowed-tools: Read, Write, Bash, Task(*)
+---
+
+**Arguments**: $ARGUMENTS
+
+Goal: {purpose}
+
+Phase 1: Run
+Actions:
+- Task(description="{name}", subagent_type="{plugin}:agent-0")
+"""
+
+HOOK_TEMPLATE = """#!/usr/bin/env bash
+# {name} hook for the {plugin} plugin
+exit 0
+"""
+
+# Supporting files every skill needs to pass validate_components.py
+SKILL_FILES = [
+    'scripts/setup.sh', 'scripts/validate.sh', 'scripts/generate.sh',
+    'templates/basic.ts', 'templates/advanced.ts', 'templates/basic.py', 'templates/advanced.py',
+    'examples/basic.md', 'examples/advanced.md', 'examples/patterns.md',
+]
+
+def complete_skill(skill_dir):
+    """Give a skill the scripts, templates and examples validation requires"""
+    for relative in SKILL_FILES:
+        path = Path(skill_dir, relative)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {path.name}\n")
+
+def load_plugin_creator(plugins_dir):
+    """Import create-plugin-structure.py pointed at our marketplace"""
+    spec = importlib.util.spec_from_file_location("create_plugin_structure", CREATE_PLUGIN_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.MARKETPLACE_DIR = Path(plugins_dir)
+    return module
+
+def generate_marketplace(root, plugin_count, components_per_plugin):
+    """Build a synthetic marketplace; returns the number of components"""
+    plugins_dir = os.path.join(root, 'plugins')
+    os.makedirs(plugins_dir, exist_ok=True)
+    creator = load_plugin_creator(plugins_dir)
+
+    total = 0
+    for p in range(plugin_count):
+        plugin = f"bench-plugin-{p:04d}"
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            creator.create_plugin_structure(plugin)
+        plugin_dir = os.path.join(plugins_dir, plugin)
+
+        # create-plugin-structure.py already adds one skill
+        total += 1
+        for c in range(components_per_plugin - 1):
+            kind = ('agent', 'command', 'skill', 'hook')[c % 4]
+            name = f"{kind}-{c // 4}"
+            purpose = f"handle {kind} task {c} of {plugin}"
+
+            if kind == 'agent':
+                Path(plugin_dir, 'agents', f"{name}.md").write_text(
+                    AGENT_TEMPLATE.format(name=name, plugin=plugin, purpose=purpose))
+            elif kind == 'command':
+                Path(plugin_dir, 'commands', f"{name}.md").write_text(
+                    COMMAND_TEMPLATE.format(name=name, plugin=plugin, purpose=purpose))
+            elif kind == 'skill':
+                skill_dir = Path(plugin_dir, 'skills', name)
+                (skill_dir / 'scripts').mkdir(parents=True)
+                (skill_dir / 'templates').mkdir()
+                (skill_dir / 'SKILL.md').write_text(creator.SKILL_MD_TEMPLATE.format(
+                    skill_display_name=name, skill_description=f"Use when you need to {purpose}"))
+            else:
+                Path(plugin_dir, 'hooks', f"{name}.sh").write_text(
+                    HOOK_TEMPLATE.format(name=name, plugin=plugin))
+            total += 1
+
+        for skill_dir in Path(plugin_dir, 'skills').iterdir():
+            complete_skill(skill_dir)
+
+    return total
+
+def run_script(args, env, log_file):
+    """Run a script to completion; returns (exit code, wall seconds, peak RSS in MB)"""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *args], cwd=SCRIPTS_DIR, env=env,
+        stdout=log_file, stderr=subprocess.STDOUT,
+    )
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in kilobytes on Linux
+    return process.returncode, time.perf_counter() - start, usage.ru_maxrss / 1024
+
+class Scenario:
+    """Accumulates the metrics of one benchmark step across script runs"""
+
+    def __init__(self, standin, units):
+        self.standin = standin
+        self.units = units
+        self.wall_time = 0.0
+        self.peak_rss_mb = 0.0
+        self.failures = 0
+        with standin.lock:
+            standin.reset_stats()
+
+    def run(self, args, env, log_file):
+        code, wall, rss = run_script(args, env, log_file)
+        self.wall_time += wall
+        self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        self.failures += code != 0
+
+    def result(self):
+        with self.standin.lock:
+            stats = dict(self.standin.stats)
+        return {
+            'wall_time': round(self.wall_time, 3),
+            'requests': stats['requests'],
+            'requests_per_component': round(stats['requests'] / self.units, 3) if self.units else 0,
+            'peak_rss_mb': round(self.peak_rss_mb, 1),
+            'rate_limited': stats['rate_limited'],
+            'failed_runs': self.failures,
+        }
+
+def seed_duplicates(standin, plugins):
+    """Copy every agent record of the given plugins; returns the number of copies"""
+    with standin.lock:
+        plugin_ids = {
+            record['fields'].get('Name'): record['id']
+            for record in standin.store.records(BASE_ID, "Plugins")
+        }
+        wanted = {plugin_ids[p] for p in plugins if p in plugin_ids}
+        copies = 0
+        for record in standin.store.records(BASE_ID, "Agents"):
+            if wanted.intersection(record['fields'].get('Plugin', [])):
+                fields = {k: v for k, v in record['fields'].items() if k != 'Sync Key'}
+                standin.create(BASE_ID, "Agents", fields)
+                copies += 1
+        return copies
+
+def run_benchmark(args, workdir):
+    marketplace_root = os.path.join(workdir, 'marketplace')
+    print(f"🏗️  Generating {args.plugins} plugins × {args.components} components...")
+    total = generate_marketplace(marketplace_root, args.plugins, args.components)
+    plugins = sorted(os.listdir(os.path.join(marketplace_root, 'plugins')))
+    print(f"   {total} components in {marketplace_root}")
+
+    server = make_server(port=0, rate=args.rate, penalty=args.penalty, seed=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    standin = server.standin
+
+    env = dict(
+        os.environ,
+        AIRTABLE_TOKEN="benchmark",
+        DPB_AIRTABLE_URL=f"http://127.0.0.1:{server.server_port}",
+        DPB_CACHE_DIR=os.path.join(workdir, 'cache'),
+        DPB_MARKETPLACE_PATHS=f"{MARKETPLACE_NAME}={marketplace_root}",
+    )
+    env.pop('MCP_AIRTABLE_TOKEN', None)
+    if not args.rate:
+        # Let the scripts' own pacing go as fast as the stand-in
+        env['DPB_AIRTABLE_RPS'] = "1000"
+    print(f"🧪 Stand-in on {env['DPB_AIRTABLE_URL']} "
+          f"({f'{args.rate:g} req/s, {args.penalty:g}s penalty' if args.rate else 'no rate limit'})")
+    print()
+
+    results = {}
+    bulk_args = args.bulk_args.split()
+    with open(os.path.join(workdir, 'scripts.log'), 'w') as log_file:
+        for label in ('bulk-sync (initial)', 'bulk-sync (no-op)'):
+            print(f"⏱️  {label}...", flush=True)
+            scenario = Scenario(standin, total)
+            for plugin in plugins:
+                scenario.run(['bulk-sync-airtable.py', f'--plugin={plugin}',
+                              f'--marketplace={MARKETPLACE_NAME}', *bulk_args], env, log_file)
+            results[label] = scenario.result()
+
+        print("⏱️  sync-validator...", flush=True)
+        scenario = Scenario(standin, total)
+        scenario.run(['sync-validator.py', f'--marketplace={MARKETPLACE_NAME}'], env, log_file)
+        results['sync-validator'] = scenario.result()
+
+        print("⏱️  cleanup-duplicates...", flush=True)
+        cleanup_plugins = plugins[:CLEANUP_PLUGINS]
+        scenario = Scenario(standin, seed_duplicates(standin, cleanup_plugins))
+        scenario.run(['cleanup-duplicates.py', '--max-workers=4'], env, log_file)
+        results['cleanup-duplicates'] = scenario.result()
+
+    server.shutdown()
+    server.server_close()
+    return results
+
+def print_results(results):
+    print()
+    print("=" * 80)
+    print("📊 BENCHMARK RESULTS")
+    print("=" * 80)
+    print(f"   {'Scenario':<22}{'Wall (s)':>10}{'Requests':>10}{'Req/comp':>10}{'RSS (MB)':>10}{'429s':>7}{'Failed':>8}")
+    for label, metrics in results.items():
+        print(f"   {label:<22}{metrics['wall_time']:>10.2f}{metrics['requests']:>10}"
+              f"{metrics['requests_per_component']:>10.2f}{metrics['peak_rss_mb']:>10.1f}"
+              f"{metrics['rate_limited']:>7}{metrics['failed_runs']:>8}")
+    print("=" * 80)
+
+def compare_with_baseline(results, baseline):
+    """Return a list of regression messages"""
+    regressions = []
+    for label, metrics in results.items():
+        expected = baseline.get(label)
+        if not expected:
+            continue
+        for metric, tolerance in TOLERANCES.items():
+            limit = expected[metric] * (1 + tolerance)
+            if metric == 'wall_time':
+                # Ignore noise on very short runs
+                limit = max(limit, expected[metric] + 1.0)
+            if metrics[metric] > limit:
+                regressions.append(
+                    f"{label}: {metric} {metrics[metric]} > baseline {expected[metric]} (+{tolerance:.0%})"
+                )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Airtable sync throughput against a local stand-in')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small',
+                        help='Marketplace size: small=10×5, medium=100×20, large=1000×50 (default: small)')
+    parser.add_argument('--plugins', type=int,
+                        help='Number of plugins (overrides the preset)')
+    parser.add_argument('--components', type=int,
+                        help='Components per plugin, at least 1 (overrides the preset)')
+    parser.add_argument('--bulk-args', default='',
+                        help='Extra bulk-sync-airtable.py arguments, e.g. "--batch" or "--async"')
+    parser.add_argument('--rate', type=float, default=5.0,
+                        help='Stand-in requests per second per base, 0 for unlimited (default: 5)')
+    parser.add_argument('--penalty', type=float, default=30.0,
+                        help='Stand-in penalty after a 429, in seconds (default: 30)')
+    parser.add_argument('--baseline',
+                        help=f'Baseline file (default: {BASELINE_DIR}/<preset>.json)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store these results as the new baseline instead of comparing')
+    parser.add_argument('--keep', action='store_true',
+                        help='Keep the generated marketplace and script logs')
+
+    args = parser.parse_args()
+
+    default_plugins, default_components = PRESETS[args.preset]
+    args.plugins = args.plugins or default_plugins
+    args.components = max(args.components or default_components, 1)
+
+    settings = {
+        'plugins': args.plugins,
+        'components': args.components,
+        'bulk_args': args.bulk_args,
+        'rate': args.rate,
+        'penalty': args.penalty,
+    }
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{args.preset}.json")
+
+    print("=" * 80)
+    print("🏁 AIRTABLE SYNC BENCHMARK")
+    print("=" * 80)
+    print(f"   Plugins: {args.plugins}")
+    print(f"   Components per plugin: {args.components}")
+    print(f"   Bulk sync args: {args.bulk_args or '(default)'}")
+    print(f"   Baseline: {baseline_path}")
+    print("=" * 80)
+    print()
+
+    workdir = tempfile.mkdtemp(prefix="dpb-benchmark-")
+    try:
+        results = run_benchmark(args, workdir)
+    finally:
+        if args.keep:
+            print(f"📁 Kept {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_results(results)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({'settings': settings, 'results': results}, f, indent=2)
+            f.write('\n')
+        print(f"💾 Saved baseline: {baseline_path}")
+        return 0
+
+    try:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        print(f"❌ No baseline found at {baseline_path} - run with --save-baseline to record one")
+        return 1
+
+    if baseline.get('settings') != settings:
+        print("⚠️  Baseline was recorded with different settings - not comparing")
+        print(f"   Baseline: {baseline.get('settings')}")
+        return 0
+
+    regressions = compare_with_baseline(results, baseline['results'])
+    if regressions:
+        print("❌ PERFORMANCE REGRESSION")
+        for message in regressions:
+            print(f"   ❌ {message}")
+        return 1
+
+    print("✅ No regressions against the baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
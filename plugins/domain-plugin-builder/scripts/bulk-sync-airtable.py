@@ -6,113 +6,104 @@ Usage:
     python bulk-sync-airtable.py --plugin=clerk --marketplace=domain-plugin-builder
     python bulk-sync-airtable.py --plugin=nextjs-frontend --marketplace=ai-dev-marketplace --type=agents
     python bulk-sync-airtable.py --plugin=planning --marketplace=dev-lifecycle-marketplace --type=commands,skills
+    python bulk-sync-airtable.py --plugin=clerk --marketplace=domain-plugin-builder --subprocess  # Legacy mode
+    python bulk-sync-airtable.py --plugin=clerk --marketplace=domain-plugin-builder --batch       # 10 records/request
+    python bulk-sync-airtable.py --plugin=clerk --marketplace=domain-plugin-builder --async       # batches, all in flight
 
 This script discovers ALL components in a plugin and syncs them to Airtable efficiently.
+Only components whose synced fields changed since the last run are sent (see
+airtable_sync/manifest.py); components that disappeared are deleted. --full re-syncs all.
+Components are synced in-process by a worker pool sharing one pooled HTTP session;
+--subprocess restores the old behaviour of running sync-component.py once per component.
+
+Discovery, validation and sync run as a pipeline (airtable_sync/pipeline.py): a
+component is validated while the previous one is still syncing, at most a few
+dozen wait between stages, and the summary ends with each stage's throughput.
 """
 
 import os
 import sys
 import argparse
+import threading
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from pyairtable import Api
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 
-# Airtable configuration
-AIRTABLE_TOKEN = os.getenv("AIRTABLE_TOKEN") or os.getenv("MCP_AIRTABLE_TOKEN")
-BASE_ID = "appHbSB7WhT1TxEQb"
-
-# Marketplace root paths
-MARKETPLACE_PATHS = {
-    "dev-lifecycle-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/dev-lifecycle-marketplace",
-    "ai-dev-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/ai-dev-marketplace",
-    "mcp-servers-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/mcp-servers-marketplace",
-    "domain-plugin-builder": "/home/gotime2022/.claude/plugins/marketplaces/domain-plugin-builder",
-}
-
-def discover_components(plugin_path, component_types):
-    """Discover all components of specified types in a plugin"""
-    components = []
-
-    if 'agents' in component_types:
-        agents_dir = os.path.join(plugin_path, 'agents')
-        if os.path.exists(agents_dir):
-            for file in os.listdir(agents_dir):
-                if file.endswith('.md'):
-                    name = file.replace('.md', '')
-                    components.append(('agent', name))
-
-    if 'commands' in component_types:
-        commands_dir = os.path.join(plugin_path, 'commands')
-        if os.path.exists(commands_dir):
-            for file in os.listdir(commands_dir):
-                if file.endswith('.md'):
-                    name = file.replace('.md', '')
-                    components.append(('command', name))
-
-    if 'skills' in component_types:
-        skills_dir = os.path.join(plugin_path, 'skills')
-        if os.path.exists(skills_dir):
-            for skill_name in os.listdir(skills_dir):
-                skill_path = os.path.join(skills_dir, skill_name)
-                if os.path.isdir(skill_path) and os.path.exists(os.path.join(skill_path, 'SKILL.md')):
-                    components.append(('skill', skill_name))
-
-    if 'hooks' in component_types:
-        hooks_dir = os.path.join(plugin_path, 'hooks')
-        if os.path.exists(hooks_dir):
-            for file in os.listdir(hooks_dir):
-                if file.endswith('.sh'):
-                    # Extract event type from filename (e.g., pre-commit.sh -> pre-commit)
-                    name = file.replace('.sh', '')
-                    components.append(('hook', name))
-
-    return components
+from airtable_sync.batch import batch_sync_components
+from airtable_sync.components import UNCHANGED_PREFIX, get_plugin_record_id, make_api, sync_component
+from airtable_sync.config import AIRTABLE_TOKEN, COMPONENT_TABLES, print_missing_token
+from airtable_sync.discovery import component_file_path, iter_components
+from airtable_sync.manifest import SyncManifest, delete_removed_components, manifest_key, read_component_hash
+from airtable_sync.marketplaces import MARKETPLACE_PATHS
+from airtable_sync.mirror import base_mirror
+from airtable_sync.pipeline import Stage, print_throughput, run_pipeline
+
+# The validation engine ships with the build-assistant skill's scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'skills', 'build-assistant', 'scripts'))
+from validate_components import VALIDATORS, validate_component as run_validators
+
+# Values accepted by --type, in sync order
+COMPONENT_TYPES = [f"{t}s" for t in COMPONENT_TABLES]
+
+# Components of one table per batch upsert request
+BATCH_SIZE = 10
+
+# Validation is mostly file reads: one thread per core by default
+DEFAULT_VALIDATE_WORKERS = os.cpu_count() or 4
 
 def validate_component(component_type, component_name, plugin_path):
     """Validate a component before syncing"""
-    validation_scripts = {
-        'agent': os.path.expanduser('~/.claude/plugins/marketplaces/domain-plugin-builder/plugins/domain-plugin-builder/skills/build-assistant/scripts/validate-agent.sh'),
-        'command': os.path.expanduser('~/.claude/plugins/marketplaces/domain-plugin-builder/plugins/domain-plugin-builder/skills/build-assistant/scripts/validate-command.sh'),
-        'skill': os.path.expanduser('~/.claude/plugins/marketplaces/domain-plugin-builder/plugins/domain-plugin-builder/skills/build-assistant/scripts/validate-skill.sh'),
-    }
-
-    if component_type not in validation_scripts:
+    if component_type not in VALIDATORS:
         # No validation for hooks yet
         return True, "No validation script available"
 
-    script = validation_scripts[component_type]
-    if not os.path.exists(script):
-        return True, f"Validation script not found: {script}"
-
-    # Build component path
-    if component_type == 'agent':
-        component_path = os.path.join(plugin_path, 'agents', f'{component_name}.md')
-    elif component_type == 'command':
-        component_path = os.path.join(plugin_path, 'commands', f'{component_name}.md')
-    elif component_type == 'skill':
-        component_path = os.path.join(plugin_path, 'skills', component_name)
-    else:
-        return True, "Unknown component type"
+    try:
+        result = run_validators(component_type, component_file_path(component_type, component_name, plugin_path))
+    except Exception as e:
+        return False, str(e)
+
+    if result.valid:
+        return True, "Validation passed"
+    return False, '\n'.join(result.report)
+
+def first_error(message):
+    """The line of validator output worth showing: its first error, else its first line"""
+    lines = [line.strip() for line in message.splitlines() if line.strip()]
+    for line in lines:
+        if 'ERROR' in line:
+            return line[:100]
+    return lines[0][:100] if lines else ''
+
+def sync_single_component_inprocess(api, component_type, component_name, plugin_name, marketplace_name, plugin_path):
+    """Sync a single component in this process using the shared Api session
+
+    Returns (success, component_type, name, output, record ID or None).
+    """
+    output = []
+    file_path = component_file_path(component_type, component_name, plugin_path)
+
+    # Hooks use their name as event type, same as the subprocess path
+    event_type = component_name if component_type == 'hook' else None
 
-    # Run validation
     try:
-        result = subprocess.run(
-            ['bash', script, component_path],
-            capture_output=True,
-            text=True,
-            timeout=10
+        record_id = sync_component(
+            api,
+            component_type,
+            component_name,
+            plugin_name,
+            marketplace_name,
+            file_path,
+            event_type=event_type,
+            log=output.append
         )
-
-        if result.returncode == 0:
-            return True, "Validation passed"
-        else:
-            return False, result.stdout + result.stderr
     except Exception as e:
-        return False, str(e)
+        output.append(str(e))
+        record_id = None
+
+    return (bool(record_id), component_type, component_name, '\n'.join(output), record_id or None)
 
 def sync_single_component(component_type, component_name, plugin_name, marketplace_name):
-    """Sync a single component using sync-component.py"""
+    """Sync a single component using sync-component.py (legacy --subprocess mode)"""
     script_path = os.path.join(
         os.path.dirname(__file__),
         'sync-component.py'
@@ -124,7 +115,9 @@ def sync_single_component(component_type, component_name, plugin_name, marketpla
         f'--type={component_type}',
         f'--name={component_name}',
         f'--plugin={plugin_name}',
-        f'--marketplace={marketplace_name}'
+        f'--marketplace={marketplace_name}',
+        # Without --wait the sync is only queued and the exit status says nothing
+        '--wait',
     ]
 
     # Add event-type for hooks (parse from name)
@@ -141,7 +134,7 @@ def sync_single_component(component_type, component_name, plugin_name, marketpla
         if result.returncode == 0:
             return (True, component_type, component_name, result.stdout)
         else:
-            return (False, component_type, component_name, result.stderr)
+            return (False, component_type, component_name, result.stdout + result.stderr)
     except subprocess.TimeoutExpired:
         return (False, component_type, component_name, "Timeout after 30 seconds")
     except Exception as e:
@@ -157,12 +150,26 @@ def main():
                         help='Comma-separated component types to sync (agents,commands,skills,hooks). Default: all')
     parser.add_argument('--max-workers', type=int, default=5,
                         help='Maximum parallel workers (default: 5)')
+    parser.add_argument('--validate-workers', type=int, default=DEFAULT_VALIDATE_WORKERS,
+                        help=f'Components validated in parallel (default: {DEFAULT_VALIDATE_WORKERS})')
+    parser.add_argument('--subprocess', action='store_true',
+                        help='Run sync-component.py once per component (legacy, slower)')
+    parser.add_argument('--batch', action='store_true',
+                        help='Upsert 10 records per request, grouped by table (needs a "Sync Key" field)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Like --batch, but with every request in flight over pooled async connections (needs aiohttp)')
+    parser.add_argument('--full', action='store_true',
+                        help='Re-sync every component, ignoring the incremental sync manifest')
 
     args = parser.parse_args()
 
     # Validate Airtable token
     if not AIRTABLE_TOKEN:
-        print("❌ ERROR: AIRTABLE_TOKEN or MCP_AIRTABLE_TOKEN environment variable not set")
+        print_missing_token()
+        return 1
+
+    if sum([args.batch, args.subprocess, args.use_async]) > 1:
+        print("❌ ERROR: --batch, --async and --subprocess cannot be combined")
         return 1
 
     # Validate marketplace
@@ -175,7 +182,13 @@ def main():
     if args.type:
         component_types = [t.strip() for t in args.type.split(',')]
     else:
-        component_types = ['agents', 'commands', 'skills', 'hooks']
+        component_types = list(COMPONENT_TYPES)
+
+    unknown = [t for t in component_types if t not in COMPONENT_TYPES]
+    if unknown:
+        print(f"❌ ERROR: Unknown component type: {', '.join(unknown)}")
+        print(f"   Valid types: {list(COMPONENT_TYPES)}")
+        return 1
 
     # Build plugin path
     marketplace_root = MARKETPLACE_PATHS[args.marketplace]
@@ -193,79 +206,235 @@ def main():
     print(f"   Marketplace: {args.marketplace}")
     print(f"   Component Types: {', '.join(component_types)}")
     print(f"   Max Workers: {args.max_workers}")
+    print(f"   Validate Workers: {args.validate_workers}")
+    mode = 'batch' if args.batch else 'async' if args.use_async else 'subprocess' if args.subprocess else 'in-process'
+    print(f"   Mode: {mode}")
     print()
 
-    # Discover all components
-    print("📋 Discovering components...")
-    components = discover_components(plugin_path, component_types)
-
-    if not components:
-        print("⚠️  No components found!")
-        return 0
-
-    print(f"✅ Found {len(components)} components:")
-    for component_type, component_name in components:
-        print(f"   - {component_type}: {component_name}")
+    # Discover, validate and sync at the same time: each component flows on
+    # as soon as a stage is done with it, through bounded queues
+    print("📋 Discovering, validating and syncing components...")
     print()
 
-    # Validate components first
-    print("🔍 Validating components...")
-    valid_components = []
+    manifest = SyncManifest(args.marketplace)
+    lock = threading.Lock()
+    current_hashes = {}
+    unchanged = []
     validation_failures = []
-
-    for comp_type, comp_name in components:
+    results = []
+    synced_record_ids = {}
+
+    def say(*lines):
+        with lock:
+            for line in lines:
+                print(line, flush=True)
+
+    def prepare_sync():
+        """Refresh the mirror and resolve the plugin while validation runs
+
+        Look records up in the local mirror, after pulling what changed since
+        the last run, instead of asking Airtable once per component. Resolving
+        the plugin once means sync workers hit the warm plugin-ID cache instead
+        of racing to look it up (or create it) in parallel.
+        """
+        if args.subprocess:
+            return None
+        tables = ["Plugins"] + sorted({COMPONENT_TABLES[t.rstrip('s')][0] for t in component_types})
+        api = make_api(AIRTABLE_TOKEN, pool_size=max(args.max_workers, len(tables)))
+        base_mirror.refresh(api, tables, log=say)
+        try:
+            get_plugin_record_id(api, args.plugin, args.marketplace, log=say)
+        except Exception as e:
+            say(f"⚠️  Could not resolve plugin {args.plugin} yet: {e}")
+        return api
+
+    # Started by the first component that needs syncing, so a run with
+    # nothing to do never connects to Airtable
+    setup_pool = ThreadPoolExecutor(max_workers=1)
+    setup = []
+
+    def sync_setup():
+        with lock:
+            if not setup:
+                setup.append(setup_pool.submit(prepare_sync))
+        return setup[0]
+
+    def plan(component, emit):
+        """Hash the component and pass it on unless it is unchanged since the last sync"""
+        comp_type, comp_name = component
+        key = manifest_key(comp_type, args.plugin, comp_name)
+        content_hash = read_component_hash(
+            comp_type,
+            comp_name,
+            args.plugin,
+            component_file_path(comp_type, comp_name, plugin_path),
+            event_type=comp_name if comp_type == 'hook' else None
+        )
+        with lock:
+            current_hashes[key] = content_hash
+        if not args.full and manifest.is_unchanged(key, content_hash):
+            with lock:
+                unchanged.append(key)
+            return
+        sync_setup()
+        emit(component)
+
+    def validate(component, emit):
+        comp_type, comp_name = component
         is_valid, message = validate_component(comp_type, comp_name, plugin_path)
         if is_valid:
-            valid_components.append((comp_type, comp_name))
-            print(f"   ✅ {comp_type}: {comp_name}")
-        else:
+            emit(component)
+            return
+        with lock:
             validation_failures.append((comp_type, comp_name, message))
-            print(f"   ❌ {comp_type}: {comp_name} - VALIDATION FAILED")
+        say(f"❌ {comp_type}: {comp_name} - VALIDATION FAILED",
+            f"   Error: {first_error(message)}")
 
-    print()
-
-    if validation_failures:
-        print(f"⚠️  {len(validation_failures)} component(s) failed validation and will NOT be synced:")
-        for comp_type, comp_name, message in validation_failures[:5]:  # Show first 5
-            print(f"   ❌ {comp_type}: {comp_name}")
-            # Show first line of error
-            first_line = message.split('\n')[0][:100]
-            print(f"      Error: {first_line}")
-        print()
+    def record_result(success, comp_type, comp_name, output, record_id):
+        with lock:
+            results.append((success, comp_type, comp_name, output))
+            if success and record_id:
+                synced_record_ids[(comp_type, comp_name)] = record_id
+        if success and UNCHANGED_PREFIX in output:
+            say(f"⏭️  {comp_type}: {comp_name} (no field changes)")
+        elif success:
+            say(f"✅ {comp_type}: {comp_name}")
+        elif output:
+            say(f"❌ {comp_type}: {comp_name}", f"   Error: {output[:200]}")
+        else:
+            say(f"❌ {comp_type}: {comp_name}")
+
+    def sync_one(component, emit):
+        comp_type, comp_name = component
+        if args.subprocess:
+            # Subprocess runs record their own manifest entries
+            success, _, _, output = sync_single_component(comp_type, comp_name, args.plugin, args.marketplace)
+            record_result(success, comp_type, comp_name, output, None)
+            return
+        api = sync_setup().result()
+        success, _, _, output, record_id = sync_single_component_inprocess(
+            api, comp_type, comp_name, args.plugin, args.marketplace, plugin_path
+        )
+        record_result(success, comp_type, comp_name, output, record_id)
+
+    # Batch and async modes collect components per table and send them
+    # BATCH_SIZE at a time, one upsert request each
+    pending = {}
+    runner = []
+    in_flight = []
+
+    def record_batch(batch, batch_results):
+        for comp, (success, comp_type, comp_name, output) in zip(batch, batch_results):
+            record_result(success, comp_type, comp_name, output, comp['record_id'])
+
+    def send_batch(batch):
+        api = sync_setup().result()
+        if not args.use_async:
+            record_batch(batch, batch_sync_components(api, batch, log=say, skip_unchanged=True))
+            return
+        if not runner:
+            from airtable_sync.async_client import AsyncBatchRunner
+            runner.append(AsyncBatchRunner(AIRTABLE_TOKEN, max_connections=args.max_workers))
+        in_flight.append((batch, runner[0].submit(batch, log=say, skip_unchanged=True)))
+
+    def sync_batched(component, emit):
+        comp_type, comp_name = component
+        batch = pending.setdefault(comp_type, [])
+        batch.append({
+            'type': comp_type,
+            'name': comp_name,
+            'plugin': args.plugin,
+            'marketplace': args.marketplace,
+            'file_path': component_file_path(comp_type, comp_name, plugin_path),
+            'event_type': comp_name if comp_type == 'hook' else None,
+            'record_id': manifest.record_id(manifest_key(comp_type, args.plugin, comp_name)),
+        })
+        if len(batch) == BATCH_SIZE:
+            send_batch(pending.pop(comp_type))
+
+    def flush_batches(emit):
+        # What is left of every table fits in one batch per table
+        rest = [comp for batch in pending.values() for comp in batch]
+        pending.clear()
+        if rest:
+            send_batch(rest)
+        # Every async batch has been in flight on the shared client; collect them
+        for batch, future in in_flight:
+            try:
+                batch_results = future.result()
+            except Exception as e:
+                batch_results = [(False, comp['type'], comp['name'], str(e)) for comp in batch]
+            record_batch(batch, batch_results)
+        if runner:
+            runner[0].close()
+
+    if args.batch or args.use_async:
+        sync_stage = Stage("sync", sync_batched, finish=flush_batches)
+    else:
+        sync_stage = Stage("sync", sync_one, workers=args.max_workers)
 
-    if not valid_components:
-        print("❌ No valid components to sync!")
-        return 1
+    stages = [
+        Stage("discover", plan),
+        Stage("validate", validate, workers=args.validate_workers),
+        sync_stage,
+    ]
+    try:
+        run_pipeline(iter_components(plugin_path, component_types), stages)
+    finally:
+        setup_pool.shutdown(wait=True)
+    stage = {s.name: s for s in stages}
+
+    api = setup[0].result() if setup else None
+    _, _, removed = manifest.plan(
+        current_hashes,
+        component_types={t.rstrip('s') for t in component_types},
+        plugins={args.plugin}
+    )
 
-    # Sync only valid components in parallel
-    print(f"🚀 Syncing {len(valid_components)} valid components in parallel...")
     print()
+    print(f"✅ Found {len(current_hashes)} components")
+    if unchanged:
+        print(f"⏭️  {len(unchanged)} component(s) unchanged since last sync - skipped")
+    if removed:
+        print(f"🗑️  {len(removed)} component(s) removed since last sync - will delete from Airtable")
+
+    # Components that changed since the last sync, whether or not they are valid
+    changed = stage["validate"].items
+    if not changed and not removed:
+        if not current_hashes:
+            print("⚠️  No components found!")
+        else:
+            print("✅ Everything is up to date - nothing to sync")
+        return 0
 
-    results = []
-    with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
-        # Submit all sync tasks (only for valid components)
-        futures = {
-            executor.submit(
-                sync_single_component,
-                comp_type,
-                comp_name,
-                args.plugin,
-                args.marketplace
-            ): (comp_type, comp_name)
-            for comp_type, comp_name in valid_components
-        }
-
-        # Process results as they complete
-        for future in as_completed(futures):
-            success, comp_type, comp_name, output = future.result()
-            results.append((success, comp_type, comp_name, output))
+    if changed and not results and not removed:
+        print("❌ No valid components to sync!")
+        return 1
 
-            if success:
-                print(f"✅ {comp_type}: {comp_name}")
-            else:
-                print(f"❌ {comp_type}: {comp_name}")
-                if output:
-                    print(f"   Error: {output[:200]}")
+    # Remember what was synced for the next incremental run
+    if synced_record_ids:
+        manifest.update({
+            manifest_key(comp_type, args.plugin, comp_name): {
+                'type': comp_type,
+                'plugin': args.plugin,
+                'name': comp_name,
+                'hash': current_hashes[manifest_key(comp_type, args.plugin, comp_name)],
+                'record_id': record_id,
+            }
+            for (comp_type, comp_name), record_id in synced_record_ids.items()
+        })
+
+    # Delete components that disappeared since the last sync
+    deleted = []
+    if removed:
+        print()
+        print(f"🗑️  Deleting {len(removed)} removed component(s)...")
+        if api is None:
+            api = make_api(AIRTABLE_TOKEN, pool_size=1)
+        deleted = delete_removed_components(api, manifest, removed)
+        manifest.update(removed=deleted)
+        for key in deleted:
+            print(f"   🗑️  {key}")
 
     # Summary
     print()
@@ -275,18 +444,27 @@ def main():
 
     success_count = sum(1 for s, _, _, _ in results if s)
     sync_failure_count = len(results) - success_count
+    # Records that already held these fields: no write sent
+    skipped_writes = sum(1 for s, _, _, output in results if s and UNCHANGED_PREFIX in output)
 
-    print(f"   Total Discovered: {len(components)}")
+    print(f"   Total Discovered: {len(current_hashes)}")
+    print(f"   ⏭️  Unchanged (skipped): {len(unchanged)}")
     print(f"   ❌ Validation Failed: {len(validation_failures)}")
-    print(f"   ✅ Validated: {len(valid_components)}")
+    print(f"   ✅ Validated: {stage['validate'].items - len(validation_failures)}")
     print(f"   ✅ Synced Successfully: {success_count}")
+    print(f"   ⏭️  Writes skipped (no field changes): {skipped_writes}")
     print(f"   ❌ Sync Failed: {sync_failure_count}")
+    print(f"   🗑️  Deleted: {len(deleted)} of {len(removed)} removed")
+    print()
+    print("📈 Pipeline throughput:")
+    print_throughput(stages)
     print()
 
     if validation_failures:
         print("Components that failed validation (not synced):")
-        for comp_type, comp_name, _ in validation_failures:
+        for comp_type, comp_name, message in validation_failures:
             print(f"   - {comp_type}: {comp_name}")
+            print(f"     Error: {first_error(message)}")
         print()
 
     if sync_failure_count > 0:
@@ -296,7 +474,7 @@ def main():
                 print(f"   - {comp_type}: {comp_name}")
         print()
 
-    if validation_failures or sync_failure_count > 0:
+    if validation_failures or sync_failure_count > 0 or len(deleted) < len(removed):
         print("⚠️  Some components were not synced due to failures")
         print("=" * 80)
         return 1
@@ -3,131 +3,229 @@
 Clean up duplicate components in Airtable
 
 Usage:
+    python cleanup-duplicates.py --dry-run                          # Every type, every plugin
     python cleanup-duplicates.py --plugin=celery --type=agents --dry-run
-    python cleanup-duplicates.py --plugin=celery --type=agents  # Actually delete
+    python cleanup-duplicates.py --type=agents,commands             # Actually delete
+    python cleanup-duplicates.py --max-workers=4                    # Clean the tables concurrently
+
+Records are read from the local mirror of the base (airtable_sync/mirror.py),
+refreshed first, and grouped by plugin and name across every plugin. Each group
+keeps the record a sync manifest points at, else one that carries the Sync Key,
+else the oldest (by createdTime); the rest are deleted 10 per request. A kept
+record without a Sync Key takes over the key of a deleted duplicate, and
+manifest entries of deleted records are dropped so the next sync finds the kept
+one. Unless --dry-run is given, the refresh also reconciles record IDs so a
+record already deleted in Airtable is never the one kept.
 """
 
-import os
 import sys
 import argparse
 from collections import defaultdict
-from pyairtable import Api
-
-# Airtable configuration
-AIRTABLE_TOKEN = os.getenv("AIRTABLE_TOKEN") or os.getenv("MCP_AIRTABLE_TOKEN")
-BASE_ID = "appHbSB7WhT1TxEQb"
-
-def cleanup_agents(api, plugin_name, dry_run=True):
-    """Clean up duplicate agents for a plugin"""
-
-    # Get plugin ID
-    plugins_table = api.table(BASE_ID, "Plugins")
-    plugin_records = plugins_table.all(formula=f"{{Name}}='{plugin_name}'")
-
-    if not plugin_records:
-        print(f"❌ Plugin '{plugin_name}' not found in Airtable")
-        return
-
-    plugin_id = plugin_records[0]['id']
-    print(f"✅ Found plugin: {plugin_name} (ID: {plugin_id})\n")
-
-    # Get all agents for this plugin
-    agents_table = api.table(BASE_ID, "Agents")
-    all_agents = agents_table.all()
-
-    plugin_agents = []
-    for agent in all_agents:
-        fields = agent['fields']
-        plugins = fields.get('Plugin', [])
-        if plugin_id in plugins:
-            agent_name = fields.get('Agent Name', 'NO NAME')
-            created_time = agent.get('createdTime', '')
-            plugin_agents.append((agent_name, agent['id'], created_time))
-
-    print(f"📋 Total agents for {plugin_name}: {len(plugin_agents)}\n")
-
-    # Group by name
-    by_name = defaultdict(list)
-    for name, aid, created in plugin_agents:
-        by_name[name].append((aid, created))
-
-    # Find duplicates
-    duplicates_found = 0
-    records_to_delete = []
-
-    for name in sorted(by_name.keys()):
-        records = by_name[name]
-        if len(records) > 1:
-            duplicates_found += 1
-            print(f"⚠️  DUPLICATE: {name} ({len(records)} records)")
-
-            # Sort by creation time (oldest first)
-            sorted_records = sorted(records, key=lambda x: x[1])
-
-            # Keep the OLDEST, delete the rest
-            keep_id = sorted_records[0][0]
-            delete_ids = [r[0] for r in sorted_records[1:]]
-
-            print(f"   ✅ KEEP: {keep_id} (created: {sorted_records[0][1]})")
-            for did, dcreated in sorted_records[1:]:
-                print(f"   🗑️  DELETE: {did} (created: {dcreated})")
-                records_to_delete.append(did)
-            print()
-
-    if duplicates_found == 0:
-        print("✅ No duplicates found!")
-        return
-
-    print(f"\n📊 Summary:")
-    print(f"   Duplicate agent names: {duplicates_found}")
-    print(f"   Records to delete: {len(records_to_delete)}\n")
-
-    if dry_run:
-        print("🔍 DRY RUN - No records will be deleted")
-        print("   Remove --dry-run to actually delete duplicates")
-    else:
-        print("⚠️  DELETING DUPLICATES...")
-        for record_id in records_to_delete:
-            try:
-                agents_table.delete(record_id)
-                print(f"   ✅ Deleted: {record_id}")
-            except Exception as e:
-                print(f"   ❌ Failed to delete {record_id}: {e}")
-
-        print(f"\n✅ Cleanup complete! Deleted {len(records_to_delete)} duplicate records")
+from concurrent.futures import ThreadPoolExecutor
+
+from airtable_sync.batch import batch_delete
+from airtable_sync.components import make_api
+from airtable_sync.config import AIRTABLE_TOKEN, BASE_ID, SYNC_KEY_FIELD, print_missing_token
+from airtable_sync.manifest import SyncManifest
+from airtable_sync.marketplaces import MARKETPLACE_PATHS
+from airtable_sync.mirror import base_mirror
+
+# Component type -> (table, name field)
+CLEANUP_TABLES = {
+    'agents': ("Agents", "Agent Name"),
+    'commands': ("Commands", "Command Name"),
+    'skills': ("Skills", "Skill Name"),
+    'hooks': ("Hooks", "Hook Name"),
+}
+
+def mirrored_records(table, fields):
+    """Every record of a table, from the mirror when fresh, else from Airtable"""
+    records = base_mirror.records(table.name)
+    if records is None:
+        records = table.all(fields=fields, page_size=100)
+    return records
+
+def fetch_plugin_names(api):
+    """Map plugin record ID -> plugin name"""
+    records = mirrored_records(api.table(BASE_ID, "Plugins"), ["Name"])
+    return {record['id']: record['fields'].get('Name', '') for record in records}
+
+def manifest_record_ids(marketplaces):
+    """Record IDs the sync manifests of these marketplaces point at"""
+    return {
+        entry.get('record_id')
+        for marketplace_name in marketplaces
+        for entry in SyncManifest(marketplace_name).entries.values()
+    }
+
+def find_duplicates(records, name_field, plugin_id=None, referenced=frozenset()):
+    """Group records by (plugins, name) and split each group into keep and delete
+
+    Returns a list of (plugin IDs, name, kept record, duplicate records). The
+    kept record is one in referenced (the IDs the sync manifests know), else
+    one with a Sync Key, else the oldest. With plugin_id, only records linked
+    to that plugin count.
+    """
+    groups = defaultdict(list)
+    for record in records:
+        plugins = tuple(sorted(record['fields'].get('Plugin', [])))
+        if plugin_id and plugin_id not in plugins:
+            continue
+        groups[(plugins, record['fields'].get(name_field, 'NO NAME'))].append(record)
+
+    duplicates = []
+    for (plugins, name), group in sorted(groups.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        if len(group) < 2:
+            continue
+        group.sort(key=lambda record: (
+            record['id'] not in referenced,
+            not record['fields'].get(SYNC_KEY_FIELD),
+            record.get('createdTime', ''),
+            record['id'],
+        ))
+        duplicates.append((plugins, name, group[0], group[1:]))
+    return duplicates
+
+def cleanup_table(api, comp_type, plugin_names, plugin_id=None, dry_run=True, referenced=frozenset()):
+    """Find and (unless dry_run) delete the duplicates in one component table
+
+    Returns (output lines, records to delete, deleted record IDs). Output is
+    collected so concurrent tables don't interleave.
+    """
+    table_name, name_field = CLEANUP_TABLES[comp_type]
+    table = api.table(BASE_ID, table_name)
+    records = mirrored_records(table, [name_field, "Plugin", SYNC_KEY_FIELD])
+
+    lines = [f"📋 {table_name}: {len(records)} records"]
+    duplicates = find_duplicates(records, name_field, plugin_id, referenced)
+    to_delete = []
+    for plugins, name, keep, extra in duplicates:
+        plugin_label = ', '.join(plugin_names.get(pid, pid) for pid in plugins) or 'no plugin'
+        lines.append(f"⚠️  DUPLICATE: {plugin_label}/{name} ({len(extra) + 1} records)")
+        lines.append(f"   ✅ KEEP: {keep['id']} (created: {keep.get('createdTime', '')})")
+        for record in extra:
+            lines.append(f"   🗑️  DELETE: {record['id']} (created: {record.get('createdTime', '')})")
+            to_delete.append(record['id'])
+
+    if dry_run or not to_delete:
+        return lines, len(to_delete), []
+
+    deleted, errors = batch_delete(api, table, to_delete)
+    lines.extend(errors)
+    lines.append(f"   ✅ Deleted {len(deleted)} of {len(to_delete)} duplicate {table_name} records")
+
+    # Batch upserts merge on the Sync Key; hand it over to the kept record
+    # once the duplicate that carried it is gone
+    gone = set(deleted)
+    for _, _, keep, extra in duplicates:
+        if keep['fields'].get(SYNC_KEY_FIELD):
+            continue
+        keys = [
+            record['fields'][SYNC_KEY_FIELD] for record in extra
+            if record['id'] in gone and record['fields'].get(SYNC_KEY_FIELD)
+        ]
+        if not keys:
+            continue
+        key = keys[0]
+        try:
+            base_mirror.put(table_name, [table.update(keep['id'], {SYNC_KEY_FIELD: key})])
+            lines.append(f"   🔑 {keep['id']} now carries Sync Key {key}")
+        except Exception as e:
+            lines.append(f"   ⚠️  Could not set Sync Key {key} on {keep['id']}: {e}")
+    return lines, len(to_delete), deleted
 
 def main():
     parser = argparse.ArgumentParser(description='Clean up duplicate components in Airtable')
-    parser.add_argument('--plugin', required=True, help='Plugin name (e.g., celery)')
-    parser.add_argument('--type', required=True, choices=['agents', 'commands', 'skills', 'hooks'],
-                        help='Component type to clean up')
+    parser.add_argument('--plugin',
+                        help='Only clean up this plugin (e.g., celery). Default: all plugins')
+    parser.add_argument('--type',
+                        help='Comma-separated component types (agents,commands,skills,hooks). Default: all')
     parser.add_argument('--dry-run', action='store_true',
                         help='Show what would be deleted without actually deleting')
+    parser.add_argument('--max-workers', type=int, default=1,
+                        help='Component tables to clean up concurrently (default: 1)')
 
     args = parser.parse_args()
 
+    component_types = list(CLEANUP_TABLES)
+    if args.type:
+        component_types = [t.strip() for t in args.type.split(',')]
+        unknown = [t for t in component_types if t not in CLEANUP_TABLES]
+        if unknown:
+            print(f"❌ ERROR: Unknown component type: {', '.join(unknown)}")
+            print(f"   Valid types: {list(CLEANUP_TABLES)}")
+            return 1
+
     # Validate token
     if not AIRTABLE_TOKEN:
-        print("❌ ERROR: AIRTABLE_TOKEN or MCP_AIRTABLE_TOKEN environment variable not set")
+        print_missing_token()
         return 1
 
-    api = Api(AIRTABLE_TOKEN)
+    workers = max(1, min(args.max_workers, len(component_types)))
+    # The mirror refreshes every table (and Plugins) concurrently
+    api = make_api(AIRTABLE_TOKEN, pool_size=len(component_types) + 1)
 
     print("=" * 80)
     print("🧹 AIRTABLE DUPLICATE CLEANUP")
     print("=" * 80)
-    print(f"   Plugin: {args.plugin}")
-    print(f"   Type: {args.type}")
+    print(f"   Plugin: {args.plugin or 'all'}")
+    print(f"   Types: {', '.join(component_types)}")
     print(f"   Dry Run: {args.dry_run}")
     print("=" * 80)
     print()
 
-    if args.type == 'agents':
-        cleanup_agents(api, args.plugin, args.dry_run)
-    else:
-        print(f"❌ Cleanup for {args.type} not yet implemented")
-        return 1
+    base_mirror.refresh(api, ["Plugins"] + [CLEANUP_TABLES[t][0] for t in component_types],
+                        reconcile=not args.dry_run)
+    plugin_names = fetch_plugin_names(api)
+    plugin_id = None
+    if args.plugin:
+        plugin_id = next((pid for pid, name in plugin_names.items() if name == args.plugin), None)
+        if not plugin_id:
+            print(f"❌ Plugin '{args.plugin}' not found in Airtable")
+            return 1
+        print(f"✅ Found plugin: {args.plugin} (ID: {plugin_id})\n")
+
+    referenced = manifest_record_ids(MARKETPLACE_PATHS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(cleanup_table, api, comp_type, plugin_names, plugin_id, args.dry_run, referenced)
+            for comp_type in component_types
+        ]
+        outcomes = []
+        for future in futures:
+            lines, found, deleted = future.result()
+            print('\n'.join(lines))
+            print()
+            outcomes.append((found, deleted))
+
+    total_found = sum(found for found, _ in outcomes)
+    deleted = {record_id for _, table_deleted in outcomes for record_id in table_deleted}
+    total_deleted = len(deleted)
+
+    # Forget deleted records in the sync manifests, so the next sync looks
+    # the component up again instead of skipping it as unchanged
+    for marketplace_name in MARKETPLACE_PATHS:
+        manifest = SyncManifest(marketplace_name)
+        stale_keys = [key for key, entry in manifest.entries.items() if entry.get('record_id') in deleted]
+        if stale_keys:
+            manifest.update(removed=stale_keys)
+
+    if total_found == 0:
+        print("✅ No duplicates found!")
+        return 0
 
+    print("📊 Summary:")
+    print(f"   Records to delete: {total_found}")
+    if args.dry_run:
+        print("🔍 DRY RUN - No records will be deleted")
+        print("   Remove --dry-run to actually delete duplicates")
+        return 0
+
+    print(f"   Deleted: {total_deleted}")
+    if total_deleted < total_found:
+        print(f"❌ {total_found - total_deleted} duplicate records could not be deleted")
+        return 1
+    print("\n✅ Cleanup complete!")
     return 0
 
 if __name__ == "__main__":
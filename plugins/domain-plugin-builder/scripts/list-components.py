@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+List the components of a marketplace from their (cached) frontmatter
+
+Usage:
+    python list-components.py --marketplace=ai-dev-marketplace
+    python list-components.py --marketplace-dir=. --type=agents
+    python list-components.py --marketplace-dir=. --type=agents --format=tsv   # plugin<TAB>name<TAB>description
+
+Frontmatter comes from the shared frontmatter cache, so listing an unchanged
+marketplace only stats its files. Used by list-agents.sh.
+"""
+
+import os
+import sys
+import json
+import argparse
+
+from airtable_sync.discovery import component_file_path, discover_components
+from airtable_sync.frontmatter import extract_frontmatter
+from airtable_sync.marketplaces import MARKETPLACE_PATHS
+
+ALL_TYPES = ['agents', 'commands', 'skills', 'hooks']
+
+def list_components(marketplace_root, component_types):
+    """Yield a dict per component, sorted by plugin, type and name"""
+    plugins_dir = os.path.join(marketplace_root, 'plugins')
+    if not os.path.isdir(plugins_dir):
+        return
+
+    for plugin in sorted(os.listdir(plugins_dir)):
+        plugin_path = os.path.join(plugins_dir, plugin)
+        if not os.path.isdir(plugin_path):
+            continue
+
+        for comp_type, comp_name in sorted(discover_components(plugin_path, component_types)):
+            file_path = component_file_path(comp_type, comp_name, plugin_path)
+            frontmatter = {}
+            if comp_type in ('agent', 'command', 'skill'):
+                md_path = os.path.join(file_path, 'SKILL.md') if comp_type == 'skill' else file_path
+                frontmatter = extract_frontmatter(md_path, log=lambda message: print(message, file=sys.stderr)) or {}
+
+            yield {
+                'type': comp_type,
+                'plugin': plugin,
+                'name': str(frontmatter.get('name') or comp_name),
+                'description': str(frontmatter.get('description') or ''),
+                'path': file_path,
+            }
+
+def main():
+    parser = argparse.ArgumentParser(description='List marketplace components from their frontmatter')
+    location = parser.add_mutually_exclusive_group()
+    location.add_argument('--marketplace',
+                          help='Marketplace name (from MARKETPLACE_PATHS)')
+    location.add_argument('--marketplace-dir',
+                          help='Marketplace root directory (default: current directory)')
+    parser.add_argument('--type',
+                        help='Comma-separated component types (agents,commands,skills,hooks). Default: all')
+    parser.add_argument('--format', choices=['text', 'tsv', 'json'], default='text',
+                        help='Output format (default: text)')
+
+    args = parser.parse_args()
+
+    if args.marketplace:
+        if args.marketplace not in MARKETPLACE_PATHS:
+            print(f"❌ ERROR: Unknown marketplace: {args.marketplace}")
+            print(f"   Valid marketplaces: {list(MARKETPLACE_PATHS.keys())}")
+            return 1
+        marketplace_root = MARKETPLACE_PATHS[args.marketplace]
+    else:
+        marketplace_root = os.path.abspath(args.marketplace_dir or os.getcwd())
+
+    component_types = ALL_TYPES
+    if args.type:
+        component_types = [t.strip() for t in args.type.split(',')]
+
+    components = list(list_components(marketplace_root, component_types))
+
+    if args.format == 'json':
+        print(json.dumps(components, indent=2))
+    elif args.format == 'tsv':
+        for comp in components:
+            # Tabs and newlines would break the columns
+            fields = [comp['plugin'], comp['name'], comp['description']]
+            print('\t'.join(' '.join(field.split()) for field in fields))
+    else:
+        for comp in components:
+            print(f"  - {comp['type']}: {comp['plugin']}/{comp['name']}")
+            if comp['description']:
+                print(f"    {comp['description']}")
+        print()
+        print(f"📋 Total: {len(components)} components")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,263 +7,34 @@ Usage:
     python sync-component.py --type=command --name=my-command --plugin=planning --marketplace=dev-lifecycle-marketplace
     python sync-component.py --type=skill --name=my-skill --plugin=quality --marketplace=dev-lifecycle-marketplace
 
-This script is called at the end of component creation commands to immediately sync to Airtable.
+This script is called at the end of component creation commands. The sync is
+written to the durable sync queue and pushed by a background replayer
+(sync-queue.py --drain), so the command returns without waiting on Airtable and
+a sync that fails is retried instead of lost. Pass --wait to sync in the
+foreground and get the result as the exit status.
 """
 
 import os
 import sys
-import re
-import yaml
 import argparse
-from pathlib import Path
-from pyairtable import Api
-
-# Airtable configuration
-AIRTABLE_TOKEN = os.getenv("AIRTABLE_TOKEN") or os.getenv("MCP_AIRTABLE_TOKEN")
-BASE_ID = "appHbSB7WhT1TxEQb"
-
-# Marketplace root paths
-MARKETPLACE_PATHS = {
-    "dev-lifecycle-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/dev-lifecycle-marketplace",
-    "ai-dev-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/ai-dev-marketplace",
-    "mcp-servers-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/mcp-servers-marketplace",
-    "domain-plugin-builder": "/home/gotime2022/.claude/plugins/marketplaces/domain-plugin-builder",
-}
-
-# Special marker for standalone plugins (not in a marketplace)
-STANDALONE_MARKER = "standalone"
-
-def extract_frontmatter(file_path):
-    """Extract YAML frontmatter from markdown file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Match YAML frontmatter
-        match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-        if match:
-            frontmatter_text = match.group(1)
-
-            # Fix argument-hint lines with square brackets
-            lines = frontmatter_text.split('\n')
-            fixed_lines = []
-            for line in lines:
-                if 'argument-hint:' in line and '[' in line:
-                    if not (line.strip().endswith('"') or line.strip().endswith("'")):
-                        parts = line.split(':', 1)
-                        if len(parts) == 2:
-                            key = parts[0]
-                            value = parts[1].strip()
-                            line = f'{key}: "{value}"'
-                fixed_lines.append(line)
-
-            frontmatter_text = '\n'.join(fixed_lines)
-            return yaml.safe_load(frontmatter_text)
-        return None
-    except Exception as e:
-        print(f"❌ Error reading {file_path}: {e}")
-        return None
-
-def get_plugin_record_id(api, plugin_name, marketplace_name):
-    """Get or create Plugin record and return its ID"""
-    plugins_table = api.table(BASE_ID, "Plugins")
-
-    # Search for existing plugin by name only
-    formula = f"{{Name}}='{plugin_name}'"
-    records = plugins_table.all(formula=formula)
-
-    if records:
-        # Plugin exists - return first match
-        # Note: If multiple marketplaces have same plugin name, this returns the first
-        return records[0]['id']
-
-    # Plugin doesn't exist - create it
-    print(f"📝 Creating plugin '{plugin_name}' in Airtable...")
-    print(f"   Marketplace: {marketplace_name}")
-
-    # Create with just Name field
-    # Note: "Is Marketplace" and "Marketplace Name" fields need to be added to Airtable Plugins table first
-    plugin_data = {
-        "Name": plugin_name,
-    }
-
-    try:
-        new_record = plugins_table.create(plugin_data)
-        print(f"✅ Created plugin: {plugin_name} (ID: {new_record['id']})")
-        return new_record['id']
-    except Exception as e:
-        print(f"❌ Failed to create plugin: {e}")
-        print(f"   You may need to create the plugin '{plugin_name}' manually in Airtable")
-        return None
-
-def sync_agent(api, name, plugin_name, marketplace_name, file_path):
-    """Sync agent to Airtable"""
-    print(f"📋 Syncing agent: {name}")
-
-    # Read frontmatter
-    frontmatter = extract_frontmatter(file_path)
-    if not frontmatter:
-        print(f"❌ Could not extract frontmatter from {file_path}")
-        return False
-
-    # Get plugin record ID
-    plugin_record_id = get_plugin_record_id(api, plugin_name, marketplace_name)
-    if not plugin_record_id:
-        return False
-
-    # Prepare agent data with ONLY required fields
-    # We'll discover the correct field names through trial
-    agent_data = {
-        "Agent Name": frontmatter.get('name', name),
-        "Plugin": [plugin_record_id],
-    }
-
-    # Check if agent exists
-    # Get all agents with this name, then filter by plugin in Python
-    # (Airtable formulas for linked records are unreliable)
-    agents_table = api.table(BASE_ID, "Agents")
-    all_with_name = agents_table.all(formula=f"{{Agent Name}}='{name}'")
-    existing = [
-        agent for agent in all_with_name
-        if plugin_record_id in agent['fields'].get('Plugin', [])
-    ]
-
-    if existing:
-        # Update existing
-        record_id = existing[0]['id']
-        agents_table.update(record_id, agent_data)
-        print(f"✅ Updated agent: {name} (ID: {record_id})")
-    else:
-        # Create new
-        record = agents_table.create(agent_data)
-        print(f"✅ Created agent: {name} (ID: {record['id']})")
-
-    return True
-
-def sync_command(api, name, plugin_name, marketplace_name, file_path):
-    """Sync command to Airtable"""
-    print(f"📋 Syncing command: {name}")
-
-    # Read frontmatter
-    frontmatter = extract_frontmatter(file_path)
-    if not frontmatter:
-        print(f"❌ Could not extract frontmatter from {file_path}")
-        return False
-
-    # Get plugin record ID
-    plugin_record_id = get_plugin_record_id(api, plugin_name, marketplace_name)
-    if not plugin_record_id:
-        return False
-
-    # Prepare command data
-    command_data = {
-        "Command Name": f"/{plugin_name}:{name}",
-        "Description": frontmatter.get('description', ''),
-        "Argument Hint": frontmatter.get('argument-hint', ''),
-        "Plugin": [plugin_record_id],
-        "File Path": f"plugins/{plugin_name}/commands/{name}.md",
-    }
-
-    # Check if command exists
-    commands_table = api.table(BASE_ID, "Commands")
-    formula = f"{{Command Name}}='/{plugin_name}:{name}'"
-    existing = commands_table.all(formula=formula)
-
-    if existing:
-        # Update existing
-        record_id = existing[0]['id']
-        commands_table.update(record_id, command_data)
-        print(f"✅ Updated command: {name} (ID: {record_id})")
-    else:
-        # Create new
-        record = commands_table.create(command_data)
-        print(f"✅ Created command: {name} (ID: {record['id']})")
-
-    return True
-
-def sync_skill(api, name, plugin_name, marketplace_name, dir_path):
-    """Sync skill to Airtable"""
-    print(f"📋 Syncing skill: {name}")
-
-    # Read SKILL.md frontmatter
-    skill_file = os.path.join(dir_path, "SKILL.md")
-    frontmatter = extract_frontmatter(skill_file)
-    if not frontmatter:
-        print(f"❌ Could not extract frontmatter from {skill_file}")
-        return False
-
-    # Get plugin record ID
-    plugin_record_id = get_plugin_record_id(api, plugin_name, marketplace_name)
-    if not plugin_record_id:
-        return False
-
-    # Prepare skill data
-    skill_data = {
-        "Skill Name": frontmatter.get('name', name),
-        "Description": frontmatter.get('description', ''),
-        "Plugin": [plugin_record_id],
-        "Directory Path": f"plugins/{plugin_name}/skills/{name}/",
-    }
-
-    # Check if skill exists
-    # Get all skills with this name, then filter by plugin in Python
-    # (Airtable formulas for linked records are unreliable)
-    skills_table = api.table(BASE_ID, "Skills")
-    all_with_name = skills_table.all(formula=f"{{Skill Name}}='{name}'")
-    existing = [
-        skill for skill in all_with_name
-        if plugin_record_id in skill['fields'].get('Plugin', [])
-    ]
-
-    if existing:
-        # Update existing
-        record_id = existing[0]['id']
-        skills_table.update(record_id, skill_data)
-        print(f"✅ Updated skill: {name} (ID: {record_id})")
-    else:
-        # Create new
-        record = skills_table.create(skill_data)
-        print(f"✅ Created skill: {name} (ID: {record['id']})")
-
-    return True
-
-def sync_hook(api, name, event_type, plugin_name, marketplace_name, script_path):
-    """Sync hook to Airtable"""
-    print(f"📋 Syncing hook: {name} ({event_type})")
-
-    # Get plugin record ID
-    plugin_record_id = get_plugin_record_id(api, plugin_name, marketplace_name)
-    if not plugin_record_id:
-        return False
-
-    # Prepare hook data with minimal required fields
-    hook_data = {
-        "Hook Name": name,
-        "Event Type": event_type,
-        "Plugin": [plugin_record_id],
-    }
-
-    # Check if hook exists
-    # Get all hooks with this name, then filter by plugin in Python
-    # (Airtable formulas for linked records are unreliable)
-    hooks_table = api.table(BASE_ID, "Hooks")
-    all_with_name = hooks_table.all(formula=f"{{Hook Name}}='{name}'")
-    existing = [
-        hook for hook in all_with_name
-        if plugin_record_id in hook['fields'].get('Plugin', [])
-    ]
-
-    if existing:
-        # Update existing
-        record_id = existing[0]['id']
-        hooks_table.update(record_id, hook_data)
-        print(f"✅ Updated hook: {name} (ID: {record_id})")
-    else:
-        # Create new
-        record = hooks_table.create(hook_data)
-        print(f"✅ Created hook: {name} (ID: {record['id']})")
-
-    return True
+import subprocess
+
+from airtable_sync.config import AIRTABLE_TOKEN, STANDALONE_MARKER, print_missing_token
+from airtable_sync.marketplaces import MARKETPLACE_PATHS
+from airtable_sync.sync_queue import LOG_PATH, SyncQueue, drain_lock, replay_queue
+
+def start_replayer():
+    """Drain the queue in a detached process that outlives this command"""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sync-queue.py')
+    os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+    with open(LOG_PATH, 'a') as log_file:
+        subprocess.Popen(
+            [sys.executable, script, '--drain'],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
 
 def main():
     parser = argparse.ArgumentParser(description='Sync a component to Airtable')
@@ -279,14 +50,14 @@ def main():
                         help='Hook event type (required for hooks)')
     parser.add_argument('--script-path',
                         help='Hook script path (required for hooks)')
+    parser.add_argument('--wait', action='store_true',
+                        help='Sync in the foreground instead of queueing for the background replayer')
 
     args = parser.parse_args()
 
     # Validate Airtable token
     if not AIRTABLE_TOKEN:
-        print("❌ ERROR: AIRTABLE_TOKEN or MCP_AIRTABLE_TOKEN environment variable not set")
-        print("   Export it: export AIRTABLE_TOKEN=your_token_here")
-        print("   Or: export MCP_AIRTABLE_TOKEN=your_token_here")
+        print_missing_token()
         return 1
 
     # Validate marketplace
@@ -349,10 +120,17 @@ def main():
             print(f"❌ ERROR: Hook script not found: {file_path}")
             return 1
 
-    # Initialize Airtable API
-    api = Api(AIRTABLE_TOKEN)
+    # Queue the sync; the replayer needs absolute paths since it runs elsewhere
+    queue = SyncQueue()
+    key = queue.enqueue({
+        'type': args.type,
+        'name': args.name,
+        'plugin': args.plugin,
+        'marketplace': args.marketplace,
+        'file_path': os.path.abspath(file_path),
+        'event_type': args.event_type,
+    })
 
-    # Sync component
     print()
     print("=" * 80)
     print(f"🔄 Syncing {args.type} to Airtable")
@@ -363,17 +141,24 @@ def main():
     print(f"   File: {file_path}")
     print()
 
-    success = False
-    if args.type == 'agent':
-        success = sync_agent(api, args.name, args.plugin, args.marketplace, file_path)
-    elif args.type == 'command':
-        success = sync_command(api, args.name, args.plugin, args.marketplace, file_path)
-    elif args.type == 'skill':
-        success = sync_skill(api, args.name, args.plugin, args.marketplace, file_path)
-    elif args.type == 'hook':
-        success = sync_hook(api, args.name, args.event_type, args.plugin, args.marketplace, file_path)
+    if not args.wait:
+        start_replayer()
+        print(f"📥 Queued - syncing in the background (log: {LOG_PATH})")
+        print("   Check progress with: python sync-queue.py")
+        return 0
+
+    # Foreground: replay now, waiting for a background replayer if one is running
+    from airtable_sync.components import make_api
+
+    try:
+        with drain_lock(blocking=True):
+            replay_queue(make_api(AIRTABLE_TOKEN, pool_size=1), queue)
+    except Exception as e:
+        print(f"❌ Replay failed: {e}")
 
-    if success:
+    # Anything but a synced (and so dequeued) component is a failure
+    entry = queue.get(key)
+    if entry is None:
         print()
         print("=" * 80)
         print("✅ Sync complete!")
@@ -382,7 +167,9 @@ def main():
     else:
         print()
         print("=" * 80)
-        print("❌ Sync failed!")
+        print("❌ Sync failed - still queued, will be retried by the next replay")
+        if entry['last_error']:
+            print(f"   Error: {entry['last_error']}")
         print("=" * 80)
         return 1
 
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Inspect and replay the queue of pending Airtable syncs
+
+Usage:
+    python sync-queue.py                 # Show pending syncs and their last errors
+    python sync-queue.py --drain         # Push every due sync to Airtable now
+    python sync-queue.py --drain --retry-now   # Also retry syncs still backing off
+    python sync-queue.py --clear         # Forget all pending syncs
+
+sync-component.py queues a sync and starts `sync-queue.py --drain` in the
+background (output in ~/.cache/domain-plugin-builder/sync-queue.log). Only one
+replayer runs at a time; a second --drain exits straight away because the
+running one picks up new entries before it stops. Replays use batch upserts,
+so the component tables need the "Sync Key" field.
+"""
+
+import sys
+import time
+import argparse
+from datetime import datetime
+
+from airtable_sync.config import AIRTABLE_TOKEN, COMPONENT_TABLES, print_missing_token
+from airtable_sync.sync_queue import SyncQueue, drain_lock, replay_queue
+
+def log(message):
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}", flush=True)
+
+def print_queue(queue):
+    entries = queue.entries()
+    if not entries:
+        print("✅ No pending syncs")
+        return 0
+
+    now = time.time()
+    print("=" * 80)
+    print(f"📋 PENDING SYNCS: {len(entries)}")
+    print("=" * 80)
+    for entry in entries:
+        waiting = now - entry['queued_at']
+        retry = entry['next_attempt'] - now
+        status = f"retry in {retry:.0f}s" if retry > 0 else "due"
+        print(f"  - {entry['type']}: {entry['plugin']}/{entry['name']} ({entry['marketplace']}) "
+              f"queued {waiting:.0f}s ago, {entry['attempts']} attempt(s), {status}")
+        if entry['last_error']:
+            print(f"    {entry['last_error'][:200]}")
+    return 0
+
+def drain(queue):
+    """Replay the queue until it is empty or Airtable stops answering"""
+    from airtable_sync.components import make_api
+
+    api = None
+    totals = {'synced': 0, 'failed': 0, 'dropped': 0}
+    while True:
+        with drain_lock() as locked:
+            if not locked:
+                log("⏭️  Another replayer is running")
+                return 0
+            if api is None:
+                # One connection per component table the mirror refreshes
+                api = make_api(AIRTABLE_TOKEN, pool_size=len(COMPONENT_TABLES))
+            counts = replay_queue(api, queue, log=log)
+        for key, value in counts.items():
+            totals[key] += value
+
+        # Entries queued after the last round but before the lock was released
+        # had their own replayer turned away; pick them up here
+        if counts['failed'] or not queue.due(limit=1):
+            break
+
+    log(f"📊 {totals['synced']} synced, {totals['failed']} failed, "
+        f"{totals['dropped']} dropped, {len(queue)} still queued")
+    return 0 if not totals['failed'] else 1
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and replay pending Airtable syncs')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--drain', action='store_true',
+                        help='Sync every due entry now')
+    action.add_argument('--clear', action='store_true',
+                        help='Remove every pending entry without syncing')
+    parser.add_argument('--retry-now', action='store_true',
+                        help='With --drain, retry failed entries without waiting out their backoff')
+
+    args = parser.parse_args()
+    queue = SyncQueue()
+
+    if args.clear:
+        count = len(queue)
+        queue.clear()
+        print(f"🗑️  Removed {count} pending sync(s)")
+        return 0
+
+    if args.drain:
+        if not AIRTABLE_TOKEN:
+            print_missing_token()
+            return 1
+        if args.retry_now:
+            queue.retry_all()
+        return drain(queue)
+
+    return print_queue(queue)
+
+if __name__ == "__main__":
+    sys.exit(main())
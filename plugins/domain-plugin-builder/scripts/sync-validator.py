@@ -5,244 +5,155 @@ Validate that all components are synced to Airtable
 Usage:
     python sync-validator.py                    # Check sync status for all marketplaces
     python sync-validator.py --marketplace=ai-dev-marketplace  # Check specific marketplace
-    python sync-validator.py --auto-sync        # Auto-sync missing components
+    python sync-validator.py --auto-sync        # Auto-sync missing and changed components
+    python sync-validator.py --fix-orphans --dry-run  # Show which orphaned records would be removed
     python sync-validator.py --fix-orphans      # Remove orphaned Airtable records
+    python sync-validator.py --reconcile        # Also pick up records deleted in Airtable right away
 
 This script ensures that the filesystem and Airtable are always in sync.
 """
 
-import os
 import sys
-import json
-import re
-import yaml
 import argparse
 from pathlib import Path
-from pyairtable import Api
-
-# Airtable configuration
-AIRTABLE_TOKEN = os.getenv("AIRTABLE_TOKEN") or os.getenv("MCP_AIRTABLE_TOKEN")
-BASE_ID = "appHbSB7WhT1TxEQb"
-
-# Marketplace root paths
-MARKETPLACE_PATHS = {
-    "dev-lifecycle-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/dev-lifecycle-marketplace",
-    "ai-dev-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/ai-dev-marketplace",
-    "mcp-servers-marketplace": "/home/gotime2022/.claude/plugins/marketplaces/mcp-servers-marketplace",
-    "domain-plugin-builder": "/home/gotime2022/.claude/plugins/marketplaces/domain-plugin-builder",
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from airtable_sync.batch import batch_delete, batch_sync_components, sync_key
+from airtable_sync.components import make_api
+from airtable_sync.config import AIRTABLE_TOKEN, BASE_ID, SYNC_KEY_FIELD, print_missing_token
+from airtable_sync.discovery import list_plugins, scan_marketplaces
+from airtable_sync.manifest import SyncManifest, component_hash, delete_removed_components, manifest_key
+from airtable_sync.marketplaces import MARKETPLACE_PATHS
+from airtable_sync.mirror import base_mirror
+
+# Component type -> (table, name field)
+AIRTABLE_TABLES = {
+    'agents': ("Agents", "Agent Name"),
+    'commands': ("Commands", "Command Name"),
+    'skills': ("Skills", "Skill Name"),
+    'hooks': ("Hooks", "Hook Name"),
 }
 
-def extract_frontmatter(file_path):
-    """Extract YAML frontmatter from markdown file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-        if match:
-            frontmatter_text = match.group(1)
-
-            # Fix argument-hint lines
-            lines = frontmatter_text.split('\n')
-            fixed_lines = []
-            for line in lines:
-                if 'argument-hint:' in line and '[' in line:
-                    if not (line.strip().endswith('"') or line.strip().endswith("'")):
-                        parts = line.split(':', 1)
-                        if len(parts) == 2:
-                            key = parts[0]
-                            value = parts[1].strip()
-                            line = f'{key}: "{value}"'
-                fixed_lines.append(line)
-
-            frontmatter_text = '\n'.join(fixed_lines)
-            return yaml.safe_load(frontmatter_text)
-        return None
-    except Exception as e:
-        print(f"❌ Error reading {file_path}: {e}")
-        return None
-
-def scan_filesystem_components(marketplace_name, marketplace_path):
-    """Scan filesystem for all components in a marketplace"""
+def record_component_name(comp_type, value):
+    """Component name as on disk for a record's name field
+
+    Commands are stored as "/<plugin>:<name>".
+    """
+    if comp_type == 'commands' and value.startswith('/') and ':' in value:
+        return value.split(':', 1)[1]
+    return value
+
+def airtable_name(comp_type, comp):
+    """Name a synced filesystem component carries in its record's name field
+
+    Agents and skills are written under their frontmatter name (see
+    build_record_fields), which can differ from the file or directory name.
+    """
+    if comp_type in ('agents', 'skills'):
+        return (comp.get('frontmatter') or {}).get('name', comp['name'])
+    return comp['name']
+
+def fetch_airtable_components(api, reconcile=False):
+    """Fetch all components and the plugin name -> ID map from Airtable
+
+    The local mirror of the Plugins table and the four component tables is
+    refreshed (only records changed since the last run are downloaded, see
+    airtable_sync/mirror.py) and read back. Returns (components, plugin_map,
+    failed) where failed lists the tables that could not be refreshed.
+    """
     components = {
         'agents': [],
         'commands': [],
         'skills': [],
         'hooks': []
     }
+    plugin_map = {}
+    failed = []
 
-    plugins_dir = os.path.join(marketplace_path, 'plugins')
-    if not os.path.exists(plugins_dir):
-        return components
-
-    for plugin_name in os.listdir(plugins_dir):
-        plugin_path = os.path.join(plugins_dir, plugin_name)
-        if not os.path.isdir(plugin_path):
-            continue
-
-        # Scan agents
-        agents_dir = os.path.join(plugin_path, 'agents')
-        if os.path.exists(agents_dir):
-            for agent_file in os.listdir(agents_dir):
-                if agent_file.endswith('.md'):
-                    agent_name = agent_file.replace('.md', '')
-                    agent_path = os.path.join(agents_dir, agent_file)
-                    frontmatter = extract_frontmatter(agent_path)
-                    components['agents'].append({
-                        'name': agent_name,
-                        'plugin': plugin_name,
-                        'marketplace': marketplace_name,
-                        'path': agent_path,
-                        'frontmatter': frontmatter
-                    })
-
-        # Scan commands
-        commands_dir = os.path.join(plugin_path, 'commands')
-        if os.path.exists(commands_dir):
-            for cmd_file in os.listdir(commands_dir):
-                if cmd_file.endswith('.md'):
-                    cmd_name = cmd_file.replace('.md', '')
-                    cmd_path = os.path.join(commands_dir, cmd_file)
-                    frontmatter = extract_frontmatter(cmd_path)
-                    components['commands'].append({
-                        'name': cmd_name,
-                        'plugin': plugin_name,
-                        'marketplace': marketplace_name,
-                        'path': cmd_path,
-                        'frontmatter': frontmatter
-                    })
-
-        # Scan skills
-        skills_dir = os.path.join(plugin_path, 'skills')
-        if os.path.exists(skills_dir):
-            for skill_name in os.listdir(skills_dir):
-                skill_path = os.path.join(skills_dir, skill_name)
-                skill_md = os.path.join(skill_path, 'SKILL.md')
-                if os.path.isdir(skill_path) and os.path.exists(skill_md):
-                    frontmatter = extract_frontmatter(skill_md)
-                    components['skills'].append({
-                        'name': skill_name,
-                        'plugin': plugin_name,
-                        'marketplace': marketplace_name,
-                        'path': skill_path,
-                        'frontmatter': frontmatter
-                    })
-
-        # Scan hooks
-        hooks_json = os.path.join(plugin_path, 'hooks', 'hooks.json')
-        if os.path.exists(hooks_json):
-            with open(hooks_json, 'r') as f:
-                hooks_data = json.load(f)
-                for event_type, hook_scripts in hooks_data.get('hooks', {}).items():
-                    for hook_script in hook_scripts:
-                        # Extract hook name from script path
-                        hook_name = os.path.basename(hook_script).replace('.sh', '')
-                        components['hooks'].append({
-                            'name': hook_name,
-                            'plugin': plugin_name,
-                            'marketplace': marketplace_name,
-                            'event_type': event_type,
-                            'script_path': hook_script
-                        })
-
-    return components
-
-def fetch_airtable_components(api):
-    """Fetch all components from Airtable"""
-    components = {
-        'agents': [],
-        'commands': [],
-        'skills': [],
-        'hooks': []
-    }
+    base_mirror.refresh(api, reconcile=reconcile)
 
-    try:
-        # Fetch all agents
-        agents_table = api.table(BASE_ID, "Agents")
-        for record in agents_table.all():
-            components['agents'].append({
-                'id': record['id'],
-                'name': record['fields'].get('Agent Name', ''),
-                'plugin_id': record['fields'].get('Plugin', [])
-            })
-
-        # Fetch all commands
-        commands_table = api.table(BASE_ID, "Commands")
-        for record in commands_table.all():
-            components['commands'].append({
-                'id': record['id'],
-                'name': record['fields'].get('Name', ''),
-                'plugin_id': record['fields'].get('Plugin', [])
-            })
+    plugins = base_mirror.records("Plugins")
+    if plugins is None:
+        failed.append('plugins')
+    else:
+        for record in plugins:
+            plugin_map[record['fields'].get('Name', '')] = record['id']
 
-        # Fetch all skills
-        skills_table = api.table(BASE_ID, "Skills")
-        for record in skills_table.all():
-            components['skills'].append({
-                'id': record['id'],
-                'name': record['fields'].get('Skill Name', ''),
-                'plugin_id': record['fields'].get('Plugin', [])
-            })
+    for comp_type, (table_name, name_field) in AIRTABLE_TABLES.items():
+        records = base_mirror.records(table_name)
+        if records is None:
+            failed.append(comp_type)
+            continue
 
-        # Fetch all hooks
-        hooks_table = api.table(BASE_ID, "Hooks")
-        for record in hooks_table.all():
-            components['hooks'].append({
+        for record in records:
+            component = {
                 'id': record['id'],
-                'name': record['fields'].get('Hook Name', ''),
-                'event_type': record['fields'].get('Event Type', ''),
-                'plugin_id': record['fields'].get('Plugin', [])
-            })
-
-    except Exception as e:
-        print(f"❌ Error fetching from Airtable: {e}")
-
-    return components
-
-def compare_components(fs_components, at_components, api):
+                'name': record_component_name(comp_type, record['fields'].get(name_field, '')),
+                'plugin_id': record['fields'].get('Plugin', []),
+                'sync_key': record['fields'].get(SYNC_KEY_FIELD),
+            }
+            if comp_type == 'hooks':
+                component['event_type'] = record['fields'].get('Event Type', '')
+            components[comp_type].append(component)
+
+    return components, plugin_map, failed
+
+def index_airtable_components(at_components):
+    """Map (type, name, plugin_id) -> record ID for every Airtable component
+
+    A record linked to several plugins is indexed once per plugin. Records
+    with a Sync Key are also indexed under (type, sync key). If several
+    records share a key, the first one wins, matching the old linear scan.
+    """
+    index = {}
+    for comp_type, records in at_components.items():
+        for record in records:
+            if record.get('sync_key'):
+                index.setdefault((comp_type, record['sync_key']), record['id'])
+            for plugin_id in record.get('plugin_id', []):
+                index.setdefault((comp_type, record['name'], plugin_id), record['id'])
+    return index
+
+def compare_components(fs_components, at_components, plugin_map):
     """Compare filesystem and Airtable components"""
-    # Get plugin name to ID mapping
-    plugins_table = api.table(BASE_ID, "Plugins")
-    plugin_map = {}
-    for record in plugins_table.all():
-        plugin_name = record['fields'].get('Name', '')
-        plugin_map[plugin_name] = record['id']
-
     results = {
         'missing_in_airtable': {'agents': [], 'commands': [], 'skills': [], 'hooks': []},
         'orphaned_in_airtable': {'agents': [], 'commands': [], 'skills': [], 'hooks': []},
-        'synced': {'agents': 0, 'commands': 0, 'skills': 0, 'hooks': 0}
+        'synced': {'agents': 0, 'commands': 0, 'skills': 0, 'hooks': 0},
+        # (plugin, name) -> Airtable record ID for every synced component
+        'record_ids': {'agents': {}, 'commands': {}, 'skills': {}, 'hooks': {}},
     }
 
+    # Index both sides by Sync Key and by (type, name, plugin_id), using the
+    # names the sync writes, so the diff is linear
+    at_index = index_airtable_components(at_components)
+    fs_keys = set()
+
     for comp_type in ['agents', 'commands', 'skills', 'hooks']:
         # Check for missing components
         for fs_comp in fs_components[comp_type]:
-            plugin_id = plugin_map.get(fs_comp['plugin'])
-            if not plugin_id:
-                results['missing_in_airtable'][comp_type].append(fs_comp)
-                continue
-
-            found = False
-            for at_comp in at_components[comp_type]:
-                if (at_comp['name'] == fs_comp['name'] and
-                    plugin_id in at_comp.get('plugin_id', [])):
-                    found = True
-                    results['synced'][comp_type] += 1
-                    break
+            key = (comp_type, sync_key(fs_comp['plugin'], fs_comp['name']))
+            fs_keys.add(key)
+            record_id = at_index.get(key)
 
-            if not found:
+            plugin_id = plugin_map.get(fs_comp['plugin'])
+            if plugin_id:
+                key = (comp_type, airtable_name(comp_type, fs_comp), plugin_id)
+                fs_keys.add(key)
+                record_id = record_id or at_index.get(key)
+
+            if record_id:
+                results['synced'][comp_type] += 1
+                results['record_ids'][comp_type][(fs_comp['plugin'], fs_comp['name'])] = record_id
+            else:
                 results['missing_in_airtable'][comp_type].append(fs_comp)
 
         # Check for orphaned components
         for at_comp in at_components[comp_type]:
-            found = False
-            for fs_comp in fs_components[comp_type]:
-                plugin_id = plugin_map.get(fs_comp['plugin'])
-                if (at_comp['name'] == fs_comp['name'] and
-                    plugin_id in at_comp.get('plugin_id', [])):
-                    found = True
-                    break
-
+            found = (comp_type, at_comp.get('sync_key')) in fs_keys or any(
+                (comp_type, at_comp['name'], plugin_id) in fs_keys
+                for plugin_id in at_comp.get('plugin_id', [])
+            )
             if not found:
                 results['orphaned_in_airtable'][comp_type].append(at_comp)
 
@@ -296,27 +207,207 @@ def print_report(results):
 
     return False
 
-def auto_sync_missing(results, api):
-    """Auto-sync missing components to Airtable"""
+def plan_incremental_sync(fs_components, marketplace_names):
+    """Find components that changed or disappeared since they were last synced
+
+    Uses each marketplace's sync manifest. Returns (stale, removed) where stale
+    maps component types to filesystem components whose synced fields changed,
+    and removed is a list of (manifest, keys) for components deleted from disk.
+    """
+    stale = {'agents': [], 'commands': [], 'skills': [], 'hooks': []}
+    removed = []
+
+    for marketplace_name in marketplace_names:
+        manifest = SyncManifest(marketplace_name)
+        current = {}
+        by_key = {}
+        for comp_type, components in fs_components.items():
+            for comp in components:
+                if comp['marketplace'] != marketplace_name:
+                    continue
+                singular = comp_type.rstrip('s')
+                key = manifest_key(singular, comp['plugin'], comp['name'])
+                current[key] = component_hash(singular, comp['name'], comp['plugin'],
+                                              comp.get('frontmatter'), comp.get('event_type'))
+                by_key[key] = (comp_type, comp)
+
+        changed, _, removed_keys = manifest.plan(current)
+
+        # Components never synced through the manifest are judged by the
+        # Airtable comparison alone; only known entries can be stale
+        for key in changed:
+            if key in manifest.entries:
+                comp_type, comp = by_key[key]
+                stale[comp_type].append(comp)
+
+        if removed_keys:
+            removed.append((manifest, removed_keys))
+
+    return stale, removed
+
+def delete_removed(removed, api):
+    """Delete Airtable records of components removed since their last sync"""
+    for manifest, keys in removed:
+        print(f"🗑️  Deleting {len(keys)} removed component(s) from {manifest.marketplace_name}")
+        deleted = delete_removed_components(api, manifest, keys)
+        manifest.update(removed=deleted)
+        for key in deleted:
+            print(f"   🗑️  {key}")
+
+def plan_orphan_deletes(results, fs_components, plugin_map, marketplace_filter=False):
+    """Record IDs of orphans to delete, by component type
+
+    When only some marketplaces were scanned, records of plugins outside them
+    look orphaned too, so only plugins found on disk in the scanned
+    marketplaces are considered.
+    """
+    scope = None
+    if marketplace_filter:
+        scanned = {comp['plugin'] for components in fs_components.values() for comp in components}
+        scope = {plugin_map[name] for name in scanned if name in plugin_map}
+
+    plan = {}
+    for comp_type, orphans in results['orphaned_in_airtable'].items():
+        selected = [
+            orphan for orphan in orphans
+            if scope is None or any(plugin_id in scope for plugin_id in orphan.get('plugin_id', []))
+        ]
+        if selected:
+            plan[comp_type] = selected
+    return plan
+
+def unscanned_marketplaces(marketplaces):
+    """Marketplaces whose root is missing or holds no plugins
+
+    Every record of such a marketplace would look orphaned, so orphans are
+    never removed while one is configured.
+    """
+    return [name for name, root in marketplaces.items() if not list_plugins(name, root)]
+
+def fix_orphans(api, plan, marketplaces, dry_run=False):
+    """Delete orphaned records, concurrently across the component tables
+
+    Returns the number of records that could not be deleted.
+    """
+    print()
+    print("=" * 80)
+    print(f"🗑️  {'ORPHAN REMOVAL PLAN (dry run)' if dry_run else 'REMOVING ORPHANED RECORDS'}")
+    print("=" * 80)
+
+    total = sum(len(orphans) for orphans in plan.values())
+    for comp_type, orphans in plan.items():
+        requests = (len(orphans) + 9) // 10
+        print(f"   {comp_type}: {len(orphans)} record(s) in {requests} request(s)")
+    print(f"   Total: {total} record(s)")
+    print()
+
+    if dry_run or not total:
+        return 0
+
+    deleted = set()
+    failures = 0
+    with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+        futures = {
+            executor.submit(batch_delete, api, api.table(BASE_ID, AIRTABLE_TABLES[comp_type][0]),
+                            [orphan['id'] for orphan in orphans]): comp_type
+            for comp_type, orphans in plan.items()
+        }
+        for future in as_completed(futures):
+            comp_type = futures[future]
+            table_deleted, errors = future.result()
+            deleted.update(table_deleted)
+            for error in errors:
+                print(error)
+            failures += len(plan[comp_type]) - len(table_deleted)
+            print(f"🗑️  {comp_type}: deleted {len(table_deleted)} of {len(plan[comp_type])}")
+
+    # Forget deleted records in the sync manifests so they get recreated, not
+    # updated, if the component comes back
+    for marketplace_name in marketplaces:
+        manifest = SyncManifest(marketplace_name)
+        stale_keys = [key for key, entry in manifest.entries.items() if entry.get('record_id') in deleted]
+        if stale_keys:
+            manifest.update(removed=stale_keys)
+
+    return failures
+
+def auto_sync_missing(results, api, plugin_map, stale=None):
+    """Auto-sync missing (and changed) components to Airtable
+
+    Everything is sent from this process as batch upserts, concurrently across
+    tables. The plugin map and record IDs come from the fetch the validation
+    already made, so no lookups are repeated. Returns the number of failures.
+    """
     print()
     print("=" * 80)
     print("🔄 AUTO-SYNCING MISSING COMPONENTS")
     print("=" * 80)
     print()
 
+    to_sync = {}
     for comp_type, components in results['missing_in_airtable'].items():
+        to_sync[comp_type] = list(components)
+    for comp_type, components in (stale or {}).items():
+        missing = {(comp['plugin'], comp['name']) for comp in to_sync.get(comp_type, [])}
+        to_sync.setdefault(comp_type, []).extend(
+            comp for comp in components if (comp['plugin'], comp['name']) not in missing
+        )
+
+    manifests = {}
+    batch = []
+    for comp_type, components in to_sync.items():
+        singular = comp_type.rstrip('s')
         for comp in components:
-            if comp_type == 'agent':
-                cmd = f"python sync-component.py --type=agent --name={comp['name']} --plugin={comp['plugin']} --marketplace={comp['marketplace']}"
-            elif comp_type == 'command':
-                cmd = f"python sync-component.py --type=command --name={comp['name']} --plugin={comp['plugin']} --marketplace={comp['marketplace']}"
-            elif comp_type == 'skill':
-                cmd = f"python sync-component.py --type=skill --name={comp['name']} --plugin={comp['plugin']} --marketplace={comp['marketplace']}"
-            elif comp_type == 'hook':
-                cmd = f"python sync-component.py --type=hook --name={comp['name']} --plugin={comp['plugin']} --marketplace={comp['marketplace']} --event-type={comp['event_type']} --script-path={comp['script_path']}"
-
-            print(f"Syncing: {comp_type} {comp['plugin']}/{comp['name']}")
-            os.system(cmd)
+            manifest = manifests.setdefault(comp['marketplace'], SyncManifest(comp['marketplace']))
+            key = manifest_key(singular, comp['plugin'], comp['name'])
+            batch.append({
+                'type': singular,
+                'name': comp['name'],
+                'plugin': comp['plugin'],
+                'marketplace': comp['marketplace'],
+                'file_path': comp.get('path') or comp.get('script_path'),
+                'event_type': comp.get('event_type'),
+                'record_id': (results['record_ids'][comp_type].get((comp['plugin'], comp['name']))
+                              or manifest.record_id(key)),
+                'hash': component_hash(singular, comp['name'], comp['plugin'],
+                                       comp.get('frontmatter'), comp.get('event_type')),
+            })
+
+    if not batch:
+        return 0
+
+    # The diff already searched every record, so components without a known
+    # record ID have none and the Sync Key backfill lookup can be skipped
+    batch_results = batch_sync_components(
+        api, batch, plugin_record_ids=plugin_map, legacy_index=False, max_workers=len(AIRTABLE_TABLES),
+    )
+
+    failures = 0
+    synced = {}
+    for comp, (success, comp_type, name, message) in zip(batch, batch_results):
+        if not success:
+            failures += 1
+            print(f"❌ {comp_type}: {comp['plugin']}/{name}")
+            print(f"   Error: {message[:200]}")
+            continue
+        print(f"✅ {comp_type}: {comp['plugin']}/{name}")
+        synced.setdefault(comp['marketplace'], {})[manifest_key(comp_type, comp['plugin'], name)] = {
+            'type': comp_type,
+            'plugin': comp['plugin'],
+            'name': name,
+            'hash': comp['hash'],
+            'record_id': comp['record_id'],
+        }
+
+    for marketplace_name, entries in synced.items():
+        try:
+            manifests[marketplace_name].update(entries)
+        except OSError as e:
+            print(f"⚠️  Could not update sync manifest: {e}")
+
+    print()
+    print(f"📊 Auto-sync: {len(batch) - failures} synced, {failures} failed")
+    return failures
 
 def main():
     parser = argparse.ArgumentParser(description='Validate Airtable sync status')
@@ -326,16 +417,20 @@ def main():
                         help='Automatically sync missing components')
     parser.add_argument('--fix-orphans', action='store_true',
                         help='Remove orphaned Airtable records')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='With --fix-orphans, show what would be deleted without deleting')
+    parser.add_argument('--reconcile', action='store_true',
+                        help='Check now for records deleted in Airtable instead of waiting for the hourly reconcile')
 
     args = parser.parse_args()
 
     # Validate Airtable token
     if not AIRTABLE_TOKEN:
-        print("❌ ERROR: AIRTABLE_TOKEN or MCP_AIRTABLE_TOKEN environment variable not set")
+        print_missing_token()
         return 1
 
-    # Initialize Airtable API
-    api = Api(AIRTABLE_TOKEN)
+    # Initialize Airtable API (one pooled connection per concurrent table refresh)
+    api = make_api(AIRTABLE_TOKEN, pool_size=len(AIRTABLE_TABLES) + 1)
 
     # Determine marketplaces to scan
     if args.marketplace:
@@ -347,30 +442,56 @@ def main():
     else:
         marketplaces = MARKETPLACE_PATHS
 
-    # Scan filesystem
+    # Scan filesystem (every marketplace and plugin concurrently)
     print("🔍 Scanning filesystem...")
-    all_fs_components = {'agents': [], 'commands': [], 'skills': [], 'hooks': []}
-    for marketplace_name, marketplace_path in marketplaces.items():
+    for marketplace_name in marketplaces:
         print(f"   - {marketplace_name}")
-        fs_components = scan_filesystem_components(marketplace_name, marketplace_path)
-        for comp_type in all_fs_components:
-            all_fs_components[comp_type].extend(fs_components[comp_type])
+    all_fs_components = scan_marketplaces(marketplaces)
 
     # Fetch Airtable data
     print("📥 Fetching from Airtable...")
-    at_components = fetch_airtable_components(api)
+    # Deleting orphans from a mirror that still holds records deleted in
+    # Airtable would fail whole batches, so destructive runs reconcile first
+    reconcile = args.reconcile or (args.fix_orphans and not args.dry_run)
+    at_components, plugin_map, failed_tables = fetch_airtable_components(api, reconcile=reconcile)
 
     # Compare
     print("🔄 Comparing...")
-    results = compare_components(all_fs_components, at_components, api)
+    results = compare_components(all_fs_components, at_components, plugin_map)
 
     # Print report
     all_synced = print_report(results)
 
-    # Auto-sync if requested
-    if not all_synced and args.auto_sync:
-        auto_sync_missing(results, api)
-        print("\n✅ Auto-sync complete! Run validation again to verify.")
+    # A partial fetch would make components look missing or orphaned
+    if (args.auto_sync or args.fix_orphans) and failed_tables:
+        print(f"❌ Not changing Airtable: could not fetch {', '.join(failed_tables)}")
+        return 1
+    if args.auto_sync:
+        stale, removed = plan_incremental_sync(all_fs_components, marketplaces)
+        total_stale = sum(len(v) for v in stale.values())
+        if total_stale:
+            print(f"✏️  Changed since last sync: {total_stale} components")
+
+        if not all_synced or total_stale or removed:
+            failures = auto_sync_missing(results, api, plugin_map, stale)
+            if removed:
+                delete_removed(removed, api)
+            if failures:
+                print(f"\n⚠️  Auto-sync finished with {failures} failure(s). Run validation again to verify.")
+            else:
+                print("\n✅ Auto-sync complete! Run validation again to verify.")
+
+    if args.fix_orphans:
+        empty = unscanned_marketplaces(marketplaces)
+        if empty:
+            print(f"❌ Not removing orphans: no plugins found in {', '.join(empty)}")
+            for name in empty:
+                print(f"   {name}: {marketplaces[name]}")
+            return 1
+        plan = plan_orphan_deletes(results, all_fs_components, plugin_map,
+                                   marketplace_filter=bool(args.marketplace))
+        if fix_orphans(api, plan, marketplaces, dry_run=args.dry_run):
+            return 1
 
     return 0 if all_synced else 1
 
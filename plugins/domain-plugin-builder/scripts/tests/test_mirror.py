@@ -0,0 +1,77 @@
+"""The mirror keeps only the columns the syncs and diffs read
+
+Runs against airtable_sync.standin with the mirror pointed at a temporary
+directory.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airtable_sync.config import BASE_ID
+from airtable_sync.mirror import MIRROR_FIELDS, base_mirror
+from airtable_sync.standin import make_server
+
+try:
+    from pyairtable import Api
+except ImportError:
+    Api = None
+
+def quiet(*lines):
+    pass
+
+@unittest.skipIf(Api is None, "pyairtable is not installed")
+class MirrorFieldsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="dpb-test-")
+        self.saved = base_mirror.path
+        base_mirror.path = os.path.join(self.tmp, "mirror.sqlite")
+        base_mirror._conn = None
+        base_mirror._refreshed = {}
+
+        self.server = make_server(rate=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.api = Api("local", retry_strategy=None, endpoint_url=f"http://127.0.0.1:{self.server.server_port}")
+        self.plugin_id = self.api.table(BASE_ID, "Plugins").create({"Name": "p1", "Description": "x" * 5000})['id']
+        self.agents = self.api.table(BASE_ID, "Agents")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if base_mirror._conn is not None:
+            base_mirror._conn.close()
+        base_mirror.path = self.saved
+        base_mirror._conn = None
+        base_mirror._refreshed = {}
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def agent(self, name):
+        return {"Agent Name": name, "Plugin": [self.plugin_id], "Sync Key": f"agent:p1/{name}",
+                "Purpose": "y" * 5000}
+
+    def test_full_and_incremental_pulls_skip_unread_columns(self):
+        self.agents.create(self.agent("a1"))
+        base_mirror.refresh(self.api, ["Plugins", "Agents"], log=quiet)
+        self.agents.create(self.agent("a2"))
+        base_mirror._refreshed = {}
+        base_mirror.refresh(self.api, ["Plugins", "Agents"], log=quiet)
+
+        self.assertEqual([r['fields'] for r in base_mirror.records("Plugins")], [{"Name": "p1"}])
+        agents = base_mirror.records("Agents")
+        self.assertEqual([r['fields']['Agent Name'] for r in agents], ["a1", "a2"])
+        for record in agents:
+            self.assertLessEqual(set(record['fields']), set(MIRROR_FIELDS["Agents"]))
+            self.assertEqual(record['fields']['Plugin'], [self.plugin_id])
+
+    def test_written_through_records_are_projected(self):
+        base_mirror.refresh(self.api, ["Agents"], log=quiet)
+        base_mirror.put("Agents", [self.agents.create(self.agent("a1"))])
+        self.assertNotIn("Purpose", base_mirror.find("Agents", "a1")[0]['fields'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Retries after a plugin record was deleted must not link it again
+
+Runs against airtable_sync.standin with the plugin-ID cache and the mirror
+pointed at a temporary directory.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airtable_sync.batch import batch_sync_components
+from airtable_sync.components import sync_component
+from airtable_sync.config import BASE_ID
+from airtable_sync.mirror import base_mirror
+from airtable_sync.plugin_cache import plugin_ids
+from airtable_sync.standin import make_server
+
+try:
+    from pyairtable import Api
+except ImportError:
+    Api = None
+
+AGENT = """---
+name: helper
+description: Use this agent to help
+---
+
+You are the helper agent.
+"""
+
+def quiet(*lines):
+    pass
+
+@unittest.skipIf(Api is None, "pyairtable is not installed")
+class StalePluginRecordTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="dpb-test-")
+        self.saved = (plugin_ids.path, base_mirror.path)
+        plugin_ids.path = os.path.join(self.tmp, "plugin-record-ids.json")
+        plugin_ids._entries = None
+        base_mirror.path = os.path.join(self.tmp, "mirror.sqlite")
+        base_mirror._conn = None
+        base_mirror._refreshed = {}
+
+        self.server = make_server(rate=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.api = Api("local", retry_strategy=None, endpoint_url=f"http://127.0.0.1:{self.server.server_port}")
+
+        agents_dir = os.path.join(self.tmp, "plugins", "p1", "agents")
+        os.makedirs(agents_dir)
+        self.agent_path = os.path.join(agents_dir, "helper.md")
+        with open(self.agent_path, 'w', encoding='utf-8') as f:
+            f.write(AGENT)
+
+        # The plugin is cached and mirrored, then deleted in Airtable behind
+        # the mirror's back: the mirror still holds the dead row
+        self.stale_id = self.api.table(BASE_ID, "Plugins").create({"Name": "p1"})['id']
+        base_mirror.refresh(self.api, ["Plugins"], log=quiet)
+        plugin_ids.put(BASE_ID, "p1", self.stale_id)
+        self.server.standin.store.delete(BASE_ID, "Plugins", self.stale_id)
+        self.assertEqual([r['id'] for r in base_mirror.find("Plugins", "p1")], [self.stale_id])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if base_mirror._conn is not None:
+            base_mirror._conn.close()
+        plugin_ids.path, base_mirror.path = self.saved
+        plugin_ids._entries = None
+        base_mirror._conn = None
+        base_mirror._refreshed = {}
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def plugin_links(self):
+        return [record['fields'].get('Plugin') for record in self.api.table(BASE_ID, "Agents").all()]
+
+    def assert_relinked(self):
+        fresh_id = plugin_ids.get(BASE_ID, "p1")
+        self.assertNotEqual(fresh_id, self.stale_id)
+        self.assertEqual(self.plugin_links(), [[fresh_id]])
+        self.assertNotIn(self.stale_id, [r['id'] for r in base_mirror.find("Plugins", "p1")])
+
+    def test_single_sync_retry_gets_a_fresh_plugin_id(self):
+        record_id = sync_component(self.api, 'agent', 'helper', 'p1', 'm', self.agent_path, log=quiet)
+        self.assertTrue(record_id)
+        self.assert_relinked()
+
+    def test_batch_retry_gets_a_fresh_plugin_id(self):
+        results = batch_sync_components(self.api, [{
+            'type': 'agent',
+            'name': 'helper',
+            'plugin': 'p1',
+            'marketplace': 'm',
+            'file_path': self.agent_path,
+            'event_type': None,
+        }], log=quiet)
+        self.assertTrue(results[0][0], results[0][3])
+        self.assert_relinked()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+"""classify_path(): which marketplace paths the watch daemon re-syncs"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airtable_sync.watcher import classify_path
+
+class ClassifyPathTest(unittest.TestCase):
+    def test_component_files(self):
+        self.assertEqual(classify_path('/m', '/m/plugins/foo/agents/a.md'), ('component', 'agent', 'foo', 'a'))
+        self.assertEqual(classify_path('/m', '/m/plugins/foo/commands/c.md'), ('component', 'command', 'foo', 'c'))
+        self.assertEqual(classify_path('/m', '/m/plugins/foo/hooks/h.sh'), ('component', 'hook', 'foo', 'h'))
+        self.assertEqual(classify_path('/m', '/m/plugins/foo/skills/s/SKILL.md'), ('component', 'skill', 'foo', 's'))
+
+    def test_plugin_and_component_directories(self):
+        self.assertEqual(classify_path('/m', '/m/plugins/foo'), ('plugin', 'foo'))
+        self.assertEqual(classify_path('/m', '/m/plugins/foo/agents'), ('plugin', 'foo'))
+
+    def test_plugin_root_files_are_ignored(self):
+        self.assertIsNone(classify_path('/m', '/m/plugins/foo/README.md'))
+        self.assertIsNone(classify_path('/m', '/m/plugins/foo/.claude-plugin'))
+
+    def test_other_files_are_ignored(self):
+        self.assertIsNone(classify_path('/m', '/m/README.md'))
+        self.assertIsNone(classify_path('/m', '/m/plugins/foo/agents/notes.txt'))
+        self.assertIsNone(classify_path('/m', '/m/plugins/foo/skills/s/scripts/run.sh'))
+
+if __name__ == '__main__':
+    unittest.main()
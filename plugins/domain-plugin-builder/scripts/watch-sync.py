@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Watch marketplaces and sync components to Airtable as their files change
+
+Usage:
+    python watch-sync.py                                   # All marketplaces in MARKETPLACE_PATHS
+    python watch-sync.py --marketplace=ai-dev-marketplace --debounce=5
+    python watch-sync.py --catch-up                        # Also sync edits made while not running
+    python watch-sync.py --status                          # Print the running daemon's status
+
+Edits under agents/, commands/, skills/*/SKILL.md and hooks/ are collected
+until they have been quiet for --debounce seconds (or the oldest has waited
+--max-delay seconds), then the affected components are upserted in batches
+(needs the "Sync Key" field, like bulk-sync-airtable.py --batch) and deleted
+components are removed. Saves that don't change any synced field make no
+requests. Queue depth and lag are written to a status file.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+from datetime import datetime
+
+from airtable_sync.components import make_api
+from airtable_sync.config import AIRTABLE_TOKEN, print_missing_token
+from airtable_sync.manifest import SyncManifest
+from airtable_sync.marketplaces import MARKETPLACE_PATHS
+from airtable_sync.watcher import (
+    OVERFLOW,
+    STATUS_PATH,
+    DebounceQueue,
+    classify_path,
+    make_watcher,
+    sync_changes,
+    write_status,
+)
+
+# Rewrite the status file at least this often so lag stays current
+STATUS_INTERVAL = 1.0
+
+def log(message):
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}", flush=True)
+
+def print_status(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        print(f"❌ No watch status at {path} - is watch-sync.py running?")
+        return 1
+
+    age = time.time() - status.get('updated_at', 0)
+    print("=" * 80)
+    print("👀 AIRTABLE WATCH STATUS")
+    print("=" * 80)
+    print(f"   PID: {status['pid']} ({'stale - not updated for %ds' % age if age > 10 else 'running'})")
+    print(f"   Backend: {status['backend']}")
+    print(f"   Marketplaces: {', '.join(status['marketplaces'])}")
+    print(f"   Queue depth: {status['queue_depth']}")
+    print(f"   Lag: {status['lag_seconds']:.1f}s")
+    since = status.get('seconds_since_last_sync')
+    print(f"   Last sync: {'never' if since is None else f'{since:.0f}s ago'}")
+    totals = status['totals']
+    print(f"   Totals: {totals['synced']} synced, {totals['deleted']} deleted, "
+          f"{totals['failed']} failed, {totals['unchanged']} unchanged")
+    print("=" * 80)
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch marketplaces and sync changed components to Airtable')
+    parser.add_argument('--marketplace', action='append',
+                        help='Marketplace to watch (repeatable). Default: all that exist')
+    parser.add_argument('--debounce', type=float, default=2.0,
+                        help='Seconds without edits before syncing (default: 2)')
+    parser.add_argument('--max-delay', type=float, default=30.0,
+                        help='Longest a change may wait during continuous edits (default: 30)')
+    parser.add_argument('--catch-up', action='store_true',
+                        help='Queue every plugin on start to sync edits made while not running')
+    parser.add_argument('--poll', action='store_true',
+                        help='Poll for changes instead of using inotify')
+    parser.add_argument('--poll-interval', type=float, default=2.0,
+                        help='Seconds between scans in --poll mode (default: 2)')
+    parser.add_argument('--status-file', default=STATUS_PATH,
+                        help=f'Where to write the status (default: {STATUS_PATH})')
+    parser.add_argument('--status', action='store_true',
+                        help='Print the status of a running watcher and exit')
+
+    args = parser.parse_args()
+
+    if args.status:
+        return print_status(args.status_file)
+
+    if not AIRTABLE_TOKEN:
+        print_missing_token()
+        return 1
+
+    names = args.marketplace or list(MARKETPLACE_PATHS)
+    unknown = [name for name in names if name not in MARKETPLACE_PATHS]
+    if unknown:
+        print(f"❌ ERROR: Unknown marketplace: {', '.join(unknown)}")
+        print(f"   Valid marketplaces: {list(MARKETPLACE_PATHS.keys())}")
+        return 1
+    marketplaces = {name: MARKETPLACE_PATHS[name] for name in names if os.path.isdir(MARKETPLACE_PATHS[name])}
+    if not marketplaces:
+        print("❌ ERROR: None of the marketplaces exist on disk")
+        return 1
+
+    watcher = make_watcher(list(marketplaces.values()), poll=args.poll, interval=args.poll_interval)
+    api = make_api(AIRTABLE_TOKEN, pool_size=1)
+    queue = DebounceQueue(args.debounce, args.max_delay)
+
+    print("=" * 80)
+    print("👀 AIRTABLE WATCH SYNC")
+    print("=" * 80)
+    for name, root in marketplaces.items():
+        print(f"   {name}: {root}")
+    print(f"   Backend: {watcher.name}")
+    print(f"   Debounce: {args.debounce:g}s (max delay {args.max_delay:g}s)")
+    print(f"   Status: {args.status_file}")
+    print("=" * 80, flush=True)
+
+    def queue_all_plugins():
+        now = time.time()
+        for name, root in marketplaces.items():
+            plugins_dir = os.path.join(root, 'plugins')
+            plugins = set(os.listdir(plugins_dir)) if os.path.isdir(plugins_dir) else set()
+            # Plugins that only exist in the manifest were deleted
+            plugins.update(entry.get('plugin') for entry in SyncManifest(name).entries.values())
+            for plugin in plugins:
+                if plugin and not plugin.startswith('.'):
+                    queue.add((name, ('plugin', plugin)), now)
+
+    if args.catch_up:
+        queue_all_plugins()
+
+    stop = []
+    signal.signal(signal.SIGTERM, lambda *_: stop.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stop.append(True))
+
+    started_at = time.time()
+    last_sync_at = None
+    last_status_at = 0.0
+    totals = {'synced': 0, 'failed': 0, 'deleted': 0, 'unchanged': 0}
+
+    def status_snapshot():
+        now = time.time()
+        return {
+            'pid': os.getpid(),
+            'backend': watcher.name,
+            'marketplaces': list(marketplaces),
+            'started_at': started_at,
+            'updated_at': now,
+            'queue_depth': len(queue),
+            'lag_seconds': round(queue.lag(now), 3),
+            'last_sync_at': last_sync_at,
+            'seconds_since_last_sync': round(now - last_sync_at, 3) if last_sync_at else None,
+            'totals': totals,
+        }
+
+    try:
+        while not stop:
+            wait = queue.time_until_ready()
+            timeout = STATUS_INTERVAL if wait is None else min(wait, STATUS_INTERVAL)
+
+            for path in watcher.poll(timeout):
+                if path is OVERFLOW:
+                    log("⚠️  Missed file events - rescanning every plugin")
+                    queue_all_plugins()
+                    continue
+                for name, root in marketplaces.items():
+                    if not path.startswith(root.rstrip(os.sep) + os.sep):
+                        continue
+                    change = classify_path(root, path)
+                    if change:
+                        queue.add((name, change))
+                        if os.path.isdir(path):
+                            watcher.watch_new_dir(root, path)
+                    break
+
+            if queue.time_until_ready() == 0 or (stop and len(queue)):
+                by_marketplace = {}
+                for name, change in queue.drain():
+                    by_marketplace.setdefault(name, []).append(change)
+
+                for name, changes in by_marketplace.items():
+                    started = time.time()
+                    try:
+                        counts, retry = sync_changes(api, name, marketplaces[name], changes, log=log)
+                    except Exception as e:
+                        log(f"❌ Sync of {name} failed: {e}")
+                        # Try again after the next quiet period
+                        for change in changes:
+                            queue.add((name, change))
+                        continue
+                    if retry:
+                        log(f"🔁 {name}: retrying {len(retry)} failed component(s) after the next quiet period")
+                        for change in retry:
+                            queue.add((name, change))
+                    for key, value in counts.items():
+                        totals[key] += value
+                    if counts['synced'] or counts['deleted'] or counts['failed']:
+                        log(f"📊 {name}: {counts['synced']} synced, {counts['deleted']} deleted, "
+                            f"{counts['failed']} failed, {counts['unchanged']} unchanged "
+                            f"({time.time() - started:.1f}s)")
+                    last_sync_at = time.time()
+
+            if time.time() - last_status_at >= STATUS_INTERVAL:
+                write_status(status_snapshot(), args.status_file)
+                last_status_at = time.time()
+    finally:
+        watcher.close()
+        write_status(dict(status_snapshot(), stopped=True), args.status_file)
+
+    log("👋 Stopped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
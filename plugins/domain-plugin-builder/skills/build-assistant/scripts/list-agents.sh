@@ -7,6 +7,9 @@
 MARKETPLACE_DIR="${1:-$(pwd)}"
 GLOBAL_AGENTS_DIR="$HOME/.claude/agents"
 
+# Reads plugin agents through the shared frontmatter cache when Python is available
+LIST_COMPONENTS="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../../scripts" 2>/dev/null && pwd)/list-components.py"
+
 echo "=== Available Agents ==="
 echo ""
 
@@ -22,6 +25,14 @@ extract_agent_info() {
     local name=$(grep -m1 "^name:" "$file" | cut -d: -f2- | sed 's/^[[:space:]]*//' | sed 's/[[:space:]]*$//')
     local desc=$(grep -m1 "^description:" "$file" | cut -d: -f2- | sed 's/^[[:space:]]*//' | sed 's/[[:space:]]*$//')
 
+    print_agent_info "$name" "$desc" "$location"
+}
+
+print_agent_info() {
+    local name="$1"
+    local desc="$2"
+    local location="$3"
+
     if [ -n "$name" ]; then
         echo "  - $name"
         [ -n "$desc" ] && echo "    $desc"
@@ -33,10 +44,16 @@ extract_agent_info() {
 
 # Find all plugin agents
 echo "Plugin Agents:"
-while IFS= read -r agent_file; do
-    plugin_name=$(echo "$agent_file" | sed -E 's|.*/plugins/([^/]+)/agents/.*|\1|')
-    extract_agent_info "$agent_file" "$plugin_name plugin"
-done < <(find "$MARKETPLACE_DIR/plugins" -type f -path "*/agents/*.md" 2>/dev/null | sort)
+if command -v python3 >/dev/null 2>&1 && [ -f "$LIST_COMPONENTS" ]; then
+    while IFS=$'\t' read -r plugin_name name desc; do
+        print_agent_info "$name" "$desc" "$plugin_name plugin"
+    done < <(python3 "$LIST_COMPONENTS" --marketplace-dir="$MARKETPLACE_DIR" --type=agents --format=tsv 2>/dev/null)
+else
+    while IFS= read -r agent_file; do
+        plugin_name=$(echo "$agent_file" | sed -E 's|.*/plugins/([^/]+)/agents/.*|\1|')
+        extract_agent_info "$agent_file" "$plugin_name plugin"
+    done < <(find "$MARKETPLACE_DIR/plugins" -type f -path "*/agents/*.md" 2>/dev/null | sort)
+fi
 
 # Find global agents
 if [ -d "$GLOBAL_AGENTS_DIR" ]; then
@@ -41,10 +41,26 @@ for plugin in $PLUGINS; do
     fi
 done
 
+# Commands, agents and skills of every plugin in one process; unchanged
+# components come from the validation cache, so this is near-free on reruns.
+# Informational only, like the plugin checks above: failing components are
+# reported but don't stop the settings and marketplace sync below
+if COMPONENTS_OUTPUT=$(python3 "$SCRIPT_DIR/validate_components.py" marketplace .); then
+    COMPONENTS_VALID=true
+else
+    COMPONENTS_VALID=false
+fi
+COMPONENTS_SUMMARY=$(echo "$COMPONENTS_OUTPUT" | tail -n 1)
+
 echo ""
 echo "  Plugins found: $PLUGIN_COUNT"
 echo "  Valid: $VALID_COUNT"
 echo "  Invalid: $INVALID_COUNT"
+echo "  Components: $COMPONENTS_SUMMARY"
+if ! $COMPONENTS_VALID; then
+    echo "  ⚠️  Component failures don't block the sync; see details with:"
+    echo "     python3 $SCRIPT_DIR/validate_components.py marketplace ."
+fi
 echo ""
 
 # Step 2: Sync all commands to settings.local.json
@@ -97,6 +113,7 @@ echo "========================================="
 echo ""
 echo "Summary:"
 echo "  - Plugins validated: $VALID_COUNT/$PLUGIN_COUNT"
+echo "  - Components: $COMPONENTS_SUMMARY"
 echo "  - Commands registered: $SETTINGS_PERMISSIONS"
 echo "  - Marketplace entries: $MARKETPLACE_PLUGINS"
 echo ""
@@ -0,0 +1,685 @@
+#!/usr/bin/env python3
+"""
+Validate agents, commands and skills against the framework standards
+
+validate-agent.sh, validate-command.sh and validate-skill.sh ran grep once per
+rule (every required field, MCP name and section) and were started once per
+file. This engine holds the same rules: each file is read once, every check
+runs over the text in memory with patterns compiled at import, and a whole
+plugin or marketplace is validated in one process. The bash scripts are thin
+wrappers around it.
+
+Usage:
+    python3 validate_components.py agent agents/my-agent.md        # Same report as validate-agent.sh
+    python3 validate_components.py command commands/my-command.md
+    python3 validate_components.py skill skills/my-skill
+    python3 validate_components.py plugin plugins/my-plugin        # Every agent, command and skill
+    python3 validate_components.py marketplace .                   # Every plugin under plugins/
+    python3 validate_components.py plugin plugins/my-plugin --json # Structured results
+
+Exits 0 when everything passed, 1 otherwise. Other scripts can import it:
+validate_component(component_type, path) returns a Result.
+
+Results are cached in ~/.cache/domain-plugin-builder/validation.sqlite (or
+$DPB_CACHE_DIR) keyed by a hash of what the rules look at (the file, or a
+skill's SKILL.md and supporting file names) and RULES_VERSION, a hash of this
+file. Unchanged components are answered without running a rule, and editing
+the rules invalidates every cached result. --no-cache skips the cache.
+"""
+
+import os
+import re
+import sys
+import atexit
+import json
+import sqlite3
+import hashlib
+import argparse
+import threading
+
+CACHE_DIR = os.path.expanduser(os.getenv("DPB_CACHE_DIR", "~/.cache/domain-plugin-builder"))
+CACHE_PATH = os.path.join(CACHE_DIR, "validation.sqlite")
+
+# Agents
+AGENT_REQUIRED_FIELDS = ["name:", "description:", "model:"]
+INVALID_MCP_NAMES = ["mcp__supabase", "mcp__shadcn", "mcp__nextjs", "mcp__vercel-ai"]
+
+# Commands: target 120-150 lines, allowing 15% overage
+COMMAND_REQUIRED_FIELDS = ["allowed-tools:", "description:"]
+COMMAND_TARGET_MAX = 150
+COMMAND_TOLERANCE_MAX = 172
+COMMAND_MIN_LINES = 50
+
+# Skills: minimum supporting files
+SKILL_REQUIRED_FIELDS = ["name:", "description:"]
+MIN_SCRIPTS = 3
+MIN_TEMPLATES = 4
+MIN_EXAMPLES = 3
+
+# Supporting directories a skill's result depends on
+SKILL_DIRS = ['scripts', 'templates', 'examples']
+
+FRONTMATTER_DELIMITER = re.compile(r'^---$', re.M)
+FIELD_PATTERNS = {
+    field: re.compile('^' + re.escape(field), re.M)
+    for field in AGENT_REQUIRED_FIELDS + COMMAND_REQUIRED_FIELDS + SKILL_REQUIRED_FIELDS + ["tools:"]
+}
+
+POSITIONAL_ARGUMENT = re.compile(r'\$[0-9]')
+NATURAL_LANGUAGE_INVOCATION = re.compile(r'(Invoke the|Launch.*agent|Run.*agent)', re.I)
+PARALLEL_PATTERN = re.compile(r'(in parallel|simultaneously|all at once)', re.I)
+ONE_MESSAGE = re.compile(r'SAME.*message|single.*message|ONE message')
+TASK_ALLOWED_TOOLS = re.compile(r'allowed-tools:.*Task\(\*\)')
+FILE_LOADING = re.compile(r'@/|@[a-zA-Z]')
+
+SCRIPT_REFERENCE = re.compile(r'scripts/[a-zA-Z0-9_-]+\.sh')
+TEMPLATE_REFERENCE = re.compile(r'templates/[a-zA-Z0-9_/.-]+\.(?:tsx|ts|py|js)')
+EXAMPLE_REFERENCE = re.compile(r'examples/[a-zA-Z0-9_-]+\.md')
+
+def rules_version():
+    """Hash of this file: any change to the rules changes it"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+RULES_VERSION = rules_version()
+
+# First report lines, the only ones that depend on the path rather than the content
+REPORT_HEADERS = {
+    'agent': ["[INFO] Validating agent file: {path}"],
+    'command': ["[INFO] Validating command file: {path}", ""],
+    'skill': ["[INFO] Validating skill directory: {path}", ""],
+}
+
+class Result:
+    """Outcome of validating one component
+
+    report holds the lines the bash validators printed, in order; errors and
+    warnings hold the same messages without their prefix. cached is True for
+    results answered from the validation cache.
+    """
+
+    def __init__(self, component_type, path):
+        self.type = component_type
+        self.path = path
+        self.name = os.path.basename(os.path.normpath(path))
+        if component_type != 'skill' and self.name.endswith('.md'):
+            self.name = self.name[:-3]
+        self.report = [line.format(path=path) for line in REPORT_HEADERS[component_type]]
+        self.errors = []
+        self.warnings = []
+        self.cached = False
+
+    @property
+    def valid(self):
+        return not self.errors
+
+    def info(self, *lines):
+        self.report.extend(lines)
+
+    def error(self, message, *details, indent=''):
+        self.report.append(f"{indent}❌ ERROR: {message}")
+        self.report.extend(details)
+        self.errors.append(message)
+
+    def warning(self, message, *details, indent=''):
+        self.report.append(f"{indent}⚠️  WARNING: {message}")
+        self.report.extend(details)
+        self.warnings.append(message)
+
+    def to_dict(self):
+        return {
+            'type': self.type,
+            'name': self.name,
+            'path': self.path,
+            'valid': self.valid,
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'cached': self.cached,
+        }
+
+    def cache_data(self):
+        """What the cache stores: everything but the path-dependent header"""
+        return {
+            'report': self.report[len(REPORT_HEADERS[self.type]):],
+            'errors': self.errors,
+            'warnings': self.warnings,
+        }
+
+    @classmethod
+    def from_cache(cls, component_type, path, data):
+        result = cls(component_type, path)
+        result.report.extend(data['report'])
+        result.errors = data['errors']
+        result.warnings = data['warnings']
+        result.cached = True
+        return result
+
+def read_text(path):
+    """The file as text, line endings untouched so the rules see what grep saw"""
+    with open(path, encoding='utf-8', errors='replace', newline='') as f:
+        return f.read()
+
+def has_field(content, field):
+    return FIELD_PATTERNS[field].search(content) is not None
+
+def files_under(directory, suffixes=None):
+    """Regular files below directory (relative paths), optionally by suffix
+
+    File types come from the directory entries, like find -type f, without a
+    stat() per file.
+    """
+    found = []
+
+    def walk(path, prefix):
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        walk(entry.path, prefix + entry.name + '/')
+                    elif entry.is_file(follow_symlinks=False) and (not suffixes or entry.name.endswith(suffixes)):
+                        found.append(prefix + entry.name)
+        except OSError:
+            pass
+
+    walk(directory, '')
+    return sorted(found)
+
+def validate_agent(path):
+    result = Result('agent', path)
+
+    if not os.path.isfile(path):
+        result.error(f"File not found: {path}")
+        return result
+    content = read_text(path)
+
+    if not FRONTMATTER_DELIMITER.search(content):
+        result.error("Missing frontmatter")
+        return result
+
+    for field in AGENT_REQUIRED_FIELDS:
+        if not has_field(content, field):
+            result.error(f"Missing required field: {field}")
+            return result
+
+    if has_field(content, "tools:"):
+        result.warning("tools field found - agents should inherit tools from parent, not specify them")
+
+    # Common mistake: mcp__supabase instead of mcp__plugin_supabase_supabase
+    for invalid_name in INVALID_MCP_NAMES:
+        if f"`{invalid_name}`" in content:
+            result.error(
+                f"Found {invalid_name} - plugin-specific MCP servers must use full name:",
+                "   - Use: mcp__plugin_supabase_supabase (not mcp__supabase)",
+                "   - Use: mcp__plugin_*_shadcn (not mcp__shadcn)",
+                "   Generic MCP servers are fine: mcp__github, mcp__filesystem, mcp__docker, mcp__fetch, etc.",
+            )
+            return result
+
+    # Step 0 and Success Criteria are only required for validator agents
+    if "### Step 0: Load Required Context" not in content:
+        result.warning("Missing Step 0: Load Required Context section (only required for validator agents)")
+    if 'Read("' not in content:
+        result.warning("No Read() calls found - agent may not load context")
+    if "## Success Criteria" not in content:
+        result.warning("Missing Success Criteria section (only required for validator agents)")
+
+    result.info("✅ Agent validation passed")
+    return result
+
+def validate_command(path):
+    result = Result('command', path)
+
+    if not os.path.isfile(path):
+        result.error(f"File not found: {path}")
+        return result
+    content = read_text(path)
+
+    if not FRONTMATTER_DELIMITER.search(content):
+        result.error("Missing frontmatter")
+
+    for field in COMMAND_REQUIRED_FIELDS:
+        if not has_field(content, field):
+            result.error(f"Missing required field: {field}")
+
+    # Counted like wc -l: newline characters
+    line_count = content.count('\n')
+    if line_count > COMMAND_TOLERANCE_MAX:
+        result.error(f"Command file is {line_count} lines (max: {COMMAND_TOLERANCE_MAX} with 15% tolerance)")
+    elif line_count > COMMAND_TARGET_MAX:
+        result.warning(f"Command file is {line_count} lines "
+                       f"(target: {COMMAND_TARGET_MAX}, +{line_count - COMMAND_TARGET_MAX} over)")
+    elif line_count < COMMAND_MIN_LINES:
+        result.warning(f"Command file is {line_count} lines (might be too short)")
+
+    # $ARGUMENTS, not $1, $2, $3
+    if POSITIONAL_ARGUMENT.search(content):
+        result.error("Found $1/$2/$3 - use $ARGUMENTS instead")
+
+    if '$ARGUMENTS' in content or 'DOLLAR_ARGUMENTS' in content:
+        result.info("✅ Uses $ARGUMENTS correctly")
+    else:
+        result.warning("No $ARGUMENTS found")
+
+    uses_natural_language = NATURAL_LANGUAGE_INVOCATION.search(content) is not None
+    uses_explicit_task = "subagent_type=" in content
+    uses_parallel_pattern = PARALLEL_PATTERN.search(content) is not None
+
+    if uses_natural_language or uses_explicit_task:
+        if uses_natural_language:
+            result.info("✅ Uses agent invocation (natural language)")
+        if uses_explicit_task:
+            result.info("✅ Uses explicit Task tool with subagent_type")
+
+        if uses_parallel_pattern:
+            result.info("✅ Uses parallel execution pattern")
+            if "Task tool" in content and ONE_MESSAGE.search(content):
+                result.info("✅ Properly explains parallel Task tool execution (multiple calls in ONE message)")
+            elif uses_explicit_task:
+                result.info("✅ Uses explicit Task tool (parallel execution implied)")
+            else:
+                result.warning("Parallel pattern found but no Task tool explanation",
+                               "    Consider adding explicit Task tool syntax for clarity")
+    else:
+        result.warning("No agent invocation found - might be Pattern 1 (simple command)")
+
+    # Backticks in examples cause parsing issues
+    backticks = content.count('`')
+    if backticks:
+        result.warning(f"Found {backticks} backticks - may cause parsing issues")
+
+    # Code belongs in scripts, not slash commands
+    if '```' in content:
+        result.error("Found code blocks (triple backticks) - move code to scripts")
+
+    if TASK_ALLOWED_TOOLS.search(content):
+        result.info("✅ Proper allowed-tools format found")
+    else:
+        result.warning("allowed-tools may not be properly formatted")
+
+    if '!{' in content:
+        result.info("✅ Uses bash execution pattern !{command}")
+    if FILE_LOADING.search(content):
+        result.info("✅ Uses file loading pattern @filename")
+
+    result.info("", "✅ Command validation passed" if result.valid else "❌ Command validation failed")
+    return result
+
+def check_minimum(result, label, directory, files, minimum, advice):
+    """Report one supporting directory against its minimum file count"""
+    result.info(f"📂 {label.capitalize()} found: {len(files)}")
+    if len(files) >= minimum:
+        result.info(f"   ✅ Meets minimum requirement (>= {minimum} {label})")
+    else:
+        result.error(f"Below minimum requirement (need {minimum}, found {len(files)})",
+                     f"      {advice}", indent="   ")
+
+def validate_skill(path):
+    result = Result('skill', path)
+
+    if not os.path.isdir(path):
+        result.error(f"Directory not found: {path}")
+        return result
+    skill_md = os.path.join(path, 'SKILL.md')
+    if not os.path.isfile(skill_md):
+        result.error("Missing SKILL.md file")
+        return result
+    content = read_text(skill_md)
+
+    first_line = content.split('\n', 1)[0]
+    if first_line != '---':
+        result.error(
+            "YAML frontmatter MUST start at line 1",
+            f"   Found: {first_line}",
+            "   Expected: ---",
+            "   CRITICAL: Nothing can come before the opening --- (no titles, no comments, no blank lines)",
+        )
+        return result
+
+    if not FRONTMATTER_DELIMITER.search(content):
+        result.error("Missing closing frontmatter delimiter in SKILL.md")
+        return result
+
+    for field in SKILL_REQUIRED_FIELDS:
+        if not has_field(content, field):
+            result.error(f"Missing required field: {field}")
+            return result
+
+    if "Use when" not in content:
+        result.warning("Description should include 'Use when' trigger context")
+
+    result.info("", "[INFO] Checking minimum requirements (scripts, templates, examples)...", "")
+
+    scripts_dir = os.path.join(path, 'scripts')
+    scripts = files_under(scripts_dir, '.sh') if os.path.isdir(scripts_dir) else None
+    if scripts is None:
+        result.info("📂 Scripts: directory not found")
+        result.error("Missing scripts/ directory", indent="   ")
+    else:
+        check_minimum(result, 'scripts', scripts_dir, scripts, MIN_SCRIPTS,
+                      "Each skill should have 3-5 helper scripts (setup, validate, generate, etc.)")
+        if scripts:
+            result.info("   Scripts:", *(f"     - {os.path.basename(script)}" for script in scripts))
+    result.info("")
+
+    templates_dir = os.path.join(path, 'templates')
+    templates = files_under(templates_dir) if os.path.isdir(templates_dir) else None
+    if templates is None:
+        result.info("📂 Templates: directory not found")
+        result.error("Missing templates/ directory", indent="   ")
+    else:
+        check_minimum(result, 'templates', templates_dir, templates, MIN_TEMPLATES,
+                      "Each skill should have 4-6 templates (basic, advanced, TS, Python, etc.)")
+        ts_count = sum(1 for template in templates if template.endswith(('.ts', '.tsx')))
+        py_count = sum(1 for template in templates if template.endswith('.py'))
+        if ts_count and py_count:
+            result.info(f"   ✅ Has both TypeScript ({ts_count}) and Python ({py_count}) templates")
+        elif ts_count:
+            result.warning("Has TypeScript templates but no Python templates", indent="   ")
+        elif py_count:
+            result.warning("Has Python templates but no TypeScript templates", indent="   ")
+        if templates:
+            result.info("   Templates:", *(f"     - {template}" for template in templates))
+    result.info("")
+
+    examples_dir = os.path.join(path, 'examples')
+    examples = files_under(examples_dir, '.md') if os.path.isdir(examples_dir) else None
+    if examples is None:
+        result.info("📂 Examples: directory not found")
+        result.error("Missing examples/ directory", indent="   ")
+    else:
+        check_minimum(result, 'examples', examples_dir, examples, MIN_EXAMPLES,
+                      "Each skill should have 3-5 examples (basic, advanced, patterns, edge-cases, integration)")
+        if examples:
+            result.info("   Examples:", *(f"     - {os.path.basename(example)}" for example in examples))
+    result.info("")
+
+    # Cross-reference: SKILL.md references should match the actual files
+    result.info("[INFO] Checking SKILL.md references match actual files...", "")
+    references = {
+        'scripts': (len(set(SCRIPT_REFERENCE.findall(content))), scripts, 'Script'),
+        'templates': (len(set(TEMPLATE_REFERENCE.findall(content))), templates, 'Template'),
+        'examples': (len(set(EXAMPLE_REFERENCE.findall(content))), examples, 'Example'),
+    }
+    result.info(
+        "📝 SKILL.md references:",
+        *(f"   {label.capitalize()} referenced: {count}" for label, (count, _, _) in references.items()),
+        "",
+    )
+    for count, files, noun in references.values():
+        if files is None:
+            continue
+        if count == len(files):
+            result.info(f"   ✅ {noun} references match actual files ({count} = {len(files)})")
+        else:
+            result.warning(f"{noun} count mismatch (referenced: {count}, actual: {len(files)})", indent="   ")
+    result.info("")
+
+    if result.valid:
+        result.info("✅ Skill validation passed - all minimum requirements met!")
+    else:
+        result.info("❌ Skill validation failed - does not meet minimum requirements")
+    return result
+
+VALIDATORS = {
+    'agent': validate_agent,
+    'command': validate_command,
+    'skill': validate_skill,
+}
+
+def content_key(component_type, path):
+    """Hash of everything the rules read for a component, or None if it can't be read
+
+    Agents and commands depend on their file alone; skills on SKILL.md and
+    the names of the files in their supporting directories.
+    """
+    digest = hashlib.sha256(f"{RULES_VERSION}\0{component_type}\0".encode())
+    try:
+        if component_type != 'skill':
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+            return digest.hexdigest()
+
+        with open(os.path.join(path, 'SKILL.md'), 'rb') as f:
+            digest.update(f.read())
+        for subdir in SKILL_DIRS:
+            directory = os.path.join(path, subdir)
+            listing = files_under(directory) if os.path.isdir(directory) else None
+            digest.update(f"\0{subdir}:{json.dumps(listing)}".encode())
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+class ValidationCache:
+    """SQLite cache of validation results, safe to share across threads and processes
+
+    The results of the current rules are loaded in one query the first time
+    they are needed, so a hit costs a dict lookup. New results are written in
+    batches of FLUSH_EVERY and when the process exits.
+    """
+
+    FLUSH_EVERY = 100
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.disabled = False
+        self._lock = threading.Lock()
+        self._conn = None
+        self._results = None
+        self._pending = []
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    rules_version TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+            """)
+            # Results of older rules can never be hit again
+            with db:
+                db.execute("DELETE FROM results WHERE rules_version != ?", (RULES_VERSION,))
+            self._conn = db
+        return self._conn
+
+    def get(self, key):
+        with self._lock:
+            if self._results is None:
+                self._results = dict(self._db().execute("SELECT key, data FROM results"))
+            data = self._results.get(key)
+        return json.loads(data) if data else None
+
+    def put(self, key, data):
+        data = json.dumps(data)
+        with self._lock:
+            if self._results is not None:
+                self._results[key] = data
+            self._pending.append((key, RULES_VERSION, data))
+            if len(self._pending) < self.FLUSH_EVERY:
+                return
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            db = self._db()
+            with db:
+                db.executemany("INSERT OR REPLACE INTO results (key, rules_version, data) VALUES (?, ?, ?)", pending)
+
+    def clear(self):
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute("DELETE FROM results")
+            self._results = {}
+            self._pending = []
+
+# Shared by every validation in this process
+validation_cache = ValidationCache()
+
+def flush_validation_cache():
+    """Write results still held in memory"""
+    if validation_cache.disabled:
+        return
+    try:
+        validation_cache.flush()
+    except sqlite3.Error:
+        validation_cache.disabled = True
+
+atexit.register(flush_validation_cache)
+
+def validate_component(component_type, path, use_cache=True):
+    """Validate one agent or command file, or skill directory
+
+    Unchanged components are answered from the validation cache.
+    """
+    key = None
+    if use_cache and not validation_cache.disabled:
+        key = content_key(component_type, path)
+        try:
+            data = validation_cache.get(key) if key else None
+        except sqlite3.Error:
+            # The cache is an optimisation; never fail a validation because of it
+            validation_cache.disabled = True
+            data = None
+        if data is not None:
+            return Result.from_cache(component_type, path, data)
+
+    result = VALIDATORS[component_type](path)
+
+    if key and not validation_cache.disabled:
+        try:
+            validation_cache.put(key, result.cache_data())
+        except sqlite3.Error:
+            validation_cache.disabled = True
+    return result
+
+def plugin_components(plugin_dir):
+    """(type, path) of every command, agent and skill in a plugin, in the order validate-all.sh used"""
+    def entries(subdir, keep):
+        directory = os.path.join(plugin_dir, subdir)
+        if not os.path.isdir(directory):
+            return []
+        return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                if keep(os.path.join(directory, name))]
+
+    components = [('command', path) for path in entries('commands', lambda p: p.endswith('.md') and os.path.isfile(p))]
+    components += [('agent', path) for path in entries('agents', lambda p: p.endswith('.md') and os.path.isfile(p))]
+    components += [('skill', path) for path in entries('skills', os.path.isdir)]
+    return components
+
+def validate_plugin(plugin_dir, use_cache=True):
+    """Results for every command, agent and skill in a plugin"""
+    return [
+        validate_component(component_type, path, use_cache=use_cache)
+        for component_type, path in plugin_components(plugin_dir)
+    ]
+
+def marketplace_plugins(marketplace_dir):
+    """Every plugin directory under <marketplace>/plugins"""
+    plugins_dir = os.path.join(marketplace_dir, 'plugins')
+    return [
+        os.path.join(plugins_dir, name) for name in sorted(os.listdir(plugins_dir))
+        if not name.startswith('.') and os.path.isdir(os.path.join(plugins_dir, name))
+    ]
+
+def print_plugin(results):
+    """validate-all.sh style listing: failed components show their errors and warnings"""
+    for component_type, heading in (('command', 'Commands'), ('agent', 'Agents'), ('skill', 'Skills')):
+        of_type = [result for result in results if result.type == component_type]
+        if not of_type:
+            continue
+        for result in of_type:
+            label = f"{result.name}.md" if component_type != 'skill' else result.name
+            print(f"  {'✅' if result.valid else '❌'} {label}")
+            if not result.valid:
+                for line in result.report:
+                    if 'ERROR' in line or 'WARNING' in line:
+                        print(line)
+        passed = sum(1 for result in of_type if result.valid)
+        print(f"{heading}: {passed}/{len(of_type)} passed")
+        print()
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate agents, commands and skills')
+    parser.add_argument('target', choices=['agent', 'command', 'skill', 'plugin', 'marketplace'],
+                        help='What to validate')
+    parser.add_argument('path', help='Agent or command file, skill, plugin or marketplace directory')
+    parser.add_argument('--json', action='store_true',
+                        help='Print structured results instead of the report')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Run every rule instead of reusing results of unchanged components')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help='Forget every cached result first')
+
+    args = parser.parse_args()
+
+    if args.clear_cache:
+        try:
+            validation_cache.clear()
+        except sqlite3.Error as e:
+            print(f"⚠️  WARNING: Could not clear the validation cache: {e}")
+
+    if args.target in VALIDATORS:
+        result = validate_component(args.target, args.path, use_cache=not args.no_cache)
+        if args.json:
+            print(json.dumps(dict(result.to_dict(), report=result.report), indent=2))
+        else:
+            print('\n'.join(result.report))
+        return 0 if result.valid else 1
+
+    if args.target == 'plugin':
+        plugin_dirs = [args.path]
+    else:
+        if not os.path.isdir(os.path.join(args.path, 'plugins')):
+            print(f"❌ ERROR: No plugins directory in {args.path}")
+            return 1
+        plugin_dirs = marketplace_plugins(args.path)
+
+    if not os.path.isdir(plugin_dirs[0] if plugin_dirs else args.path):
+        print(f"❌ ERROR: Directory not found: {args.path}")
+        return 1
+
+    validated = [(plugin_dir, validate_plugin(plugin_dir, use_cache=not args.no_cache)) for plugin_dir in plugin_dirs]
+    total = sum(len(results) for _, results in validated)
+    passed = sum(1 for _, results in validated for result in results if result.valid)
+    cached = sum(1 for _, results in validated for result in results if result.cached)
+
+    if args.json:
+        print(json.dumps({
+            'plugins': [
+                {
+                    'name': os.path.basename(os.path.normpath(plugin_dir)),
+                    'path': plugin_dir,
+                    'components': [result.to_dict() for result in results],
+                }
+                for plugin_dir, results in validated
+            ],
+            'total': total,
+            'passed': passed,
+            'failed': total - passed,
+            'cached': cached,
+            'rules_version': RULES_VERSION,
+        }, indent=2))
+        return 0 if passed == total else 1
+
+    for plugin_dir, results in validated:
+        if args.target == 'marketplace':
+            print(f"📦 {os.path.basename(os.path.normpath(plugin_dir))}")
+        print_plugin(results)
+
+    from_cache = f", {cached} from cache" if cached else ""
+    if passed == total:
+        print(f"✅ ALL VALIDATIONS PASSED ({passed}/{total}{from_cache})")
+        return 0
+    print(f"❌ VALIDATION FAILED: {total - passed} failures out of {total} total{from_cache}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())